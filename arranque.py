@@ -0,0 +1,60 @@
+#Medición del arranque de la interfaz por fases (importar Qt, crear la ventana, primer pintado...).
+#El reporte imita el formato de python -X importtime: tiempo propio y acumulado en microsegundos
+#y la fase con sangría según su anidación, así se lee igual que el de las importaciones.
+#Con guardar() queda en JSON para comparar entre versiones y detectar regresiones
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+class TiemposArranque:
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.fases = [] #(nombre, nivel, propio, acumulado) en segundos, en orden de fin
+        self.marcas = {} #nombre -> segundos desde el inicio
+        self._pila = [] #Tiempo de los hijos de cada fase abierta
+
+    #Mide la duración del bloque; las fases pueden anidarse
+    @contextmanager
+    def medir(self, nombre):
+        nivel = len(self._pila)
+        self._pila.append(0.0)
+        comienzo = time.perf_counter()
+        try:
+            yield
+        finally:
+            acumulado = time.perf_counter() - comienzo
+            hijos = self._pila.pop()
+            if self._pila:
+                self._pila[-1] += acumulado
+            self.fases.append((nombre, nivel, acumulado - hijos, acumulado))
+
+    #Registra un instante (por ejemplo el primer pintado de la ventana)
+    def marcar(self, nombre):
+        self.marcas[nombre] = time.perf_counter() - self.inicio
+
+    #Texto en el formato de -X importtime; las fases anidadas se listan antes que la que las contiene
+    def reporte(self):
+        lineas = ["arranque: propio [us] | acumulado | fase"]
+        for nombre, nivel, propio, acumulado in self.fases:
+            lineas.append(f"arranque: {propio * 1e6:>10.0f} | {acumulado * 1e6:>10.0f} | {'  ' * nivel}{nombre}")
+        for nombre, instante in self.marcas.items():
+            lineas.append(f"arranque: {'':>10} | {instante * 1e6:>10.0f} | @{nombre}")
+        return "\n".join(lineas)
+
+    def a_dict(self):
+        return {
+            "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "fases": [
+                {"nombre": nombre, "nivel": nivel, "propio_s": propio, "acumulado_s": acumulado}
+                for nombre, nivel, propio, acumulado in self.fases
+            ],
+            "marcas": dict(self.marcas),
+        }
+
+    #Imprime el reporte en stderr (como -X importtime) y si se da una ruta lo guarda en JSON
+    def guardar(self, ruta=None):
+        print(self.reporte(), file=sys.stderr)
+        if ruta:
+            with open(ruta, "w", encoding="utf-8") as archivo:
+                json.dump(self.a_dict(), archivo, indent=2, ensure_ascii=False)
@@ -0,0 +1,324 @@
+#Asignadores de memoria contigua.
+#A diferencia del contador escalar de GestorMemoria, aquí la RAM es un rango de direcciones
+#(en MB) y cada proceso ocupa un bloque contiguo, por lo que aparece la fragmentación:
+#puede haber memoria libre suficiente pero repartida en huecos demasiado pequeños.
+import heapq
+import math
+
+#Tamaño de una petición o de la memoria total en MB enteros: una fracción de MB ocupa un MB entero,
+#así que se redondea hacia arriba. Lanza ValueError si no es positivo
+def _tamano_entero(tamano):
+    if tamano <= 0:
+        raise ValueError(f"El tamaño debe ser mayor que 0 (se pidió {tamano} MB)")
+    return math.ceil(tamano)
+
+#Árbol de segmentos sobre las direcciones: en la hoja de cada dirección donde empieza un bloque
+#libre se guarda su tamaño y cada nodo interno guarda el máximo de sus hijos.
+#Permite encontrar en O(log n) el primer bloque (por dirección) donde cabe una petición
+class ArbolDirecciones:
+    def __init__(self, tamano):
+        self._capacidad = 1
+        while self._capacidad < max(1, tamano):
+            self._capacidad *= 2
+        self._arbol = [0] * (2 * self._capacidad)
+
+    #Se sube hasta el primer ancestro cuyo máximo no cambia: de ahí para arriba ya está bien
+    def fijar(self, direccion, tamano):
+        i = direccion + self._capacidad
+        arbol = self._arbol
+        arbol[i] = tamano
+        while i > 1:
+            hermano = arbol[i ^ 1]
+            i >>= 1
+            maximo = tamano if tamano > hermano else hermano
+            if arbol[i] == maximo:
+                break
+            arbol[i] = tamano = maximo
+
+    #Primera dirección >= desde con un bloque de al menos tamano, o None.
+    #Sube desde la hoja 'desde' hasta el primer subárbol a la derecha donde cabe y baja por él
+    def buscar(self, tamano, desde=0):
+        if desde >= self._capacidad:
+            return None
+        arbol = self._arbol
+        i = desde + self._capacidad
+        while arbol[i] < tamano:
+            #Mientras sea hijo derecho se sube; después se pasa al hermano derecho
+            while i & 1:
+                i >>= 1
+            if i == 0:
+                return None
+            i += 1
+        while i < self._capacidad:
+            i *= 2
+            if arbol[i] < tamano:
+                i += 1
+        return i - self._capacidad
+
+    def maximo(self):
+        return self._arbol[1]
+
+#Base de los asignadores contiguos.
+#Los bloques libres se guardan por dirección de inicio y de fin para unir vecinos en O(1)
+#al liberar; cada estrategia mantiene además su propio índice para elegir el bloque
+class AsignadorContiguo:
+    nombre = "contiguo"
+
+    def __init__(self, tamano):
+        self.tamano = _tamano_entero(tamano)
+        self.libre = self.tamano
+        self.libres_por_inicio = {} #inicio -> tamaño del bloque libre
+        self.libres_por_fin = {} #fin (exclusivo) -> inicio del bloque libre
+        self.asignados = {} #clave (pid) -> (inicio, tamaño)
+        self._agregar_libre(0, self.tamano)
+
+    #Los hijos indexan y desindexan los bloques libres según su estrategia
+    def _indexar(self, inicio, tamano):
+        raise NotImplementedError
+
+    def _desindexar(self, inicio, tamano):
+        raise NotImplementedError
+
+    #Devuelve el inicio del bloque libre elegido para la petición, o None
+    def _elegir(self, tamano):
+        raise NotImplementedError
+
+    def bloque_libre_mayor(self):
+        raise NotImplementedError
+
+    def _agregar_libre(self, inicio, tamano):
+        if tamano <= 0:
+            return
+        self.libres_por_inicio[inicio] = tamano
+        self.libres_por_fin[inicio + tamano] = inicio
+        self._indexar(inicio, tamano)
+
+    def _quitar_libre(self, inicio):
+        tamano = self.libres_por_inicio.pop(inicio)
+        del self.libres_por_fin[inicio + tamano]
+        self._desindexar(inicio, tamano)
+        return tamano
+
+    #Reserva un bloque contiguo para la clave y devuelve su dirección (None si no hay hueco)
+    def asignar(self, clave, tamano):
+        tamano = _tamano_entero(tamano)
+        inicio = self._elegir(tamano)
+        if inicio is None:
+            return None
+        disponible = self._quitar_libre(inicio)
+        self._agregar_libre(inicio + tamano, disponible - tamano)
+        self.asignados[clave] = (inicio, tamano)
+        self.libre -= tamano
+        return inicio
+
+    #Libera el bloque de la clave y lo une con los bloques libres vecinos
+    def liberar(self, clave):
+        inicio, tamano = self.asignados.pop(clave)
+        self.libre += tamano
+        fin = inicio + tamano
+        if inicio in self.libres_por_fin:
+            anterior = self.libres_por_fin[inicio]
+            tamano += self._quitar_libre(anterior)
+            inicio = anterior
+        if fin in self.libres_por_inicio:
+            tamano += self._quitar_libre(fin)
+        self._agregar_libre(inicio, tamano)
+
+    #Métricas de fragmentación
+    def metricas(self):
+        mayor = self.bloque_libre_mayor()
+        return {
+            "estrategia": self.nombre,
+            "libre_mb": self.libre,
+            "bloques_libres": len(self.libres_por_inicio),
+            "bloque_libre_mayor_mb": mayor,
+            #0 = toda la memoria libre está junta; cerca de 1 = muy fragmentada
+            "fragmentacion_externa": 1 - mayor / self.libre if self.libre else 0.0,
+            "fragmentacion_interna_mb": 0,
+        }
+
+#Primer ajuste: el bloque libre de menor dirección donde quepa la petición
+class PrimerAjuste(AsignadorContiguo):
+    nombre = "primer_ajuste"
+
+    def __init__(self, tamano):
+        self.arbol = ArbolDirecciones(tamano)
+        super().__init__(tamano)
+
+    def _indexar(self, inicio, tamano):
+        self.arbol.fijar(inicio, tamano)
+
+    def _desindexar(self, inicio, tamano):
+        self.arbol.fijar(inicio, 0)
+
+    def _elegir(self, tamano):
+        return self.arbol.buscar(tamano)
+
+    def bloque_libre_mayor(self):
+        return self.arbol.maximo()
+
+#Siguiente ajuste: como primer ajuste pero empieza a buscar donde terminó la última asignación
+class SiguienteAjuste(PrimerAjuste):
+    nombre = "siguiente_ajuste"
+
+    def __init__(self, tamano):
+        self.cursor = 0
+        super().__init__(tamano)
+
+    def _elegir(self, tamano):
+        inicio = self.arbol.buscar(tamano, self.cursor)
+        if inicio is None:
+            inicio = self.arbol.buscar(tamano)
+        if inicio is not None:
+            self.cursor = inicio + tamano
+        return inicio
+
+#Índice de bloques libres por tamaño para las estrategias por tamaño. Un ArbolDirecciones sobre
+#los tamaños (la hoja de cada tamaño que tiene algún bloque libre guarda el propio tamaño) encuentra
+#en O(log n) el menor tamaño donde cabe una petición, y su máximo es el bloque más grande.
+#Cada tamaño tiene un heap con los inicios de sus bloques; las entradas de bloques que dejaron de
+#estar libres se descartan al llegar a la cima, como en politicas.ColaHeap
+class AsignadorPorTamano(AsignadorContiguo):
+    desempate = 1 #Entre bloques del mismo tamaño: 1 = el de menor dirección, -1 = el de mayor
+
+    def __init__(self, tamano):
+        self.tamanos = ArbolDirecciones(_tamano_entero(tamano) + 1)
+        self.cantidad = {} #tamaño -> bloques libres de ese tamaño
+        self.inicios = {} #tamaño -> heap de inicio * desempate
+        super().__init__(tamano)
+
+    def _indexar(self, inicio, tamano):
+        cantidad = self.cantidad.get(tamano, 0)
+        if not cantidad:
+            self.tamanos.fijar(tamano, tamano)
+        self.cantidad[tamano] = cantidad + 1
+        heapq.heappush(self.inicios.setdefault(tamano, []), inicio * self.desempate)
+
+    def _desindexar(self, inicio, tamano):
+        cantidad = self.cantidad[tamano] - 1
+        if not cantidad:
+            del self.cantidad[tamano], self.inicios[tamano]
+            self.tamanos.fijar(tamano, 0)
+            return
+        self.cantidad[tamano] = cantidad
+        heap = self.inicios[tamano]
+        if len(heap) > 2 * cantidad + 64:
+            #Se rearma sin las entradas vencidas cuando ya son más que los bloques libres
+            vigentes = {clave for clave in heap if self.libres_por_inicio.get(clave * self.desempate) == tamano}
+            heap[:] = vigentes
+            heapq.heapify(heap)
+
+    #Inicio de un bloque libre del tamaño dado (tiene que haber alguno)
+    def _bloque_de(self, tamano):
+        heap = self.inicios[tamano]
+        while self.libres_por_inicio.get(heap[0] * self.desempate) != tamano:
+            heapq.heappop(heap)
+        return heap[0] * self.desempate
+
+    def bloque_libre_mayor(self):
+        return self.tamanos.maximo()
+
+#Mejor ajuste: el bloque libre más pequeño donde quepa la petición
+class MejorAjuste(AsignadorPorTamano):
+    nombre = "mejor_ajuste"
+
+    def _elegir(self, tamano):
+        encontrado = self.tamanos.buscar(max(tamano, 1))
+        return self._bloque_de(encontrado) if encontrado is not None else None
+
+#Peor ajuste: siempre el bloque libre más grande
+class PeorAjuste(AsignadorPorTamano):
+    nombre = "peor_ajuste"
+    desempate = -1
+
+    def _elegir(self, tamano):
+        mayor = self.tamanos.maximo()
+        if mayor and mayor >= tamano:
+            return self._bloque_de(mayor)
+        return None
+
+#Asignador buddy: los bloques son potencias de 2 y al liberar se unen con su "compañero".
+#Hay una lista libre por orden (tamaño 2^orden), así asignar y liberar cuestan O(log n).
+#Redondear hacia arriba provoca fragmentación interna
+class AsignadorBuddy:
+    nombre = "buddy"
+
+    def __init__(self, tamano, orden_minimo=0):
+        self.tamano = _tamano_entero(tamano)
+        self.orden_minimo = orden_minimo
+        self.libre = 0
+        self.libres = {} #orden -> conjunto de direcciones libres de ese tamaño
+        self.asignados = {} #clave -> (inicio, orden, tamaño pedido)
+        self.fragmentacion_interna = 0
+        #Si el total no es potencia de 2 se parte en bloques alineados de mayor a menor
+        direccion = 0
+        for orden in range(self.tamano.bit_length() - 1, orden_minimo - 1, -1):
+            if self.tamano & (1 << orden):
+                self.libres.setdefault(orden, set()).add(direccion)
+                direccion += 1 << orden
+                self.libre += 1 << orden
+
+    def _orden_para(self, tamano):
+        return max(self.orden_minimo, (tamano - 1).bit_length())
+
+    def asignar(self, clave, tamano):
+        tamano = _tamano_entero(tamano)
+        orden = self._orden_para(tamano)
+        #Se busca el orden más chico con un bloque libre
+        actual = orden
+        while not self.libres.get(actual):
+            actual += 1
+            if actual >= self.tamano.bit_length():
+                return None
+        inicio = self.libres[actual].pop()
+        #Se parte el bloque a la mitad hasta llegar al orden pedido
+        while actual > orden:
+            actual -= 1
+            self.libres.setdefault(actual, set()).add(inicio + (1 << actual))
+        self.asignados[clave] = (inicio, orden, tamano)
+        self.libre -= 1 << orden
+        self.fragmentacion_interna += (1 << orden) - tamano
+        return inicio
+
+    def liberar(self, clave):
+        inicio, orden, pedido = self.asignados.pop(clave)
+        self.libre += 1 << orden
+        self.fragmentacion_interna -= (1 << orden) - pedido
+        #Se une con el compañero mientras esté libre
+        while True:
+            companero = inicio ^ (1 << orden)
+            libres = self.libres.get(orden)
+            if not libres or companero not in libres:
+                break
+            libres.remove(companero)
+            inicio = min(inicio, companero)
+            orden += 1
+        self.libres.setdefault(orden, set()).add(inicio)
+
+    def bloque_libre_mayor(self):
+        for orden in sorted(self.libres, reverse=True):
+            if self.libres[orden]:
+                return 1 << orden
+        return 0
+
+    def metricas(self):
+        mayor = self.bloque_libre_mayor()
+        return {
+            "estrategia": self.nombre,
+            "libre_mb": self.libre,
+            "bloques_libres": sum(len(bloques) for bloques in self.libres.values()),
+            "bloque_libre_mayor_mb": mayor,
+            "fragmentacion_externa": 1 - mayor / self.libre if self.libre else 0.0,
+            "fragmentacion_interna_mb": self.fragmentacion_interna,
+        }
+
+ASIGNADORES = {
+    clase.nombre: clase
+    for clase in (PrimerAjuste, SiguienteAjuste, MejorAjuste, PeorAjuste, AsignadorBuddy)
+}
+
+#Crea el asignador por su nombre ("primer_ajuste", "siguiente_ajuste", "mejor_ajuste", "peor_ajuste" o "buddy")
+def crear_asignador(nombre, tamano):
+    if nombre not in ASIGNADORES:
+        raise ValueError(f"Asignador desconocido '{nombre}'. Opciones: {', '.join(ASIGNADORES)}")
+    return ASIGNADORES[nombre](tamano)
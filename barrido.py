@@ -0,0 +1,121 @@
+#Barridos de parámetros: corre la misma carga con distintas capacidades de RAM, políticas
+#de admisión y semillas, repartiendo las corridas entre todos los núcleos con un
+#ProcessPoolExecutor. Cada corrida es independiente y determinista para su semilla.
+#Uso: python barrido.py --ram-gb 0.5 1 2 4 --politicas primer_ajuste fifo --semillas 1 2 3 --salida barrido.csv
+import argparse
+import csv
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cargas
+from batch import cargar_carga, ejecutar_carga
+
+#Columnas de la tabla agregada (promedios entre semillas)
+COLUMNAS_TABLA = [
+    "ram_gb", "politica", "corridas", "procesos", "tiempo_simulado_s", "rendimiento_proc_s",
+    "espera_media", "espera_p95", "retorno_medio", "retorno_p95",
+]
+
+#Carga compartida por todas las corridas de un proceso trabajador (se fija una vez al iniciar)
+_carga_fija = None
+
+def _inicializar_trabajador(carga):
+    global _carga_fija
+    _carga_fija = carga
+
+#Genera una carga sintética reproducible: llegadas de Poisson y memoria/duración
+#en los mismos rangos que usa Proceso por defecto
+def generar_carga(semilla, cantidad=1000, tasa_llegada=0.5):
+    return list(cargas.generar_carga(semilla, cantidad, llegadas="poisson", tasa=tasa_llegada))
+
+#Corre un punto del barrido y devuelve sus métricas.
+#Es una función de módulo para que el ProcessPoolExecutor la pueda enviar a otro proceso
+def ejecutar_punto(ram_gb, politica, semilla, cantidad=1000, tasa_llegada=0.5):
+    carga = _carga_fija if _carga_fija is not None else generar_carga(semilla, cantidad, tasa_llegada)
+    simulador = ejecutar_carga(carga, ram_gb, politica)
+    stats = simulador.obtener_estadisticas()
+    terminados = stats["procesos_ejecutados"]
+    return {
+        "ram_gb": ram_gb,
+        "politica": politica,
+        "semilla": semilla,
+        "procesos": terminados,
+        "tiempo_simulado_s": simulador.reloj,
+        "rendimiento_proc_s": terminados / simulador.reloj if simulador.reloj else 0,
+        "espera_media": stats["espera"]["media"],
+        "espera_p95": stats["espera"]["p95"],
+        "retorno_medio": stats["retorno"]["media"],
+        "retorno_p95": stats["retorno"]["p95"],
+    }
+
+#Reparte la grilla entre los núcleos y va devolviendo cada resultado apenas termina.
+#Si se pasa carga, todas las corridas usan esa carga fija en lugar de una sintética; como la
+#simulación es determinista, se corre una sola semilla (las demás darían el mismo resultado)
+def barrer(rams_gb, politicas, semillas, carga=None, cantidad=1000, tasa_llegada=0.5, trabajadores=None):
+    if carga is not None:
+        semillas = semillas[:1]
+    grilla = list(itertools.product(rams_gb, politicas, semillas))
+    with ProcessPoolExecutor(
+        max_workers=trabajadores or os.cpu_count(),
+        initializer=_inicializar_trabajador,
+        initargs=(carga,),
+    ) as executor:
+        futuros = [
+            executor.submit(ejecutar_punto, ram_gb, politica, semilla, cantidad, tasa_llegada)
+            for ram_gb, politica, semilla in grilla
+        ]
+        for futuro in as_completed(futuros):
+            yield futuro.result()
+
+#Agrupa los resultados por (RAM, política) y promedia las métricas entre semillas
+def agregar(resultados):
+    grupos = {}
+    for resultado in resultados:
+        grupos.setdefault((resultado["ram_gb"], resultado["politica"]), []).append(resultado)
+
+    tabla = []
+    for (ram_gb, politica), corridas in sorted(grupos.items()):
+        fila = {"ram_gb": ram_gb, "politica": politica, "corridas": len(corridas)}
+        for columna in COLUMNAS_TABLA[3:]:
+            fila[columna] = sum(c[columna] for c in corridas) / len(corridas)
+        tabla.append(fila)
+    return tabla
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Barrido de parámetros del simulador en paralelo")
+    parser.add_argument("--ram-gb", type=float, nargs="+", required=True, help="Capacidades de RAM a probar")
+    parser.add_argument("--politicas", nargs="+", default=["primer_ajuste"], help="Políticas de admisión")
+    parser.add_argument("--semillas", type=int, nargs="+", default=[1], help="Semillas de la carga sintética (no se combina con --carga)")
+    parser.add_argument("--carga", help="Archivo de carga fija (CSV o JSON); si no se da se genera una sintética")
+    parser.add_argument("--procesos", type=int, default=1000, help="Procesos de la carga sintética")
+    parser.add_argument("--tasa", type=float, default=0.5, help="Llegadas por segundo de la carga sintética")
+    parser.add_argument("--trabajadores", type=int, help="Procesos en paralelo (por defecto todos los núcleos)")
+    parser.add_argument("--salida", help="Archivo CSV para la tabla agregada (por defecto se imprime)")
+    args = parser.parse_args(argv)
+    if args.carga and len(args.semillas) > 1:
+        parser.error("--semillas solo aplica a la carga sintética: con --carga se usa siempre la misma carga")
+
+    carga = cargar_carga(args.carga) if args.carga else None
+    total = len(args.ram_gb) * len(args.politicas) * len(args.semillas)
+    resultados = []
+    for resultado in barrer(args.ram_gb, args.politicas, args.semillas, carga,
+                            args.procesos, args.tasa, args.trabajadores):
+        resultados.append(resultado)
+        print(f"[{len(resultados)}/{total}] ram={resultado['ram_gb']} GB politica={resultado['politica']} "
+              f"semilla={resultado['semilla']} espera_media={resultado['espera_media']:.1f}s", file=sys.stderr)
+
+    tabla = agregar(resultados)
+    salida = open(args.salida, "w", newline="", encoding="utf-8") if args.salida else sys.stdout
+    try:
+        escritor = csv.DictWriter(salida, fieldnames=COLUMNAS_TABLA)
+        escritor.writeheader()
+        escritor.writerows(tabla)
+    finally:
+        if args.salida:
+            salida.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+#Punto de entrada sin interfaz gráfica: corre una carga de procesos sobre core.Simulador
+#en modo eventos (lo más rápido posible) y guarda el resumen y los resultados por proceso.
+#No importa Qt, así que sirve en servidores y trabajos por lotes.
+#Uso: python batch.py carga.csv --ram-gb 4 --resumen resumen.json --resultados procesos.csv
+import argparse
+import csv
+import json
+import os
+import sys
+from itertools import islice
+
+from core import Simulador
+from politicas import POLITICAS
+from paginacion import REEMPLAZOS, PATRONES
+from cargas import leer_traza
+from cluster import COLOCACIONES
+from cpu import PLANIFICADORES
+from metricas import RegistroMetricas
+from bitacora import Bitacora
+from compartido import PublicadorCompartido
+from puntos_control import PuntosControl, existe as existe_punto_control
+
+#Columnas de los resultados por proceso
+COLUMNAS_RESULTADOS = [
+    "pid", "nombre", "memoria_mb", "duracion_s", "llegada", "inicio", "fin", "espera", "retorno",
+]
+
+#Lee toda la carga desde un CSV, JSONL o JSON (ver cargas.leer_traza).
+#Cada proceso tiene nombre, memoria_mb, duracion_s, llegada (segundos desde el inicio)
+#y opcionalmente prioridad
+def cargar_carga(ruta):
+    return list(leer_traza(ruta))
+
+#Convierte la carga en (llegada, proceso) para el simulador, de a un proceso a la vez
+def _procesos(simulador, carga):
+    for datos in carga:
+        #Un proceso más grande que toda la RAM (más el swap si hay paginación) nunca podría ejecutarse
+        if datos["memoria_mb"] > simulador.gestor_memoria.capacidad or datos["memoria_mb"] <= 0 or datos["duracion_s"] <= 0:
+            print(f"Se omite '{datos['nombre']}': memoria o duración fuera de rango", file=sys.stderr)
+            simulador.posicion_fuente += 1 #También cuenta como leído (ver Simulador.posicion_fuente)
+            continue
+        proceso = simulador.crear_proceso(datos["nombre"], datos["memoria_mb"], datos["duracion_s"], datos.get("prioridad", 0))
+        yield datos["llegada"], proceso
+
+#Corre la carga completa y devuelve el simulador ya terminado.
+#carga puede ser una lista o un generador (por ejemplo cargas.leer_traza); un generador se consume
+#de a un proceso mientras avanza la simulación y debe venir ordenado por llegada.
+#paginacion: opciones de la memoria paginada (None = cada proceso espera a que quepa entero en RAM)
+#metricas: metricas.RegistroMetricas para instrumentar la corrida (None = sin medir)
+#cluster: opciones de cluster.GestorCluster; ram_total_gb pasa a ser la RAM de cada nodo (None = un solo nodo)
+#cpu: opciones de cpu.PlanificadorCPU; los procesos en memoria compiten por los núcleos (None = sin límite de CPU)
+#bitacora: bitacora.Bitacora donde se anota cada evento de la corrida (None = sin bitácora); la cierra quien la creó
+#compartido: compartido.PublicadorCompartido para seguir la corrida desde otro proceso (None = no se comparte)
+#tabla_procesos: guarda los procesos en una tabla columnar de NumPy (ver tabla_procesos.TablaProcesos)
+#punto_control: directorio donde se guarda el estado cada 'intervalo' segundos reales y al terminar.
+#  Si ya tiene un punto de control la corrida sigue desde ahí (con la configuración guardada)
+#  salteando los procesos de la carga que ya se habían leído
+def ejecutar_carga(carga, ram_total_gb=1, politica="primer_ajuste", asignador=None, paginacion=None, metricas=None,
+                   punto_control=None, intervalo=60, cluster=None, cpu=None, bitacora=None,
+                   compartido=None, tabla_procesos=False):
+    control = None
+    if punto_control and existe_punto_control(punto_control):
+        control = PuntosControl.restaurar(punto_control, metricas=metricas, bitacora=bitacora,
+                                              compartido=compartido)
+        simulador = control.simulador
+    else:
+        simulador = Simulador(modo="eventos", politica=politica, ram_total_gb=ram_total_gb,
+                              estrategia_memoria=asignador, paginacion=paginacion, metricas=metricas,
+                              cluster=cluster, cpu=cpu, bitacora=bitacora,
+                              compartido=compartido, tabla_procesos=tabla_procesos)
+        if punto_control:
+            control = PuntosControl(simulador, punto_control)
+    if isinstance(carga, list):
+        #Una lista ya está en memoria, así que se puede ordenar (sorted es estable)
+        carga = sorted(carga, key=lambda datos: datos["llegada"])
+    simulador.conectar_fuente(_procesos(simulador, islice(carga, simulador.posicion_fuente, None)))
+    if control:
+        control.iniciar(intervalo)
+    simulador.ejecutar_eventos(velocidad=0)
+    if control:
+        control.detener()
+    return simulador
+
+#Resumen de la corrida: estadísticas del simulador más datos generales
+#(con cluster, también el uso y la cola de cada nodo)
+def resumen(simulador):
+    datos = {
+        "ram_total_mb": simulador.gestor_memoria.ram_total,
+        "politica": simulador.cola_espera.politica,
+        "tiempo_simulado_s": simulador.reloj,
+        "procesos_pendientes": len(simulador.cola_espera) + len(simulador.procesos_en_ejecucion),
+        "fragmentacion": simulador.gestor_memoria.metricas_fragmentacion(),
+        **simulador.obtener_estadisticas(),
+    }
+    if simulador.cluster:
+        datos["nodos"] = simulador.gestor_memoria.metricas_nodos(simulador.cola_espera)
+    return datos
+
+#Una fila de resultados por cada proceso terminado
+def filas_resultados(simulador):
+    for p in simulador.procesos_terminados:
+        yield {
+            "pid": p.pid,
+            "nombre": p.nombre,
+            "memoria_mb": p.memoria_mb,
+            "duracion_s": p.duracion_s,
+            "llegada": p.tiempo_llegada,
+            "inicio": p.tiempo_inicio,
+            "fin": p.tiempo_fin,
+            "espera": p.tiempo_espera,
+            "retorno": p.tiempo_fin - p.tiempo_llegada,
+        }
+
+def guardar_resultados(simulador, ruta):
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.DictWriter(archivo, fieldnames=COLUMNAS_RESULTADOS)
+        escritor.writeheader()
+        escritor.writerows(filas_resultados(simulador))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulador de RAM sin interfaz gráfica")
+    parser.add_argument("carga", help="Archivo CSV, JSONL o JSON con nombre, memoria_mb, duracion_s y llegada "
+                        "(CSV y JSONL se leen de a una fila y deben estar ordenados por llegada; un JSON se ordena)")
+    parser.add_argument("--ram-gb", type=float, default=1, help="RAM total en GB, o de cada nodo con --nodos (por defecto 1)")
+    parser.add_argument("--politica", default="primer_ajuste", choices=sorted(POLITICAS), help="Política de admisión de la cola")
+    parser.add_argument("--asignador", help="Asignador contiguo: primer_ajuste, siguiente_ajuste, mejor_ajuste, peor_ajuste o buddy")
+    parser.add_argument("--paginacion", choices=sorted(REEMPLAZOS), help="Activa la memoria paginada con esta política de reemplazo")
+    parser.add_argument("--swap-gb", type=float, default=1, help="Tamaño del swap en GB con paginación (por defecto 1)")
+    parser.add_argument("--tamano-pagina", type=float, default=4, help="Tamaño de página en MB (por defecto 4)")
+    parser.add_argument("--latencia-fallo", type=float, default=0.01, help="Segundos que cuesta cada fallo de página (por defecto 0.01)")
+    parser.add_argument("--patron", default="localidad", choices=PATRONES, help="Patrón de acceso a memoria de los procesos")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla de los accesos a memoria (por defecto 0)")
+    parser.add_argument("--nodos", type=int, help="Reparte la memoria en este número de nodos de --ram-gb cada uno")
+    parser.add_argument("--colocacion", default="mejor_ajuste", choices=COLOCACIONES, help="Cómo se elige el nodo de cada proceso")
+    parser.add_argument("--desborde-remoto", action="store_true", help="Un proceso que no cabe en un nodo puede usar memoria de otros")
+    parser.add_argument("--penalizacion-remota", type=float, default=1.0,
+                        help="Cuánto se alarga un proceso si toda su memoria fuera remota (por defecto 1.0 = el doble)")
+    parser.add_argument("--nucleos", type=int, help="Limita la CPU a este número de núcleos que se reparten los procesos en memoria")
+    parser.add_argument("--planificador-cpu", default="rr", choices=sorted(PLANIFICADORES),
+                        help="Planificación de los núcleos: round robin, MLFQ o justa estilo CFS (por defecto rr)")
+    parser.add_argument("--quantum", type=float,
+                        help="Rebanada de CPU en segundos (rr y mlfq, por defecto 1) o granularidad mínima (cfs, por defecto 0.5)")
+    parser.add_argument("--tabla-procesos", action="store_true",
+                        help="Guarda los procesos en una tabla columnar de NumPy (menos memoria con millones de procesos)")
+    parser.add_argument("--resumen", help="Archivo JSON para el resumen (por defecto se imprime)")
+    parser.add_argument("--resultados", help="Archivo CSV con los resultados de cada proceso")
+    parser.add_argument("--metricas", help="Archivo donde guardar las métricas internas (.json = JSON, otro = Prometheus)")
+    parser.add_argument("--eventos", metavar="DIRECTORIO",
+                        help="Guarda cada evento (llegada, admisión, fin, cancelación y memoria) en bloques .npy (ver bitacora.py)")
+    parser.add_argument("--compartir", metavar="NOMBRE",
+                        help="Publica el estado en vivo en la memoria compartida NOMBRE (ver compartido.py)")
+    parser.add_argument("--punto-control", metavar="DIRECTORIO",
+                        help="Guarda el estado periódicamente en este directorio; si ya tiene uno, la corrida sigue desde ahí")
+    parser.add_argument("--intervalo-punto-control", type=float, default=60,
+                        help="Segundos reales entre puntos de control (por defecto 60)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.carga):
+        parser.error(f"No existe el archivo {args.carga}")
+
+    paginacion = None
+    if args.paginacion:
+        if args.asignador:
+            parser.error("--paginacion no se puede combinar con --asignador")
+        paginacion = {
+            "reemplazo": args.paginacion,
+            "swap_mb": args.swap_gb * 1024,
+            "tamano_pagina_mb": args.tamano_pagina,
+            "latencia_fallo": args.latencia_fallo,
+            "patron": args.patron,
+            "semilla": args.semilla,
+        }
+
+    cluster = None
+    if args.nodos:
+        cluster = {
+            "nodos": args.nodos,
+            "colocacion": args.colocacion,
+            "desborde_remoto": args.desborde_remoto,
+            "penalizacion_remota": args.penalizacion_remota,
+        }
+
+    cpu = None
+    if args.nucleos:
+        cpu = {"nucleos": args.nucleos, "planificador": args.planificador_cpu, "quantum": args.quantum}
+
+    metricas = RegistroMetricas() if args.metricas else None
+    compartido = None
+    if args.compartir:
+        try:
+            compartido = PublicadorCompartido(args.compartir)
+        except FileExistsError:
+            parser.error(f"Ya existe una memoria compartida llamada {args.compartir}")
+    bitacora = Bitacora(args.eventos) if args.eventos else None
+
+    #La traza se reproduce en streaming: se lee un proceso a la vez mientras avanza la simulación
+    try:
+        simulador = ejecutar_carga(leer_traza(args.carga), args.ram_gb, args.politica, args.asignador,
+                                   paginacion, metricas, args.punto_control, args.intervalo_punto_control, cluster, cpu,
+                                   bitacora, compartido, args.tabla_procesos)
+    except ValueError as error:
+        parser.error(str(error))
+    finally:
+        if bitacora:
+            bitacora.cerrar()
+        if compartido:
+            compartido.cerrar()
+    if metricas:
+        metricas.volcar(args.metricas)
+
+    datos_resumen = resumen(simulador)
+    if args.resumen:
+        with open(args.resumen, "w", encoding="utf-8") as archivo:
+            json.dump(datos_resumen, archivo, indent=2, ensure_ascii=False)
+    else:
+        print(json.dumps(datos_resumen, indent=2, ensure_ascii=False))
+    if args.resultados:
+        guardar_resultados(simulador, args.resultados)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
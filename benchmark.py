@@ -0,0 +1,390 @@
+#Benchmarks de los caminos críticos de core.Simulador: admisión con colas grandes, costo del tick
+#según la cantidad de procesos en ejecución, cancelación, actualización de estadísticas,
+#eventos por segundo de punta a punta, colocación en clusters con muchos nodos, envíos por el
+#servidor de control, despachos de los planificadores de CPU y costo de la bitácora de eventos.
+#Todo usa semillas fijas para que dos corridas sean comparables.
+#Uso: python benchmark.py --salida base.json
+#     python benchmark.py --comparar base.json nuevo.json --umbral 0.1
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from core import Simulador, Proceso
+from cluster import GestorCluster
+from cpu import PlanificadorCPU, PLANIFICADORES
+from bitacora import Bitacora
+from servidor import ServidorControl
+from batch import ejecutar_carga
+import cargas
+
+#Tamaños por defecto de cada caso y los de la corrida rápida (--rapido)
+TAMANOS = {
+    "admision": [10**3, 10**4, 10**5, 10**6],
+    "tick": [10**3, 10**4, 10**5],
+    "cancelacion": [10**3, 10**4, 10**5],
+    "cancelacion_lote": [10**4, 10**5],
+    "colocacion": [10**3, 10**4],
+    "control": [10**4, 10**5],
+    "cpu": [10**3, 10**4, 10**5],
+    "bitacora": [10**3, 10**4],
+    "estadisticas": [10**4, 10**5, 10**6],
+    "extremo_a_extremo": [10**4, 10**5],
+}
+TAMANOS_RAPIDOS = {
+    "admision": [10**3, 10**4],
+    "tick": [10**3, 10**4],
+    "cancelacion": [10**3, 10**4],
+    "cancelacion_lote": [10**4],
+    "colocacion": [10**3],
+    "control": [10**4],
+    "cpu": [10**3, 10**4],
+    "bitacora": [10**3],
+    "estadisticas": [10**4],
+    "extremo_a_extremo": [10**4],
+}
+
+#Simulador cuyo hilo nunca se inicia, así el benchmark controla cada paso
+def _simulador(ram_gb=1, modo="eventos"):
+    return Simulador(modo=modo, ram_total_gb=ram_gb)
+
+def _procesos(rng, cantidad, prefijo="P"):
+    return [Proceso(f"{prefijo}{i}", None, rng.randint(50, 250), rng.randint(5, 20), rng=rng) for i in range(cantidad)]
+
+#Admisión con 'tamano' procesos en cola: costo de encolar, de un intento sin memoria libre
+#(el caso común cuando la RAM está llena) y de un intento que admite tras liberar memoria
+def caso_admision(tamano, semilla):
+    rng = random.Random(semilla)
+    simulador = _simulador(ram_gb=1)
+    gestor = simulador.gestor_memoria
+    ocupante = Proceso("ocupante", None, gestor.ram_total, 1000)
+    gestor.asignar_memoria(ocupante) #El ocupante llena la RAM: ningún proceso de la cola cabe
+    simulador._iniciar_proceso(ocupante)
+    procesos = _procesos(rng, tamano)
+
+    inicio = time.perf_counter()
+    for proceso in procesos:
+        proceso.tiempo_llegada = 0
+        simulador.cola_espera.append(proceso)
+    encolar = time.perf_counter() - inicio
+
+    intentos = 100
+    inicio = time.perf_counter()
+    for _ in range(intentos):
+        simulador.intentar_ejecutar_procesos()
+    sin_memoria = (time.perf_counter() - inicio) / intentos
+
+    simulador.ejecucion.quitar(ocupante.pid)
+    simulador.procesos_en_ejecucion.pop(ocupante.pid)
+    gestor.liberar_memoria(ocupante)
+    inicio = time.perf_counter()
+    admitidos = simulador.intentar_ejecutar_procesos()
+    con_memoria = time.perf_counter() - inicio
+    simulador.procesos_terminados.cerrar()
+    return {
+        "s_por_encolado": encolar / tamano,
+        "s_intento_sin_memoria": sin_memoria,
+        "s_intento_con_memoria": con_memoria,
+        "admitidos": len(admitidos),
+    }
+
+#Costo de un tick con 'tamano' procesos en ejecución (en el tick ninguno termina)
+def caso_tick(tamano, semilla):
+    rng = random.Random(semilla)
+    simulador = _simulador(ram_gb=tamano, modo="tiempo_real")
+    for proceso in _procesos(rng, tamano):
+        proceso.tiempo_restante = proceso.duracion_s = 10**6
+        simulador.gestor_memoria.asignar_memoria(proceso)
+        simulador._iniciar_proceso(proceso)
+    ticks = 50
+    inicio = time.perf_counter()
+    for _ in range(ticks):
+        simulador._tick()
+    transcurrido = (time.perf_counter() - inicio) / ticks
+    simulador.procesos_terminados.cerrar()
+    return {"s_por_tick": transcurrido, "s_por_proceso": transcurrido / tamano}
+
+#Tick de tiempo real en el que terminan y se admiten 'tamano' procesos (tres eventos y un cambio
+#de memoria por proceso), sin y con bitácora; la diferencia es lo que la bitácora agrega al tick
+def caso_bitacora(tamano, semilla):
+    resultado = {}
+    for nombre, con_bitacora in (("sin", False), ("con", True)):
+        rng = random.Random(semilla)
+        with tempfile.TemporaryDirectory() as ruta:
+            bitacora = Bitacora(ruta) if con_bitacora else None
+            simulador = Simulador(modo="tiempo_real", ram_total_gb=tamano, bitacora=bitacora)
+            ticks = 20
+            transcurrido = 0
+            for _ in range(ticks):
+                for proceso in _procesos(rng, tamano):
+                    proceso.tiempo_restante = 1
+                    simulador._encolar(proceso)
+                inicio = time.perf_counter()
+                with simulador.lock:
+                    simulador._tick()
+                    simulador.intentar_ejecutar_procesos()
+                    simulador._publicar_instantanea()
+                transcurrido += time.perf_counter() - inicio
+            if bitacora:
+                bitacora.cerrar()
+            simulador.procesos_terminados.cerrar()
+        resultado[f"s_por_tick_{nombre}"] = transcurrido / ticks
+    return resultado
+
+#Simulador con 'tamano' procesos: mitad en ejecución y mitad en una cola de otros tantos
+#(los de la cola no caben porque la RAM queda llena)
+def _simulador_lleno(rng, tamano):
+    simulador = _simulador(ram_gb=tamano // 2 * 250 / 1024 + 1)
+    en_ejecucion = _procesos(rng, tamano // 2, "E")
+    for proceso in en_ejecucion:
+        simulador.gestor_memoria.asignar_memoria(proceso)
+        simulador._iniciar_proceso(proceso)
+    en_cola = _procesos(rng, tamano - tamano // 2, "C")
+    for proceso in en_cola:
+        simulador._encolar(proceso)
+    return simulador, en_ejecucion, en_cola
+
+#Costo de cancelar procesos al azar de a uno: mitad en cola y mitad en ejecución
+def caso_cancelacion(tamano, semilla):
+    rng = random.Random(semilla)
+    simulador, en_ejecucion, en_cola = _simulador_lleno(rng, tamano)
+    pids = [p.pid for p in en_ejecucion + en_cola]
+    rng.shuffle(pids)
+    inicio = time.perf_counter()
+    for pid in pids:
+        simulador.cancelar_proceso(pid)
+    transcurrido = time.perf_counter() - inicio
+    simulador.procesos_terminados.cerrar()
+    return {"s_por_cancelacion": transcurrido / tamano}
+
+#Costo de cancelar en lote todos los procesos cuya memoria supera la mediana (la mitad, entre cola y ejecución)
+def caso_cancelacion_lote(tamano, semilla):
+    rng = random.Random(semilla)
+    simulador, _, _ = _simulador_lleno(rng, tamano)
+    inicio = time.perf_counter()
+    cancelados = simulador.cancelar_procesos(memoria_minima=150)
+    transcurrido = time.perf_counter() - inicio
+    simulador.procesos_terminados.cerrar()
+    return {"s_lote": transcurrido, "cancelados": cancelados}
+
+#Costo de colocar y liberar procesos en un cluster de 'tamano' nodos de 1 GB (mejor ajuste),
+#con el cluster a medio llenar; no debería crecer con la cantidad de nodos
+def caso_colocacion(tamano, semilla):
+    rng = random.Random(semilla)
+    gestor = GestorCluster(nodos=tamano, ram_total_gb=1)
+    for proceso in _procesos(rng, tamano * 2, "F"):
+        gestor.asignar_memoria(proceso)
+    procesos = _procesos(rng, 10000)
+    inicio = time.perf_counter()
+    for proceso in procesos:
+        gestor.asignar_memoria(proceso)
+    colocar = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    for proceso in procesos:
+        gestor.liberar_memoria(proceso)
+    liberar = time.perf_counter() - inicio
+    return {"s_por_colocacion": colocar / len(procesos), "s_por_liberacion": liberar / len(procesos)}
+
+#Costo de cada despacho de CPU con 'tamano' procesos en memoria compitiendo por 64 núcleos
+#(quantum de 0.1 s, 50 s simulados), para cada planificador; no debería crecer más que log(tamano)
+def caso_cpu(tamano, semilla):
+    resultado = {}
+    for nombre in PLANIFICADORES:
+        rng = random.Random(semilla)
+        planificador = PlanificadorCPU(nucleos=64, planificador=nombre, quantum=0.1)
+        for proceso in _procesos(rng, tamano):
+            planificador.agregar(proceso, 0)
+        despachos = planificador.despachos
+        inicio = time.perf_counter()
+        planificador.avanzar(50)
+        transcurrido = time.perf_counter() - inicio
+        resultado[f"s_por_despacho_{nombre}"] = transcurrido / (planificador.despachos - despachos)
+    return resultado
+
+#Procesos por segundo que entran por el servidor de control en lotes de 1000, con los pedidos
+#encadenados sin esperar cada respuesta. El motor no corre, así que mide solo el servidor
+def caso_control(tamano, semilla):
+    rng = random.Random(semilla)
+    lote = 1000
+    pedidos = [
+        json.dumps({"op": "enviar", "procesos": [
+            {"nombre": f"C{j}", "memoria_mb": rng.randint(50, 250), "duracion_s": rng.randint(5, 20)}
+            for j in range(i, min(i + lote, tamano))
+        ]}).encode("utf-8") + b"\n"
+        for i in range(0, tamano, lote)
+    ]
+    simulador = _simulador(ram_gb=1)
+    servidor = ServidorControl(simulador, puerto=0)
+    servidor.iniciar_en_hilo()
+
+    async def enviar():
+        lector, escritor = await asyncio.open_connection(*servidor.direccion, limit=1 << 24)
+
+        async def escribir():
+            for pedido in pedidos:
+                escritor.write(pedido)
+                await escritor.drain()
+        tarea = asyncio.create_task(escribir())
+        for _ in pedidos:
+            await lector.readline()
+        await tarea
+        escritor.close()
+
+    inicio = time.perf_counter()
+    asyncio.run(enviar())
+    transcurrido = time.perf_counter() - inicio
+    servidor.detener()
+    simulador.procesos_terminados.cerrar()
+    return {"s_total": transcurrido, "procesos_por_s": tamano / transcurrido}
+
+#Costo de actualizar las estadísticas con 'tamano' procesos terminados
+def caso_estadisticas(tamano, semilla):
+    rng = random.Random(semilla)
+    simulador = _simulador()
+    procesos = []
+    for proceso in _procesos(rng, min(tamano, 10**4)):
+        proceso.tiempo_llegada = rng.uniform(0, 100)
+        proceso.tiempo_espera = rng.expovariate(0.1)
+        proceso.tiempo_inicio = proceso.tiempo_llegada + proceso.tiempo_espera
+        proceso.tiempo_fin = proceso.tiempo_inicio + proceso.duracion_s
+        proceso.tiempo_duracion_real = proceso.duracion_s
+        procesos.append(proceso)
+    inicio = time.perf_counter()
+    for i in range(tamano):
+        simulador.actualizar_estadisticas(procesos[i % len(procesos)])
+    actualizar = (time.perf_counter() - inicio) / tamano
+    inicio = time.perf_counter()
+    simulador.obtener_estadisticas()
+    resumen = time.perf_counter() - inicio
+    simulador.procesos_terminados.cerrar()
+    return {"s_por_actualizacion": actualizar, "s_resumen": resumen}
+
+#Carga sintética de 'tamano' procesos corrida completa en modo eventos
+def caso_extremo_a_extremo(tamano, semilla):
+    carga = cargas.generar_carga(semilla, tamano, tasa=2)
+    inicio = time.perf_counter()
+    simulador = ejecutar_carga(carga, ram_total_gb=1)
+    transcurrido = time.perf_counter() - inicio
+    eventos = simulador.contador_eventos
+    simulador.procesos_terminados.cerrar()
+    return {"s_total": transcurrido, "eventos": eventos, "eventos_por_s": eventos / transcurrido}
+
+#Nombre -> función del caso
+CASOS = {
+    "admision": caso_admision,
+    "tick": caso_tick,
+    "cancelacion": caso_cancelacion,
+    "cancelacion_lote": caso_cancelacion_lote,
+    "colocacion": caso_colocacion,
+    "control": caso_control,
+    "cpu": caso_cpu,
+    "bitacora": caso_bitacora,
+    "estadisticas": caso_estadisticas,
+    "extremo_a_extremo": caso_extremo_a_extremo,
+}
+
+#Las métricas que terminan en "_por_s" son mejores cuanto más altas; las de tiempo ("s_...")
+#cuanto más bajas. El resto (conteos) no se comparan
+def _sentido(metrica):
+    if metrica.endswith("_por_s"):
+        return 1
+    if metrica.startswith("s_"):
+        return -1
+    return 0
+
+#Corre cada caso 'repeticiones' veces con la misma semilla y se queda con el mejor valor de cada métrica
+def ejecutar(casos=None, tamanos=None, repeticiones=3, semilla=0):
+    tamanos = tamanos or TAMANOS
+    resultados = []
+    for caso in casos or CASOS:
+        for tamano in tamanos[caso]:
+            mejores = {}
+            for _ in range(repeticiones):
+                for metrica, valor in CASOS[caso](tamano, semilla).items():
+                    sentido = _sentido(metrica)
+                    if metrica not in mejores or (sentido == 1 and valor > mejores[metrica]) or (sentido == -1 and valor < mejores[metrica]):
+                        mejores[metrica] = valor
+            print(f"{caso} n={tamano}: " + ", ".join(f"{m}={v:.3g}" for m, v in mejores.items()), file=sys.stderr)
+            resultados.append({"caso": caso, "tamano": tamano, "metricas": mejores})
+    return {
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+        "semilla": semilla,
+        "repeticiones": repeticiones,
+        "resultados": resultados,
+    }
+
+#Compara dos corridas y devuelve una fila por métrica comparable con la razón nuevo/base.
+#Una métrica es regresión si empeoró más que 'umbral' (0.1 = 10 %)
+def comparar(base, nuevo, umbral=0.1):
+    anteriores = {(r["caso"], r["tamano"]): r["metricas"] for r in base["resultados"]}
+    filas = []
+    for resultado in nuevo["resultados"]:
+        metricas_base = anteriores.get((resultado["caso"], resultado["tamano"]))
+        if metricas_base is None:
+            continue
+        for metrica, valor in resultado["metricas"].items():
+            sentido = _sentido(metrica)
+            anterior = metricas_base.get(metrica)
+            if sentido == 0 or not anterior:
+                continue
+            razon = valor / anterior
+            #Empeora si el tiempo sube o si el rendimiento baja
+            empeora = razon - 1 if sentido == -1 else (1 / razon - 1 if razon else math.inf)
+            filas.append({
+                "caso": resultado["caso"],
+                "tamano": resultado["tamano"],
+                "metrica": metrica,
+                "base": anterior,
+                "nuevo": valor,
+                "razon": razon,
+                "regresion": empeora > umbral,
+            })
+    return filas
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de los caminos críticos del simulador")
+    parser.add_argument("--casos", nargs="+", choices=sorted(CASOS), help="Casos a correr (por defecto todos)")
+    parser.add_argument("--rapido", action="store_true", help="Usa tamaños chicos (para probar rápido)")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Repeticiones por caso; se toma la mejor (por defecto 3)")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla (por defecto 0)")
+    parser.add_argument("--salida", help="Archivo JSON de resultados (por defecto se imprime)")
+    parser.add_argument("--comparar", nargs=2, metavar=("BASE", "NUEVO"), help="Compara dos archivos de resultados")
+    parser.add_argument("--umbral", type=float, default=0.1, help="Empeoramiento tolerado al comparar (por defecto 0.1 = 10 %%)")
+    args = parser.parse_args(argv)
+
+    if args.comparar:
+        with open(args.comparar[0], encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        with open(args.comparar[1], encoding="utf-8") as archivo:
+            nuevo = json.load(archivo)
+        filas = comparar(base, nuevo, args.umbral)
+        for fila in filas:
+            marca = "REGRESIÓN" if fila["regresion"] else "ok"
+            print(f"{marca:>9}  {fila['caso']} n={fila['tamano']} {fila['metrica']}: "
+                  f"{fila['base']:.3g} -> {fila['nuevo']:.3g} (x{fila['razon']:.2f})")
+        regresiones = sum(fila["regresion"] for fila in filas)
+        print(f"{regresiones} regresiones en {len(filas)} métricas")
+        #Código de salida 1 si hubo regresiones, para usarlo en integración continua
+        return 1 if regresiones else 0
+
+    datos = ejecutar(args.casos, TAMANOS_RAPIDOS if args.rapido else TAMANOS, args.repeticiones, args.semilla)
+    texto = json.dumps(datos, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto)
+    else:
+        print(texto)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#Bitácora de eventos del simulador: cada llegada, admisión, fin y cancelación de un proceso, y cada
+#cambio de la memoria usada, se agrega a un registro en disco para analizarlo después sin la interfaz.
+#El motor solo agrega una tupla a la lista 'lote' (con el lock del simulador ya tomado, sin llamar a
+#ningún método); al publicar la instantánea, si la lista llegó a tamano_lote o pasó 'intervalo' desde
+#la última entrega, se la pasa entera a un hilo escritor que la convierte por columnas a un arreglo
+#estructurado de NumPy y la guarda como un bloque .npy.
+#El directorio queda con eventos-000001.npy, eventos-000002.npy... y LectorBitacora los abre con
+#memory-map, así una bitácora de millones de eventos se filtra por columnas sin cargarla entera.
+#Uso: bitacora = Bitacora("eventos/"); Simulador(..., bitacora=bitacora); ...; bitacora.cerrar()
+import glob
+import os
+import queue
+import sys
+import threading
+import time
+
+import numpy as np
+
+#Tipos de evento (columna 'tipo')
+LLEGADA = 0 #El proceso entró a la cola de espera
+ADMISION = 1 #Se le asignó memoria y pasó a ejecución
+FIN = 2 #Terminó
+CANCELACION = 3 #Se canceló (programado, en cola o en ejecución)
+MEMORIA = 4 #Cambió la memoria usada: pid vacío y memoria_mb = MB en uso de toda la RAM
+TIPOS = ("llegada", "admision", "fin", "cancelacion", "memoria")
+
+#Una fila por evento (33 bytes). Los PIDs se guardan en UTF-8 en 16 bytes, que alcanzan para los del
+#simulador ("P" + número); un bloque con algún PID más largo se escribe con el campo más ancho
+#(ver _arreglo), así nunca se trunca
+DTYPE = np.dtype([("tiempo", "<f8"), ("tipo", "u1"), ("pid", "S16"), ("memoria_mb", "<f8")])
+
+#Filas que se convierten de una vez en el hilo escritor (ver _arreglo)
+_PEDAZO = 4096
+
+_PATRON = "eventos-*.npy"
+
+#Número de bloque de un archivo eventos-NNNNNN.npy
+def _numero(ruta):
+    return int(os.path.basename(ruta)[len("eventos-"):-len(".npy")])
+
+#PIDs de un pedazo del lote como bytes; NumPy los codifica en ASCII y si alguno no lo es
+#se codifican todos en UTF-8
+def _pids(filas):
+    pids = [fila[2] for fila in filas]
+    try:
+        return np.array(pids, dtype="S")
+    except UnicodeEncodeError:
+        return np.array([pid.encode("utf-8") for pid in pids], dtype="S")
+
+#Convierte un lote de tuplas a un arreglo columna por columna (convertir tupla por tupla cuesta
+#varias veces más) y en pedazos cortos, así el hilo escritor suelta el GIL seguido y no demora
+#al motor aunque el lote sea grande
+def _arreglo(lote):
+    pedazos = []
+    ancho = DTYPE["pid"].itemsize
+    for inicio in range(0, len(lote), _PEDAZO):
+        filas = lote[inicio:inicio + _PEDAZO]
+        pids = _pids(filas)
+        ancho = max(ancho, pids.dtype.itemsize)
+        pedazos.append((filas, pids))
+    tipo = DTYPE if ancho == DTYPE["pid"].itemsize else np.dtype(
+        [("tiempo", "<f8"), ("tipo", "u1"), ("pid", f"S{ancho}"), ("memoria_mb", "<f8")])
+    arreglo = np.empty(len(lote), dtype=tipo)
+    inicio = 0
+    for filas, pids in pedazos:
+        parte = arreglo[inicio:inicio + len(filas)]
+        parte["tiempo"] = [fila[0] for fila in filas]
+        parte["tipo"] = [fila[1] for fila in filas]
+        parte["pid"] = pids
+        parte["memoria_mb"] = [fila[3] for fila in filas]
+        inicio += len(filas)
+    return arreglo
+
+#Bloques del directorio en orden
+def _bloques(ruta):
+    return sorted(glob.glob(os.path.join(ruta, _PATRON)), key=_numero)
+
+#Escribe los eventos del simulador en bloques .npy dentro del directorio 'ruta'.
+#Si el directorio ya tiene bloques (por ejemplo al retomar un punto de control) se sigue a continuación
+class Bitacora:
+    def __init__(self, ruta, tamano_lote=65536, intervalo=1.0):
+        self.ruta = ruta
+        os.makedirs(ruta, exist_ok=True)
+        existentes = _bloques(ruta)
+        self._siguiente = _numero(existentes[-1]) + 1 if existentes else 1
+        self.tamano_lote = tamano_lote
+        self.intervalo = intervalo
+        #Eventos (tiempo, tipo, pid, memoria_mb) que todavía no se entregaron; el simulador les
+        #agrega tuplas directamente
+        self.lote = []
+        self._ultima_entrega = time.monotonic()
+        self._memoria = None #Última memoria usada anotada, para anotar solo los cambios
+        #Lotes que esperan al escritor; no tiene límite para que el motor nunca se bloquee
+        self._pendientes = queue.Queue()
+        self.anotados = 0 #Eventos entregados al escritor
+        self.escritos = 0 #Eventos ya guardados en disco
+        self.bloques = 0 #Bloques escritos por esta bitácora
+        self._hilo = threading.Thread(target=self._escribir, daemon=True)
+        self._hilo.start()
+
+    #Agrega un evento (se llama con el lock del simulador tomado). El simulador agrega las tuplas
+    #a 'lote' sin pasar por acá y deja el control del tamaño a pulso
+    def anotar(self, tiempo, tipo, pid, memoria_mb):
+        lote = self.lote
+        lote.append((tiempo, tipo, pid, memoria_mb))
+        if len(lote) >= self.tamano_lote:
+            self.entregar()
+
+    #Anota la memoria usada si cambió desde la última vez
+    def anotar_memoria(self, tiempo, usada):
+        if usada != self._memoria:
+            self._memoria = usada
+            self.anotar(tiempo, MEMORIA, "", usada)
+
+    #Pasa los eventos acumulados al hilo escritor
+    def entregar(self):
+        if self.lote:
+            self.anotados += len(self.lote)
+            self._pendientes.put(self.lote)
+            self.lote = []
+        self._ultima_entrega = time.monotonic()
+
+    #Entrega los eventos acumulados si ya son tamano_lote o pasó 'intervalo' desde la última entrega;
+    #el simulador lo llama al publicar, así la bitácora en disco se mantiene al día aunque lleguen pocos eventos
+    def pulso(self):
+        lote = self.lote
+        if lote and (len(lote) >= self.tamano_lote or time.monotonic() - self._ultima_entrega >= self.intervalo):
+            self.entregar()
+
+    #Bucle del hilo escritor: convierte cada lote a un arreglo y lo guarda como un bloque nuevo.
+    #Se escribe a un temporal y se renombra, así un lector nunca ve un bloque a medias
+    def _escribir(self):
+        while True:
+            lote = self._pendientes.get()
+            if lote is None:
+                return
+            try:
+                arreglo = _arreglo(lote)
+                destino = os.path.join(self.ruta, f"eventos-{self._siguiente:06d}.npy")
+                temporal = f"{destino}.tmp"
+                with open(temporal, "wb") as archivo:
+                    np.save(archivo, arreglo)
+                os.replace(temporal, destino)
+                self._siguiente += 1
+                self.bloques += 1
+                self.escritos += len(lote)
+            except (OSError, ValueError) as error:
+                print(f"No se pudo escribir la bitácora en {self.ruta}: {error}", file=sys.stderr)
+
+    #Entrega lo que quede y espera a que el escritor lo guarde
+    def cerrar(self):
+        if self._hilo is None:
+            return
+        self.entregar()
+        self._pendientes.put(None)
+        self._hilo.join()
+        self._hilo = None
+
+#Lee una bitácora escrita por Bitacora. Los bloques se abren con memory-map: leer una columna
+#o filtrar no copia el archivo a memoria, solo lo que se pide
+class LectorBitacora:
+    def __init__(self, ruta):
+        self.ruta = ruta
+
+    #Cada bloque como arreglo estructurado de solo lectura (memory-map); incluye los que se
+    #hayan escrito desde que se creó el lector
+    def bloques(self):
+        for ruta in _bloques(self.ruta):
+            yield np.load(ruta, mmap_mode="r")
+
+    def __len__(self):
+        return sum(len(bloque) for bloque in self.bloques())
+
+    #Una columna (tiempo, tipo, pid o memoria_mb) de toda la bitácora
+    def columna(self, nombre):
+        partes = [bloque[nombre] for bloque in self.bloques()]
+        return np.concatenate(partes) if partes else np.empty(0, dtype=DTYPE[nombre])
+
+    #Eventos que cumplen los filtros, en orden: tipo (código o nombre de TIPOS), pid y
+    #rango de tiempo [desde, hasta). Sin filtros devuelve toda la bitácora
+    def leer(self, tipo=None, pid=None, desde=None, hasta=None):
+        if isinstance(tipo, str):
+            tipo = TIPOS.index(tipo)
+        if isinstance(pid, str):
+            pid = pid.encode("utf-8")
+        partes = []
+        for bloque in self.bloques():
+            mascara = np.ones(len(bloque), dtype=bool)
+            if tipo is not None:
+                mascara &= bloque["tipo"] == tipo
+            if pid is not None:
+                mascara &= bloque["pid"] == pid
+            if desde is not None:
+                mascara &= bloque["tiempo"] >= desde
+            if hasta is not None:
+                mascara &= bloque["tiempo"] < hasta
+            partes.append(bloque[mascara])
+        return np.concatenate(partes) if partes else np.empty(0, dtype=DTYPE)
+
+    #Cantidad de eventos de cada tipo
+    def conteo_por_tipo(self):
+        conteo = np.zeros(len(TIPOS), dtype=np.int64)
+        for bloque in self.bloques():
+            conteo += np.bincount(bloque["tipo"], minlength=len(TIPOS))[:len(TIPOS)]
+        return dict(zip(TIPOS, conteo.tolist()))
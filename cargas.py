@@ -0,0 +1,217 @@
+#Generación y reproducción de cargas de trabajo.
+#Las cargas sintéticas son reproducibles (cada una usa su propio random.Random con semilla)
+#y las trazas grabadas se leen fila por fila con generadores, así una traza de millones
+#de procesos nunca está entera en memoria.
+#Cada proceso de una carga es un diccionario con nombre, memoria_mb, duracion_s, llegada y prioridad.
+#Uso: python cargas.py --llegadas rafagas --memoria pareto --cantidad 1000000 --semilla 1 --salida traza.jsonl
+import argparse
+import csv
+import json
+import math
+import random
+import sys
+
+#Columnas de una traza en CSV
+COLUMNAS_TRAZA = ["nombre", "memoria_mb", "duracion_s", "llegada", "prioridad"]
+
+#Distribución de la memoria o la duración de los procesos.
+# tipo "uniforme": valores entre minimo y maximo
+# tipo "pareto": Pareto acotada entre minimo y maximo con índice 'forma' (cola pesada: pocos procesos enormes)
+# tipo "lognormal": mediana en la media geométrica de minimo y maximo, sigma 'forma', recortada al rango
+# entero=True redondea los valores (por ejemplo la memoria en MB)
+class Distribucion:
+    TIPOS = ("uniforme", "pareto", "lognormal")
+
+    def __init__(self, tipo, minimo, maximo, forma=1.5, entero=False):
+        if tipo not in self.TIPOS:
+            raise ValueError(f"Distribución desconocida '{tipo}'. Opciones: {', '.join(self.TIPOS)}")
+        if not 0 < minimo <= maximo:
+            raise ValueError("La distribución necesita 0 < minimo <= maximo")
+        self.tipo = tipo
+        self.minimo = minimo
+        self.maximo = maximo
+        self.forma = forma
+        self.entero = entero
+
+    def muestra(self, rng):
+        if self.tipo == "uniforme":
+            if self.entero:
+                return rng.randint(self.minimo, self.maximo)
+            return rng.uniform(self.minimo, self.maximo)
+        if self.tipo == "pareto":
+            #Inversa de la función de distribución de la Pareto acotada
+            cociente = (self.minimo / self.maximo) ** self.forma
+            valor = self.minimo / (1 - rng.random() * (1 - cociente)) ** (1 / self.forma)
+        else:
+            mediana = math.sqrt(self.minimo * self.maximo)
+            valor = rng.lognormvariate(math.log(mediana), self.forma)
+        valor = min(max(valor, self.minimo), self.maximo)
+        return max(1, round(valor)) if self.entero else valor
+
+#Distribuciones predefinidas; las "uniformes" son los mismos rangos que usa Proceso por defecto
+MEMORIA = {
+    "uniforme": Distribucion("uniforme", 50, 250, entero=True),
+    "pareto": Distribucion("pareto", 16, 1024, forma=1.2, entero=True),
+    "lognormal": Distribucion("lognormal", 16, 1024, forma=1.0, entero=True),
+}
+DURACION = {
+    "uniforme": Distribucion("uniforme", 5, 20, entero=True),
+    "pareto": Distribucion("pareto", 1, 600, forma=1.5),
+    "lognormal": Distribucion("lognormal", 1, 600, forma=1.2),
+}
+
+#Llegadas de Poisson: tiempos entre llegadas exponenciales con 'tasa' procesos por segundo
+def llegadas_poisson(rng, tasa):
+    tiempo = 0.0
+    while True:
+        tiempo += rng.expovariate(tasa)
+        yield tiempo
+
+#Llegadas en ráfagas (encendido/apagado): durante los periodos encendidos llegan procesos
+#a 'tasa' por segundo y en los apagados no llega ninguno. La duración de cada periodo es
+#exponencial con media 'encendido' y 'apagado' segundos
+def llegadas_rafagas(rng, tasa, encendido=30, apagado=90):
+    tiempo = 0.0
+    while True:
+        fin = tiempo + rng.expovariate(1 / encendido)
+        while True:
+            tiempo += rng.expovariate(tasa)
+            if tiempo > fin:
+                break
+            yield tiempo
+        #La llegada que se pasó del periodo se descarta (las exponenciales no tienen memoria)
+        tiempo = fin + rng.expovariate(1 / apagado)
+
+#Llegadas con ciclo diario: la tasa sube y baja como una senoidal de 'periodo' segundos
+#entre tasa * (1 - amplitud) y tasa * (1 + amplitud). Se genera por adelgazamiento:
+#se proponen llegadas a la tasa máxima y cada una se acepta con probabilidad tasa(t) / tasa máxima
+def llegadas_diurnas(rng, tasa, amplitud=0.8, periodo=86400):
+    maxima = tasa * (1 + amplitud)
+    tiempo = 0.0
+    while True:
+        tiempo += rng.expovariate(maxima)
+        actual = tasa * (1 + amplitud * math.sin(2 * math.pi * tiempo / periodo))
+        if rng.random() * maxima <= actual:
+            yield tiempo
+
+#Nombre -> generador de instantes de llegada
+LLEGADAS = {
+    "poisson": llegadas_poisson,
+    "rafagas": llegadas_rafagas,
+    "diurna": llegadas_diurnas,
+}
+
+#Genera una carga sintética de forma perezosa (un proceso a la vez).
+# cantidad: procesos a generar; hasta: último instante de llegada (None = sin límite)
+# memoria y duracion: nombre de una distribución predefinida o una Distribucion
+# opciones: parámetros extra del patrón de llegadas (encendido, apagado, amplitud, periodo)
+def generar_carga(semilla=None, cantidad=None, hasta=None, llegadas="poisson", tasa=0.5,
+                  memoria="uniforme", duracion="uniforme", **opciones):
+    if llegadas not in LLEGADAS:
+        raise ValueError(f"Patrón de llegadas desconocido '{llegadas}'. Opciones: {', '.join(LLEGADAS)}")
+    if cantidad is None and hasta is None:
+        raise ValueError("Hay que indicar la cantidad de procesos o hasta qué instante generar")
+    memoria = MEMORIA[memoria] if isinstance(memoria, str) else memoria
+    duracion = DURACION[duracion] if isinstance(duracion, str) else duracion
+    rng = random.Random(semilla)
+    for numero, llegada in enumerate(LLEGADAS[llegadas](rng, tasa, **opciones), start=1):
+        if (cantidad is not None and numero > cantidad) or (hasta is not None and llegada > hasta):
+            return
+        yield {
+            "nombre": f"Proceso-{numero}",
+            "memoria_mb": memoria.muestra(rng),
+            "duracion_s": duracion.muestra(rng),
+            "llegada": llegada,
+            "prioridad": 0,
+        }
+
+#Convierte una fila leída de una traza al formato de carga (lanza ValueError si es inválida)
+def _normalizar(fila, numero, ruta):
+    try:
+        return {
+            "nombre": fila.get("nombre") or None,
+            "memoria_mb": int(float(fila["memoria_mb"])),
+            "duracion_s": float(fila["duracion_s"]),
+            "llegada": float(fila.get("llegada") or 0),
+            "prioridad": float(fila.get("prioridad") or 0),
+        }
+    except (KeyError, TypeError, ValueError) as error:
+        raise ValueError(f"Fila {numero} inválida en {ruta}: {error}") from error
+
+#Lee una traza grabada y devuelve sus procesos uno por uno, en orden de llegada.
+#CSV y JSONL (un objeto por línea) se leen de forma perezosa y por eso tienen que venir ordenados
+#por llegada: si una fila llega antes que la anterior se lanza ValueError con su número.
+#Un JSON (lista de procesos o un objeto con la clave "procesos") se carga entero y se ordena
+def leer_traza(ruta):
+    minuscula = ruta.lower()
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        if minuscula.endswith(".json"):
+            datos = json.load(archivo)
+            filas = datos["procesos"] if isinstance(datos, dict) else datos
+            procesos = [_normalizar(fila, numero, ruta) for numero, fila in enumerate(filas, start=1)]
+            #sorted es estable: los que llegan a la vez quedan en el orden del archivo
+            yield from sorted(procesos, key=lambda datos: datos["llegada"])
+            return
+        if minuscula.endswith((".jsonl", ".ndjson")):
+            filas = _filas_jsonl(archivo, ruta)
+        else:
+            filas = enumerate(csv.DictReader(archivo), start=1)
+        anterior = None
+        for numero, fila in filas:
+            datos = _normalizar(fila, numero, ruta)
+            if anterior is not None and datos["llegada"] < anterior:
+                raise ValueError(f"Fila {numero} fuera de orden en {ruta}: llegada {datos['llegada']} "
+                                 f"es anterior a {anterior} (la traza debe estar ordenada por llegada)")
+            anterior = datos["llegada"]
+            yield datos
+
+#Filas (número, objeto) de un archivo JSONL, salteando las líneas vacías
+def _filas_jsonl(archivo, ruta):
+    for numero, linea in enumerate(archivo, start=1):
+        if linea.strip():
+            try:
+                yield numero, json.loads(linea)
+            except json.JSONDecodeError as error:
+                raise ValueError(f"Fila {numero} inválida en {ruta}: {error}") from error
+
+#Escribe una carga (lista o generador) como traza CSV o JSONL sin juntarla en memoria
+def guardar_traza(carga, ruta):
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        if ruta.lower().endswith((".jsonl", ".ndjson")):
+            for proceso in carga:
+                archivo.write(json.dumps(proceso, ensure_ascii=False) + "\n")
+        else:
+            escritor = csv.DictWriter(archivo, fieldnames=COLUMNAS_TRAZA, extrasaction="ignore")
+            escritor.writeheader()
+            escritor.writerows(carga)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera una carga sintética reproducible y la guarda como traza")
+    parser.add_argument("--llegadas", default="poisson", choices=sorted(LLEGADAS), help="Patrón de llegadas")
+    parser.add_argument("--tasa", type=float, default=0.5, help="Procesos por segundo (media) (por defecto 0.5)")
+    parser.add_argument("--memoria", default="uniforme", choices=sorted(MEMORIA), help="Distribución de la memoria")
+    parser.add_argument("--duracion", default="uniforme", choices=sorted(DURACION), help="Distribución de la duración")
+    parser.add_argument("--cantidad", type=int, help="Cantidad de procesos")
+    parser.add_argument("--hasta", type=float, help="Último instante de llegada en segundos")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla (por defecto 0)")
+    parser.add_argument("--encendido", type=float, default=30, help="Duración media de una ráfaga en segundos")
+    parser.add_argument("--apagado", type=float, default=90, help="Duración media del silencio entre ráfagas en segundos")
+    parser.add_argument("--amplitud", type=float, default=0.8, help="Variación de la tasa en el ciclo diario (0 a 1)")
+    parser.add_argument("--periodo", type=float, default=86400, help="Duración del ciclo diario en segundos")
+    parser.add_argument("--salida", required=True, help="Archivo .csv o .jsonl de salida")
+    args = parser.parse_args(argv)
+
+    if args.cantidad is None and args.hasta is None:
+        parser.error("Indica --cantidad o --hasta")
+    opciones = {}
+    if args.llegadas == "rafagas":
+        opciones = {"encendido": args.encendido, "apagado": args.apagado}
+    elif args.llegadas == "diurna":
+        opciones = {"amplitud": args.amplitud, "periodo": args.periodo}
+    carga = generar_carga(args.semilla, args.cantidad, args.hasta, args.llegadas, args.tasa,
+                          args.memoria, args.duracion, **opciones)
+    guardar_traza(carga, args.salida)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+#Memoria repartida en varios nodos (o dominios NUMA), cada uno con su propio GestorMemoria.
+#GestorCluster tiene la misma interfaz que GestorMemoria, así el simulador y las políticas de
+#admisión lo usan sin cambios: al admitir un proceso la capa de colocación elige el nodo.
+#Los nodos se mantienen en una lista ordenada por memoria asignable, así elegir nodo es una
+#búsqueda binaria (O(log nodos)); reubicar un nodo en la lista al asignar o liberar es O(nodos) por
+#el corrimiento de la lista (un memmove: unos microsegundos aun con miles de nodos).
+#Políticas de colocación:
+# "menos_cargado": el nodo con más memoria libre (con asignador contiguo, si el proceso no entra en
+#   ningún hueco de ese nodo, mejor ajuste)
+# "mejor_ajuste": el nodo con menos memoria libre en el que el proceso cabe (deja los grandes huecos libres)
+# "localidad": el nodo "de origen" del grupo del proceso (su nombre sin el sufijo "-N"); si no cabe, mejor ajuste
+#Con desborde_remoto un proceso que no cabe en ningún nodo puede usar memoria de otros nodos
+#(memoria remota): ocupa todo lo libre del nodo con más espacio y el resto en los siguientes,
+#y su duración se alarga en penalizacion_remota * fracción remota (1.0 = el doble si fuera todo remoto)
+import bisect
+import threading
+import zlib
+
+from asignadores import ArbolDirecciones
+
+COLOCACIONES = ("menos_cargado", "mejor_ajuste", "localidad")
+
+class GestorCluster:
+    # nodos: cantidad de nodos de ram_total_gb cada uno, o lista con la RAM en GB de cada nodo
+    # estrategia: asignador contiguo de cada nodo (ver GestorMemoria)
+    def __init__(self, nodos=4, ram_total_gb=1, colocacion="mejor_ajuste", estrategia=None,
+                 desborde_remoto=False, penalizacion_remota=1.0):
+        #Se importa aquí porque core importa este módulo
+        from core import GestorMemoria
+
+        if colocacion not in COLOCACIONES:
+            raise ValueError(f"Colocación desconocida '{colocacion}'. Opciones: {', '.join(COLOCACIONES)}")
+        if desborde_remoto and estrategia:
+            raise ValueError("El desborde a memoria remota no se puede combinar con un asignador contiguo")
+        tamanos = [ram_total_gb] * nodos if isinstance(nodos, int) else list(nodos)
+        if not tamanos:
+            raise ValueError("El cluster necesita al menos un nodo")
+        self.nodos = [GestorMemoria(gb, estrategia) for gb in tamanos]
+        self.colocacion = colocacion
+        self.desborde_remoto = desborde_remoto
+        self.penalizacion_remota = penalizacion_remota
+        self.ram_total = sum(nodo.ram_total for nodo in self.nodos)
+        self.memoria_disponible = self.ram_total
+        #Un proceso puede ocupar a lo sumo el nodo más grande (o todo el cluster con desborde)
+        self.capacidad = self.ram_total if desborde_remoto else max(nodo.ram_total for nodo in self.nodos)
+        self.asignador = None
+        self.paginas = None
+        #(memoria asignable, nodo) de todos los nodos, ordenada; _claves tiene la entrada vigente de cada nodo
+        self._claves = [nodo.maximo_asignable() for nodo in self.nodos]
+        self._libres = sorted((libre, i) for i, libre in enumerate(self._claves))
+        #pid -> (nodo local, partes) donde partes es None o [(nodo, mb), ...] si el proceso se desbordó
+        self._ubicacion = {}
+        self._procesos = [0] * len(self.nodos) #Procesos con su parte local en cada nodo
+        self._prestada = [0] * len(self.nodos) #MB que cada nodo presta a procesos de otros nodos
+        self.memoria_remota = 0 #Suma de _prestada
+        #Para que metricas() no recorra los nodos: árboles de máximos por nodo (ver asignadores.ArbolDirecciones)
+        #con la utilización y con 1 - utilización (su máximo da la mínima), actualizados en O(log nodos),
+        #y los MB usados por tamaño de nodo (la utilización media es la suma de usada / tamaño de cada
+        #grupo, sin acumular errores de redondeo)
+        self._utilizacion_max = ArbolDirecciones(len(self.nodos))
+        self._utilizacion_min = ArbolDirecciones(len(self.nodos))
+        for i in range(len(self.nodos)):
+            self._utilizacion_min.fijar(i, 1.0)
+        #Memoria libre de cada nodo en un árbol de máximos, para "menos_cargado"
+        self._disponible = ArbolDirecciones(len(self.nodos))
+        for i, nodo in enumerate(self.nodos):
+            self._disponible.fijar(i, nodo.memoria_disponible)
+        self._usada = [0] * len(self.nodos)
+        self._usada_por_tamano = dict.fromkeys((nodo.ram_total for nodo in self.nodos), 0)
+        self.desbordados = 0 #Procesos admitidos con memoria remota
+        self.lock = threading.Lock()
+
+    #Los locks no se pueden serializar (puntos de control): se descartan y se crean de nuevo
+    def __getstate__(self):
+        estado = dict(vars(self))
+        del estado["lock"]
+        return estado
+
+    def __setstate__(self, estado):
+        vars(self).update(estado)
+        self.lock = threading.Lock()
+
+    #Vuelve a ubicar un nodo en la lista ordenada, los árboles y los totales después de que cambió su memoria
+    def _actualizar(self, i):
+        nodo = self.nodos[i]
+        anterior = self._claves[i]
+        del self._libres[bisect.bisect_left(self._libres, (anterior, i))]
+        self._claves[i] = nuevo = nodo.maximo_asignable()
+        bisect.insort(self._libres, (nuevo, i))
+        self._disponible.fijar(i, nodo.memoria_disponible)
+        usada = nodo.ram_total - nodo.memoria_disponible
+        self._usada_por_tamano[nodo.ram_total] += usada - self._usada[i]
+        self._usada[i] = usada
+        utilizacion = usada / nodo.ram_total
+        self._utilizacion_max.fijar(i, utilizacion)
+        self._utilizacion_min.fijar(i, 1.0 - utilizacion)
+
+    #Nodo con menos memoria asignable en el que cabe 'memoria' (None si no cabe en ninguno)
+    def _mejor_ajuste(self, memoria):
+        j = bisect.bisect_left(self._libres, (memoria, -1))
+        return self._libres[j][1] if j < len(self._libres) else None
+
+    #Nodo de origen del grupo del proceso (estable entre corridas)
+    def nodo_origen(self, proceso):
+        grupo = proceso.nombre.rsplit("-", 1)[0]
+        return zlib.crc32(grupo.encode("utf-8")) % len(self.nodos)
+
+    #Elige el nodo según la política de colocación (None si el proceso no cabe entero en ninguno)
+    def _elegir(self, proceso):
+        memoria = proceso.memoria_mb
+        if self.colocacion == "menos_cargado":
+            #El primer nodo con la mayor memoria libre
+            i = self._disponible.buscar(self._disponible.maximo())
+            if self._claves[i] >= memoria:
+                return i
+        if self.colocacion == "localidad":
+            origen = self.nodo_origen(proceso)
+            if self._claves[origen] >= memoria:
+                return origen
+        return self._mejor_ajuste(memoria)
+
+    #Toma o devuelve memoria sin asignador de un nodo (solo nodos sin asignador contiguo)
+    def _ajustar(self, i, memoria):
+        nodo = self.nodos[i]
+        with nodo.lock:
+            nodo.memoria_disponible += memoria
+        self._actualizar(i)
+
+    def asignar_memoria(self, proceso):
+        with self.lock:
+            i = self._elegir(proceso)
+            if i is not None:
+                if not self.nodos[i].asignar_memoria(proceso):
+                    return False
+                self._ubicacion[proceso.pid] = (i, None)
+                self._procesos[i] += 1
+                self._actualizar(i)
+                self.memoria_disponible -= proceso.memoria_mb
+                return True
+            if not self.desborde_remoto or self.memoria_disponible < proceso.memoria_mb:
+                return False
+            return self._desbordar(proceso)
+
+    #Reparte un proceso entre nodos empezando por el de más memoria libre (se llama con el lock tomado)
+    def _desbordar(self, proceso):
+        resto = proceso.memoria_mb
+        partes = []
+        #La segunda condición evita quedar en un ciclo por redondeos con memorias no enteras
+        while resto > 0 and self._libres[-1][0] > 0:
+            libre, i = self._libres[-1]
+            tomada = min(libre, resto)
+            partes.append((i, tomada))
+            self._ajustar(i, -tomada)
+            resto -= tomada
+        local = partes[0][0]
+        for i, tomada in partes[1:]:
+            self._prestada[i] += tomada
+            self.memoria_remota += tomada
+        self._ubicacion[proceso.pid] = (local, partes)
+        self._procesos[local] += 1
+        self.memoria_disponible -= sum(tomada for _, tomada in partes)
+        self.desbordados += 1
+        #La parte remota es más lenta: se alarga lo que le falta ejecutar
+        remota = (proceso.memoria_mb - partes[0][1]) / proceso.memoria_mb
+        proceso.tiempo_restante *= 1 + self.penalizacion_remota * remota
+        return True
+
+    def liberar_memoria(self, proceso):
+        with self.lock:
+            self._liberar(proceso)
+
+    #Libera la memoria de un proceso en su nodo (o sus nodos) (se llama con el lock tomado)
+    def _liberar(self, proceso):
+        ubicacion = self._ubicacion.pop(proceso.pid, None)
+        if ubicacion is None:
+            return
+        local, partes = ubicacion
+        if partes is None:
+            self.nodos[local].liberar_memoria(proceso)
+            self._actualizar(local)
+            self.memoria_disponible += proceso.memoria_mb
+        else:
+            for i, tomada in partes:
+                self._ajustar(i, tomada)
+                self.memoria_disponible += tomada
+            for i, tomada in partes[1:]:
+                self._prestada[i] -= tomada
+                self.memoria_remota -= tomada
+        self._procesos[local] -= 1
+
+    #Cada proceso vuelve a su nodo, así que el total ya sumado no alcanza: se libera uno por uno
+    def liberar_memoria_lote(self, procesos, memoria_total):
+        with self.lock:
+            for proceso in procesos:
+                self._liberar(proceso)
+
+    #Tamaño del proceso más grande que se podría asignar ahora mismo
+    def maximo_asignable(self):
+        if self.desborde_remoto:
+            return self.memoria_disponible
+        return self._libres[-1][0]
+
+    #Nodo donde se ejecuta un proceso (su parte local) o None
+    def nodo_de(self, pid):
+        ubicacion = self._ubicacion.get(pid)
+        return ubicacion[0] if ubicacion else None
+
+    def metricas_paginacion(self):
+        return {}
+
+    #Fragmentación de cada nodo (vacía si los nodos no tienen asignador)
+    def metricas_fragmentacion(self):
+        if self.nodos[0].asignador is None:
+            return {}
+        return {"nodos": [nodo.metricas_fragmentacion() for nodo in self.nodos]}
+
+    #Resumen del cluster para las estadísticas del simulador; sale de los totales que lleva
+    #_actualizar, así que no depende de la cantidad de nodos (se pide en cada publicación)
+    def metricas(self):
+        with self.lock:
+            suma = sum(usada / tamano for tamano, usada in self._usada_por_tamano.items())
+            return {
+                "nodos": len(self.nodos),
+                "colocacion": self.colocacion,
+                "utilizacion_media": suma / len(self.nodos),
+                "utilizacion_min": 1.0 - self._utilizacion_min.maximo(),
+                "utilizacion_max": self._utilizacion_max.maximo(),
+                "procesos_desbordados": self.desbordados,
+                "memoria_remota_mb": self.memoria_remota,
+            }
+
+    #Una fila por nodo con su uso, los procesos que aloja, la memoria que presta y, con colocación
+    #por localidad y si se pasa la cola de espera, cuántos procesos esperan con ese nodo como origen
+    #(con las otras colocaciones un proceso en espera no tiene nodo, así que no se informa).
+    #Recorre la cola entera, así que es para reportes y no para cada tick
+    def metricas_nodos(self, cola=None):
+        en_espera = None
+        if cola is not None and self.colocacion == "localidad":
+            en_espera = [0] * len(self.nodos)
+            for proceso in cola:
+                en_espera[self.nodo_origen(proceso)] += 1
+        with self.lock:
+            filas = [
+                {
+                    "nodo": i,
+                    "ram_total_mb": nodo.ram_total,
+                    "usada_mb": nodo.ram_total - nodo.memoria_disponible,
+                    "utilizacion": (nodo.ram_total - nodo.memoria_disponible) / nodo.ram_total,
+                    "procesos": self._procesos[i],
+                    "prestada_mb": self._prestada[i],
+                }
+                for i, nodo in enumerate(self.nodos)
+            ]
+        if en_espera is not None:
+            for fila, cantidad in zip(filas, en_espera):
+                fila["en_espera"] = cantidad
+        return filas
@@ -0,0 +1,211 @@
+#Estado en vivo del simulador en memoria compartida (multiprocessing.shared_memory) para tableros
+#y visores que corren en otros procesos: leen la memoria usada, la cola, la ejecución y el rendimiento
+#directamente del segmento, sin pedírselo al simulador y sin tomar su lock.
+#El motor escribe en cada publicación de la instantánea solo los contadores y las muestras nuevas
+#de las series (O(1)). La consistencia es de tipo seqlock: el escritor pone la secuencia en impar,
+#escribe y la vuelve a par; el lector copia lo que necesita y reintenta si la secuencia era impar
+#o cambió mientras copiaba. El escritor nunca espera a los lectores.
+#Disposición del segmento: CABECERA (contadores) y, desde _INICIO_SERIES, tiempos[capacidad] y
+#valores[capacidad, len(CANALES)] en float64, un búfer circular con las mismas columnas que series.SeriesTiempo.
+#Uso: python compartido.py NOMBRE   (muestra el estado del simulador que publica en NOMBRE cada segundo)
+import argparse
+import json
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from series import CANALES
+
+_MAGIA = b"GRAMSHM1"
+VERSION_FORMATO = 1
+
+#Contadores de la cabecera, todos alineados a 8 bytes
+CABECERA = np.dtype([
+    ("magia", "S8"),
+    ("version_formato", "<u4"),
+    ("capacidad", "<u4"),
+    ("secuencia", "<u8"), #Par = estable, impar = el escritor está actualizando
+    ("version", "<u8"), #Versión de la instantánea publicada
+    ("reloj", "<f8"),
+    ("publicado_en", "<f8"), #time.time() de la última publicación, para saber si el simulador sigue vivo
+    ("memoria_usada", "<f8"),
+    ("memoria_total", "<f8"),
+    ("en_ejecucion", "<u8"),
+    ("en_cola", "<u8"),
+    ("terminados", "<u8"),
+    ("cancelados", "<u8"),
+    ("rendimiento", "<f8"), #Procesos terminados por segundo en la última muestra
+    ("escritas", "<u8"), #Total de muestras escritas en las series (la siguiente va en escritas % capacidad)
+])
+_INICIO_SERIES = 128 #Las series empiezan alineadas a una línea de caché después de la cabecera
+
+#Tamaño del segmento para una capacidad de series dada
+def _tamano(capacidad):
+    return _INICIO_SERIES + capacidad * 8 * (1 + len(CANALES))
+
+#Vistas de NumPy sobre el segmento: (cabecera 0-d, tiempos, valores)
+def _vistas(buffer, capacidad):
+    cabecera = np.ndarray((), dtype=CABECERA, buffer=buffer)
+    tiempos = np.ndarray((capacidad,), dtype=np.float64, buffer=buffer, offset=_INICIO_SERIES)
+    valores = np.ndarray((capacidad, len(CANALES)), dtype=np.float64, buffer=buffer,
+                         offset=_INICIO_SERIES + capacidad * 8)
+    return cabecera, tiempos, valores
+
+#Segmentos creados por este proceso (los borra su PublicadorCompartido)
+_creados = set()
+
+#Abre un segmento existente sin que este proceso lo borre al salir (el resource_tracker de
+#Python < 3.13 borra todo segmento que el proceso haya abierto, aunque no lo haya creado)
+def _abrir(nombre):
+    try:
+        return shared_memory.SharedMemory(nombre, track=False)
+    except TypeError:
+        memoria = shared_memory.SharedMemory(nombre)
+        if memoria.name not in _creados:
+            resource_tracker.unregister(memoria._name, "shared_memory")
+        return memoria
+
+#Lado del simulador: crea el segmento y lo actualiza en cada publicación.
+#nombre: nombre del segmento (None = uno al azar, disponible en .nombre); capacidad: muestras de las series
+class PublicadorCompartido:
+    def __init__(self, nombre=None, capacidad=14400):
+        self.capacidad = capacidad
+        self._memoria = shared_memory.SharedMemory(nombre, create=True, size=_tamano(capacidad))
+        self.nombre = self._memoria.name
+        _creados.add(self.nombre)
+        self._cabecera, self._tiempos, self._valores = _vistas(self._memoria.buf, capacidad)
+        self._cabecera["magia"] = _MAGIA
+        self._cabecera["version_formato"] = VERSION_FORMATO
+        self._cabecera["capacidad"] = capacidad
+        self._copiadas = 0 #Muestras de la serie del simulador ya copiadas al segmento
+
+    #Escribe la instantánea recién publicada y las muestras nuevas de 'series' (se llama con el lock
+    #del simulador tomado, que es el único que escribe en series)
+    def publicar(self, instantanea, series):
+        c = self._cabecera
+        c["secuencia"] += 1
+        escritas = series.escritas
+        if escritas < self._copiadas:
+            #Se reiniciaron las series del simulador: se empieza de nuevo
+            self._copiadas = 0
+            c["escritas"] = 0
+        #Solo las muestras que siguen en el búfer de origen y entran en el destino
+        desde = max(self._copiadas, escritas - series.capacidad, escritas - self.capacidad)
+        destino = int(c["escritas"]) + (desde - self._copiadas)
+        for indice in range(desde, escritas):
+            i = destino % self.capacidad
+            self._tiempos[i] = series.tiempos[indice % series.capacidad]
+            self._valores[i] = series.valores[indice % series.capacidad]
+            destino += 1
+        c["escritas"] = destino
+        self._copiadas = escritas
+        c["version"] = instantanea.version
+        c["reloj"] = instantanea.reloj
+        c["publicado_en"] = time.time()
+        c["memoria_usada"] = instantanea.memoria_usada
+        c["memoria_total"] = instantanea.memoria_total
+        c["en_ejecucion"] = instantanea.en_ejecucion
+        c["en_cola"] = instantanea.en_cola
+        c["terminados"] = instantanea.terminados
+        c["cancelados"] = instantanea.estadisticas["procesos_cancelados"]
+        if destino:
+            c["rendimiento"] = self._valores[(destino - 1) % self.capacidad, CANALES.index("rendimiento")]
+        c["secuencia"] += 1
+
+    #Cierra y borra el segmento; los lectores que lo tengan abierto siguen viendo el último estado
+    def cerrar(self):
+        if self._memoria is None:
+            return
+        del self._cabecera, self._tiempos, self._valores #Las vistas tienen que soltar el búfer antes de cerrarlo
+        self._memoria.close()
+        self._memoria.unlink()
+        self._memoria = None
+        _creados.discard(self.nombre)
+
+#Lado de los tableros: abre el segmento por nombre y lee copias consistentes.
+#intentos: cuántas veces se reintenta una lectura que se cruzó con una escritura
+class LectorCompartido:
+    def __init__(self, nombre, intentos=1000):
+        self._memoria = _abrir(nombre)
+        self.intentos = intentos
+        #Se copia la cabecera para no dejar vistas abiertas si hay que cerrar el segmento
+        cabecera = np.ndarray((), dtype=CABECERA, buffer=self._memoria.buf).copy()
+        if cabecera["magia"] != _MAGIA or cabecera["version_formato"] != VERSION_FORMATO:
+            self._memoria.close()
+            raise ValueError(f"El segmento {nombre} no es del simulador o tiene otro formato")
+        self.capacidad = int(cabecera["capacidad"])
+        self._cabecera, self._tiempos, self._valores = _vistas(self._memoria.buf, self.capacidad)
+
+    #Copia consistente de la cabecera y de lo que devuelva 'copiar' (o None).
+    #Lanza RuntimeError si el escritor estuvo escribiendo en todos los intentos
+    def _leer(self, copiar=None):
+        c = self._cabecera
+        for _ in range(self.intentos):
+            antes = int(c["secuencia"])
+            if antes % 2 == 0:
+                cabecera = c.copy()
+                extra = copiar(cabecera) if copiar else None
+                if int(c["secuencia"]) == antes:
+                    return cabecera, extra
+            time.sleep(0)
+        raise RuntimeError("No se pudo leer un estado consistente de la memoria compartida")
+
+    #Contadores del último estado publicado
+    def leer(self):
+        cabecera, _ = self._leer()
+        return {campo: cabecera[campo].item() for campo in CABECERA.names[4:]}
+
+    #Muestras de las series en orden cronológico: (tiempos, valores[n, CANALES]).
+    #ultimas limita la copia a las n más recientes
+    def series(self, ultimas=None):
+        def copiar(cabecera):
+            escritas = int(cabecera["escritas"])
+            n = min(escritas, self.capacidad)
+            if ultimas is not None:
+                n = min(n, ultimas)
+            indices = np.arange(escritas - n, escritas) % self.capacidad
+            return self._tiempos[indices], self._valores[indices]
+        _, (tiempos, valores) = self._leer(copiar)
+        return tiempos, valores
+
+    def cerrar(self):
+        if self._memoria is None:
+            return
+        del self._cabecera, self._tiempos, self._valores
+        self._memoria.close()
+        self._memoria = None
+
+#Monitor de consola: imprime el estado de un simulador que publica en memoria compartida
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Muestra en vivo el estado que publica el simulador en memoria compartida")
+    parser.add_argument("nombre", help="Nombre del segmento (--compartir del simulador)")
+    parser.add_argument("--intervalo", type=float, default=1, help="Segundos entre líneas (por defecto 1)")
+    parser.add_argument("--una-vez", action="store_true", help="Imprime el estado una sola vez en JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        lector = LectorCompartido(args.nombre)
+    except FileNotFoundError:
+        parser.error(f"No hay un simulador publicando en {args.nombre}")
+    except ValueError as error:
+        parser.error(str(error))
+    try:
+        if args.una_vez:
+            print(json.dumps(lector.leer(), indent=2))
+            return 0
+        while True:
+            e = lector.leer()
+            memoria = e["memoria_usada"] / e["memoria_total"] if e["memoria_total"] else 0
+            print(f"reloj {e['reloj']:.1f}  memoria {memoria:.0%}  cola {e['en_cola']}  "
+                  f"ejecución {e['en_ejecucion']}  terminados {e['terminados']}  "
+                  f"rendimiento {e['rendimiento']:.2f}/s", flush=True)
+            time.sleep(args.intervalo)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        lector.cerrar()
+
+if __name__ == "__main__":
+    sys.exit(main())
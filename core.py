@@ -1,40 +1,117 @@
-import uuid #Nos permite generar identificadores únicos
 import random
 import time #Para trabajar con funciones relaciones con el tiempo.
 import threading #Nos permite trabajar con multiples hilos
+import fnmatch
+import re
+import heapq #Cola de prioridad para el motor de eventos discretos
+from collections import namedtuple
+from types import MappingProxyType
+from estructuras import ConjuntoEjecucion
+from politicas import crear_politica
+from estadisticas import EstadisticasIncrementales
+from asignadores import crear_asignador
+from historial import HistorialTerminados, HistorialCancelados
+from paginacion import MemoriaPaginada
+from cluster import GestorCluster
+from cpu import PlanificadorCPU
+from metricas import LockMedido
+from series import SeriesTiempo
+from bitacora import LLEGADA, ADMISION, FIN, CANCELACION
+
+#Tipos de evento que maneja el motor de eventos discretos
+EVENTO_LLEGADA = 0
+EVENTO_FIN = 1
+EVENTO_TICK = 2 #Avance periódico de los procesos cuando la memoria es paginada
+EVENTO_LLEGADA_FUENTE = 3 #Llegada que viene de una fuente perezosa (ver conectar_fuente)
+EVENTO_CPU = 4 #Fin de la próxima rebanada de CPU cuando hay planificación de núcleos
+
+#Generador propio para la memoria y duración por defecto de los procesos,
+#así no se depende del estado del random global
+_aleatorio = random.Random()
+
+#Estados posibles de un proceso; el índice es el código compacto que usa TablaProcesos
+ESTADOS = ("Listo", "En ejecución", "Terminado", "Cancelado")
+CODIGOS_ESTADO = {estado: codigo for codigo, estado in enumerate(ESTADOS)}
 
 #Esta clase es como la plantilla para cada proceso que creamos
 #Contiene toda la información relevante de un proceso individual.
+#__slots__ evita el diccionario por instancia, lo que reduce mucho la memoria con millones de procesos
 class Proceso:
-    def __init__(self, pid, nombre=None, memoria_mb=None, duracion_s=None):
+    __slots__ = (
+        "pid", "nombre", "memoria_mb", "duracion_s", "tiempo_restante", "estado",
+        "tiempo_llegada", "tiempo_inicio", "tiempo_fin", "tiempo_duracion_real",
+        "prioridad", "tiempo_espera",
+    )
+
+    # rng: random.Random con semilla para que la memoria y duración aleatorias sean reproducibles
+    def __init__(self, pid, nombre=None, memoria_mb=None, duracion_s=None, prioridad=0, rng=None):
+        rng = rng or _aleatorio
         self.pid = pid #Identificador único del proceso
         #Si no se da un nombre, se genera uno por defecto
         self.nombre = nombre if nombre else f"Proceso-{self.pid}"
         # Si no se especifican, la memoria y duración son aleatorias
-        self.memoria_mb = memoria_mb if memoria_mb else random.randint(50, 250)
-        self.duracion_s = duracion_s if duracion_s else random.randint(5, 20)
+        self.memoria_mb = memoria_mb if memoria_mb else rng.randint(50, 250)
+        self.duracion_s = duracion_s if duracion_s else rng.randint(5, 20)
         # El tiempo restante se irá decrementando en la simulación
         self.tiempo_restante = self.duracion_s
         self.estado = "Listo" # Estado inicial del proceso
+        self.prioridad = prioridad # Menor valor = más importante (política "prioridad")
         # Atributos para calcular estadísticas de tiempo
+        self.tiempo_llegada = None # Cuándo entró a la cola de espera
         self.tiempo_inicio = None
         self.tiempo_fin = None
         self.tiempo_duracion_real = 0 # Para saber cuánto tiempo realmente estuvo en ejecución
+        self.tiempo_espera = None # Tiempo que pasó en la cola antes de ser admitido
 
 #Se encarga de todo lo relacionado con la RAM.
 #Asigna y libera memoria de forma segura, evitando que dos procesos la modifiquen a la vez
+#Si se indica una estrategia ("primer_ajuste", "siguiente_ajuste", "mejor_ajuste", "peor_ajuste"
+#o "buddy") cada proceso ocupa un bloque contiguo y se modela la fragmentación.
+#Si se indica paginacion (diccionario con las opciones de paginacion.MemoriaPaginada) la memoria
+#es virtual: se admiten procesos mientras quepan entre la RAM y el swap, y memoria_disponible
+#pasa a ser la RAM física sin usar
 class GestorMemoria:
-    def __init__(self, ram_total_gb=1):
+    def __init__(self, ram_total_gb=1, estrategia=None, paginacion=None):
+        if estrategia and paginacion:
+            raise ValueError("La memoria paginada no se puede combinar con un asignador contiguo")
         self.ram_total = ram_total_gb * 1024 #Convertimos GB a MB
         self.memoria_disponible = self.ram_total
+        #Asignador de bloques contiguos (None = solo se lleva la cuenta de la memoria libre)
+        self.asignador = crear_asignador(estrategia, self.ram_total) if estrategia else None
+        if self.asignador:
+            self.memoria_disponible = self.asignador.libre
+        #Memoria paginada (None = cada proceso ocupa toda su memoria en RAM mientras se ejecuta)
+        self.paginas = MemoriaPaginada(self.ram_total, **paginacion) if paginacion else None
+        #Tamaño máximo de un proceso que se podría llegar a admitir
+        self.capacidad = self.ram_total
+        if self.paginas:
+            self.capacidad = self.paginas.memoria_virtual_libre()
         #Un 'Lock' es como un semáforo. Solo un hilo puede "tener" el lock a la vez
         #Esto previene condiciones de carrera al modificar la memoria disponible
         self.lock = threading.Lock()
 
+    #Los locks no se pueden serializar (puntos de control): se descartan y se crean de nuevo
+    def __getstate__(self):
+        estado = dict(vars(self))
+        del estado["lock"]
+        return estado
+
+    def __setstate__(self, estado):
+        vars(self).update(estado)
+        self.lock = threading.Lock()
+
     def asignar_memoria(self, proceso):
         # 'with self.lock:' asegura que el bloque de código se ejecute de forma atómica
         # El lock se adquiere al entrar y se libera automáticamente al salir
         with self.lock:
+            if self.paginas:
+                return self.paginas.reservar(proceso.pid, proceso.memoria_mb)
+            if self.asignador:
+                #Con fragmentación puede no haber un hueco contiguo aunque sobre memoria
+                if self.asignador.asignar(proceso.pid, proceso.memoria_mb) is None:
+                    return False
+                self.memoria_disponible = self.asignador.libre
+                return True
             if self.memoria_disponible >= proceso.memoria_mb:
                 self.memoria_disponible -= proceso.memoria_mb
                 return True# Hay memoria suficiente.
@@ -43,82 +120,685 @@ class GestorMemoria:
     # También se usa un lock para liberar memoria de forma segura
     def liberar_memoria(self, proceso):
         with self.lock:
+            if self.paginas:
+                self.paginas.liberar(proceso.pid)
+                self.memoria_disponible = self.paginas.memoria_libre()
+                return
+            if self.asignador:
+                self.asignador.liberar(proceso.pid)
+                self.memoria_disponible = self.asignador.libre
+                return
             self.memoria_disponible += proceso.memoria_mb
 
+    #Libera de una vez la memoria de varios procesos terminados en el mismo tick.
+    #memoria_total ya viene sumada por el tick vectorizado
+    def liberar_memoria_lote(self, procesos, memoria_total):
+        with self.lock:
+            if self.paginas:
+                for proceso in procesos:
+                    self.paginas.liberar(proceso.pid)
+                self.memoria_disponible = self.paginas.memoria_libre()
+                return
+            if self.asignador:
+                for proceso in procesos:
+                    self.asignador.liberar(proceso.pid)
+                self.memoria_disponible = self.asignador.libre
+                return
+            self.memoria_disponible += memoria_total
+
+    #Tamaño del proceso más grande que se podría asignar ahora mismo.
+    #Sin asignador es la memoria libre; con asignador es el bloque libre contiguo más grande
+    def maximo_asignable(self):
+        if self.paginas:
+            return self.paginas.memoria_virtual_libre()
+        if self.asignador:
+            return self.asignador.bloque_libre_mayor()
+        return self.memoria_disponible
+
+    #Simula dt segundos de accesos a memoria de los procesos en ejecución y devuelve
+    #el avance real de cada uno (menor que dt si tuvieron fallos de página)
+    def simular_accesos(self, procesos, dt=1):
+        with self.lock:
+            progreso = self.paginas.simular([proceso.pid for proceso in procesos], dt)
+            self.memoria_disponible = self.paginas.memoria_libre()
+            return progreso
+
+    #Fallos de página, expulsiones y uso del swap (vacías si la memoria no es paginada)
+    def metricas_paginacion(self):
+        with self.lock:
+            return self.paginas.metricas() if self.paginas else {}
+
+    #Métricas de fragmentación (vacías si no hay asignador)
+    def metricas_fragmentacion(self):
+        with self.lock:
+            return self.asignador.metricas() if self.asignador else {}
+
+#Foto inmutable del estado del simulador que se publica una vez por tick.
+#La GUI la lee sin tomar el lock; si la versión no cambió no necesita redibujar nada.
+#Las filas son tuplas (pid, nombre, memoria_mb, duracion_s o tiempo restante); las de terminados
+#llevan además su número de orden en el historial para poder paginar hacia atrás
+Instantanea = namedtuple("Instantanea", [
+    "version", "reloj", "memoria_usada", "memoria_total",
+    "en_ejecucion", "en_cola", "terminados",
+    "filas_ejecucion", "filas_cola", "filas_terminados", "estadisticas",
+])
+
 #Es el cerebro de la operación, la memoria, los procesos,
 #la ejecución en hilos y las estadísticas
 class Simulador:
-    def __init__(self):
-        self.gestor_memoria = GestorMemoria()
-        self.cola_espera = [] # Procesos esperando por RAM
+    # modo "tiempo_real": un tick por segundo (comportamiento original)
+    # modo "eventos": el reloj salta directamente al siguiente evento
+    # velocidad (solo modo eventos): 0 = lo más rápido posible, N = N segundos simulados por segundo real
+    # politica: nombre de la política de admisión (ver politicas.POLITICAS) o una cola ya creada;
+    #   por defecto "primer_ajuste" (admite todo lo que quepa, en orden de llegada)
+    # estrategia_memoria: asignador contiguo de GestorMemoria (None = sin fragmentación)
+    # limite_filas: máximo de filas de cola/ejecución en cada instantánea; recientes: terminados que se muestran
+    # historial_max: terminados que se guardan en memoria; los demás se vuelcan a ruta_historial (SQLite)
+    # paginacion: opciones de la memoria paginada (ver paginacion.MemoriaPaginada); None = sin paginación.
+    #   Con paginación los procesos avanzan por ticks de paso_paginas segundos también en modo eventos
+    # metricas: metricas.RegistroMetricas donde se miden ticks, lock, admisiones, cola y memoria (None = sin medir)
+    # capacidad_series: muestras de memoria, cola, ejecución y rendimiento que se guardan para los gráficos
+    # cluster: opciones de cluster.GestorCluster (nodos, colocacion, desborde_remoto, penalizacion_remota);
+    #   la memoria se reparte en nodos de ram_total_gb cada uno. None = un solo nodo
+    # cpu: opciones de cpu.PlanificadorCPU (nucleos, planificador, quantum...); los procesos en memoria
+    #   solo avanzan mientras ocupan un núcleo. None = todos los procesos en ejecución avanzan a la vez
+    # bitacora: bitacora.Bitacora donde se anotan llegadas, admisiones, fines, cancelaciones y cambios
+    #   de la memoria usada (None = sin bitácora). Quien la crea la cierra
+    # compartido: compartido.PublicadorCompartido donde se copian los contadores y las series en cada
+    #   publicación, para leerlos desde otros procesos (None = no se comparte). Quien lo crea lo cierra
+    # tabla_procesos: los procesos que crea el simulador (crear_proceso) se guardan como filas de una
+    #   tabla_procesos.TablaProcesos de NumPy en lugar de objetos Proceso, para cargas de millones de procesos
+    def __init__(self, modo="tiempo_real", velocidad=0, politica="primer_ajuste", ram_total_gb=1,
+                 estrategia_memoria=None, limite_filas=5000, recientes=200,
+                 historial_max=1000, ruta_historial=None, paginacion=None, paso_paginas=1,
+                 metricas=None, capacidad_series=14400, cluster=None, cpu=None, bitacora=None,
+                 compartido=None, tabla_procesos=False):
+        if cluster and paginacion:
+            raise ValueError("La memoria paginada no se puede combinar con un cluster")
+        if cpu and paginacion:
+            raise ValueError("La memoria paginada no se puede combinar con la planificación de CPU")
+        self.ram_total_gb = ram_total_gb
+        self.estrategia_memoria = estrategia_memoria
+        self.paginacion = paginacion
+        self.paso_paginas = paso_paginas
+        self.cluster = cluster
+        self.gestor_memoria = self._crear_gestor()
+        self.cpu = cpu
+        self.planificador_cpu = PlanificadorCPU(**cpu) if cpu else None
+        # Procesos esperando por RAM, ordenados según la política de admisión
+        self.cola_espera = crear_politica(politica) if isinstance(politica, str) else politica
         self.procesos_en_ejecucion = {} # Diccionario para acceso rápido por PID
-        self.procesos_terminados = [] # Historial de procesos completados
+        #Los mismos procesos en ejecución en arreglos de NumPy para el tick vectorizado
+        self.ejecucion = ConjuntoEjecucion()
+        #Heap de (fin previsto, memoria_mb, pid) de los procesos en ejecución, solo cuando ese fin no cambia
+        #(modo eventos sin paginación ni CPU). Los que salen antes de la cima se descartan al llegar a ella
+        self.fines_previstos = []
+        # Historial de procesos completados: los recientes en memoria y el resto en disco
+        self.procesos_terminados = HistorialTerminados(historial_max, ruta_historial)
+        #Procesos cancelados con el motivo, aparte de los terminados (no cuentan en las estadísticas)
+        self.procesos_cancelados = HistorialCancelados(historial_max)
+        #Índice global pid -> proceso de los que siguen vivos (con llegada programada, en cola o en ejecución).
+        #Su estado y tiempo_llegada dicen dónde está (ver ubicar), así cancelar o buscar un PID es O(1)
+        self.indice_pid = {}
         self.proceso_id_counter = 0 # Para generar PIDs secuenciales
+        self.tabla_procesos = tabla_procesos
+        self.tabla = self._crear_tabla()
         self.ejecutando = False #Flag para controlar el bucle principal del hilo
         self.pausado = False #Flag para pausar/reanudar la simulación
+        self.modo = modo
+        self.velocidad = velocidad
+        self.reloj = 0 #Tiempo simulado en segundos (modo eventos)
+        #Cola de prioridad de eventos: (tiempo, orden, tipo, proceso)
+        self.eventos = []
+        self.contador_eventos = 0 #Desempata eventos con el mismo tiempo respetando el orden de llegada
+        self._tick_programado = False #Ya hay un EVENTO_TICK en la cola (solo con paginación)
+        self._proximo_tick = 0 #Instante de ese EVENTO_TICK
+        self._proximo_cpu = None #Instante del EVENTO_CPU más próximo en la cola (solo con planificación de CPU)
+        self._fuente = None #Iterador de (llegada, proceso) que se consume de a uno
+        self._llegada_fuente_pendiente = False #Hay un EVENTO_LLEGADA_FUENTE en la cola
+        #Elementos leídos de la fuente original; quien arma la fuente suma también los que descarta.
+        #Se guarda en los puntos de control para retomar la fuente donde iba
+        self.posicion_fuente = 0
         self.estadisticas = {
             "procesos_ejecutados": 0,
             "memoria_usada_promedio": 0,
             "tiempo_vida_promedio": 0,
         }
-        # Este lock es para el simulador, para proteger el acceso a las listas de procesos
-        self.lock = threading.Lock()
+        #Acumuladores para que las estadísticas se actualicen en O(1) por proceso terminado
+        self.acumuladores = EstadisticasIncrementales()
+        # Este lock es para el simulador, para proteger el acceso a las listas de procesos.
+        # Con métricas se usa un lock que mide esperas y retenciones
+        self.metricas = metricas
+        self.bitacora = bitacora
+        self.compartido = compartido
+        self.lock = LockMedido(metricas) if metricas else threading.Lock()
+        if metricas:
+            self._crear_metricas()
+        #Instantánea publicada para los lectores; se reemplaza completa (la asignación es atómica)
+        self.limite_filas = limite_filas
+        self.recientes = recientes
+        self._sucio = False #Hay cambios hechos desde fuera del motor que aún no se publicaron
+        #Series de tiempo para los gráficos: se agrega una muestra en cada publicación
+        self.series = SeriesTiempo(capacidad_series)
+        self._origen_series = self.tiempo_actual()
+        self._ultima_muestra = None #(tiempo, terminados) de la muestra anterior, para el rendimiento
+        self._ultima_publicacion = 0
+        self.instantanea = None
+        self._publicar_instantanea()
         # Se define el hilo que correrá la simulación. 'daemon=True' significa que
         # el hilo se cerrará automáticamente cuando el programa principal termine
-        self.hilo_ejecucion = threading.Thread(target=self.ejecutar_simulacion, daemon=True)
+        if modo == "eventos":
+            self.hilo_ejecucion = threading.Thread(
+                target=self.ejecutar_eventos,
+                kwargs={"velocidad": velocidad, "esperar_nuevos": True},
+                daemon=True,
+            )
+        else:
+            self.hilo_ejecucion = threading.Thread(target=self.ejecutar_simulacion, daemon=True)
+
+    #Crea la memoria: un GestorMemoria o, con cluster, un GestorCluster con un GestorMemoria por nodo
+    def _crear_gestor(self):
+        if self.cluster:
+            return GestorCluster(ram_total_gb=self.ram_total_gb, estrategia=self.estrategia_memoria, **self.cluster)
+        return GestorMemoria(self.ram_total_gb, self.estrategia_memoria, self.paginacion)
+
+    #Tabla columnar de procesos, o None si los procesos son objetos Proceso
+    def _crear_tabla(self):
+        if not self.tabla_procesos:
+            return None
+        #Se importa aquí porque tabla_procesos importa este módulo
+        from tabla_procesos import TablaProcesos
+        return TablaProcesos()
+
+    #Registra las métricas del simulador (solo si se pasó un registro)
+    def _crear_metricas(self):
+        m = self.metricas
+        self._m_tick = m.histograma("simulador_tick_segundos", "Duración de cada tick o lote de eventos")
+        self._m_intentos = m.contador("simulador_admision_intentos_total", "Veces que se intentó admitir procesos")
+        self._m_admitidos = m.contador("simulador_admision_admitidos_total", "Procesos admitidos")
+        self._m_cola = m.indicador("simulador_cola_profundidad", "Procesos en la cola de espera")
+        self._m_ejecucion = m.indicador("simulador_en_ejecucion", "Procesos en ejecución")
+        self._m_memoria = m.indicador("simulador_memoria_utilizacion", "Fracción de la RAM en uso")
+        self._m_terminados = m.indicador("simulador_terminados", "Procesos terminados")
+
+    #El hilo que llama es el del motor (para separar sus esperas del lock de las de la GUI)
+    def _marcar_hilo_motor(self):
+        if self.metricas:
+            self.lock.hilo_motor = threading.get_ident()
+
+    #Devuelve el instante actual: reloj simulado en modo eventos u hora real en modo tiempo real
+    def tiempo_actual(self):
+        if self.modo == "eventos":
+            return self.reloj
+        return time.time()
+
+    #Mete un evento en la cola de prioridad (se debe llamar con el lock tomado)
+    def _programar_evento(self, tiempo, tipo, proceso):
+        self.contador_eventos += 1
+        heapq.heappush(self.eventos, (tiempo, self.contador_eventos, tipo, proceso))
+
+    #Instante actual del reloj de la CPU: el reloj simulado en modo eventos o, en tiempo real,
+    #los segundos de tick que lleva contabilizados el planificador
+    def _ahora_cpu(self):
+        if self.modo == "eventos":
+            return self.reloj
+        return self.planificador_cpu.reloj
+
+    #Agenda un EVENTO_CPU para el fin de la próxima rebanada si es antes que el ya agendado.
+    #Los que quedan más tarde se procesan igual y no hacen nada (se llama con el lock tomado)
+    def _programar_cpu(self):
+        if self.modo != "eventos":
+            return
+        proximo = self.planificador_cpu.proximo()
+        if proximo is not None and (self._proximo_cpu is None or proximo < self._proximo_cpu):
+            self._proximo_cpu = proximo
+            self._programar_evento(proximo, EVENTO_CPU, None)
+
+    #Con memoria paginada el fin de cada proceso depende de sus fallos de página, así que
+    #en lugar de un evento de fin por proceso hay un único evento de tick periódico
+    def _programar_tick(self):
+        if not self._tick_programado:
+            self._tick_programado = True
+            self._proximo_tick = self.reloj + self.paso_paginas
+            self._programar_evento(self._proximo_tick, EVENTO_TICK, None)
+
+    #Programa la llegada de un proceso en un instante del reloj simulado
+    def programar_llegada(self, proceso, tiempo):
+        with self.lock:
+            self.indice_pid[proceso.pid] = proceso
+            self._programar_evento(max(tiempo, self.reloj), EVENTO_LLEGADA, proceso)
+
+    #Conecta una fuente de llegadas: un iterable de (llegada, proceso) ordenado por llegada.
+    #En la cola de eventos solo hay una llegada de la fuente a la vez; la siguiente se pide
+    #cuando esa ocurre, así una traza de millones de procesos no se carga entera
+    def conectar_fuente(self, fuente):
+        with self.lock:
+            self._fuente = iter(fuente)
+            #Al retomar un punto de control puede haber ya una llegada de la fuente en la cola
+            if not self._llegada_fuente_pendiente:
+                self._siguiente_de_fuente()
+
+    #Agenda la próxima llegada de la fuente (se llama con el lock tomado)
+    def _siguiente_de_fuente(self):
+        siguiente = next(self._fuente, None)
+        if siguiente is None:
+            self._fuente = None
+            return
+        self.posicion_fuente += 1
+        self._llegada_fuente_pendiente = True
+        tiempo, proceso = siguiente
+        self.indice_pid[proceso.pid] = proceso
+        #La fuente viene ordenada (leer_traza lo verifica); el max solo cubre el caso de tiempo real,
+        #donde el reloj avanza de a ticks y puede haber pasado ya la llegada siguiente
+        self._programar_evento(max(tiempo, self.reloj), EVENTO_LLEGADA_FUENTE, proceso)
 
     # Añade un nuevo proceso a la cola de espera de forma segura
     def agregar_proceso(self, proceso):
         with self.lock:
-            self.cola_espera.append(proceso)
+            self._encolar(proceso)
             self.intentar_ejecutar_procesos()
+            self._sucio = True
+
+    #Crea y encola varios procesos con un solo lock y un solo intento de admisión.
+    #datos: diccionarios con nombre, memoria_mb, duracion_s y opcionalmente prioridad
+    #(lo que falte se completa como en Proceso). Devuelve los PIDs asignados
+    def agregar_procesos(self, datos):
+        with self.lock:
+            pids = []
+            for d in datos:
+                proceso = self.crear_proceso(d.get("nombre"), d.get("memoria_mb"), d.get("duracion_s"), d.get("prioridad", 0))
+                self._encolar(proceso)
+                pids.append(proceso.pid)
+            self.intentar_ejecutar_procesos()
+            self._sucio = True
+            return pids
+
+    #Crea un proceso con el siguiente PID, sin encolarlo (se llama con el lock tomado: es el único
+    #lugar donde se asignan PIDs). Con tabla_procesos devuelve una VistaProceso de una fila nueva
+    def crear_proceso(self, nombre=None, memoria_mb=None, duracion_s=None, prioridad=0):
+        self.proceso_id_counter += 1
+        if self.tabla is None:
+            return Proceso(f"P{self.proceso_id_counter}", nombre, memoria_mb, duracion_s, prioridad)
+        #Mismos valores por defecto que Proceso
+        return self.tabla.agregar(
+            self.proceso_id_counter, memoria_mb or _aleatorio.randint(50, 250),
+            duracion_s or _aleatorio.randint(5, 20), nombre, prioridad,
+        )
+
+    #Pone un proceso que acaba de llegar en la cola de espera y en el índice (se llama con el lock tomado)
+    def _encolar(self, proceso):
+        proceso.tiempo_llegada = self.tiempo_actual()
+        self.cola_espera.append(proceso)
+        self.indice_pid[proceso.pid] = proceso
+        if self.bitacora:
+            self.bitacora.lote.append((proceso.tiempo_llegada, LLEGADA, proceso.pid, proceso.memoria_mb))
 
     #Revisa la cola de espera y mueve procesos a ejecución si hay RAM disponible
     #Es como promover el proceso si lo quieren ver asi
+    #La política de la cola decide qué procesos pasan a ejecución
     def intentar_ejecutar_procesos(self):
-        procesos_a_ejecutar = []
+        admitidos = self.cola_espera.admitir(self.gestor_memoria, self._iniciar_proceso, self)
+        if self.metricas:
+            self._m_intentos.inc()
+            self._m_admitidos.inc(len(admitidos))
+        #Se llama después de cada tick o lote de eventos, así que acá se ve todo cambio de memoria
+        if self.bitacora:
+            self._anotar_memoria()
+        return admitidos
+
+    #Anota en la bitácora la memoria usada si cambió (se llama con el lock tomado)
+    def _anotar_memoria(self):
+        gestor = self.gestor_memoria
+        self.bitacora.anotar_memoria(self.tiempo_actual(), gestor.ram_total - gestor.memoria_disponible)
+
+    #Instantes previstos de fin de los procesos en ejecución y la memoria que liberarán,
+    #como lista de (tiempo_fin, memoria_mb). Lo usan políticas como backfilling.
+    #Con planificación de CPU son una cota inferior: se supone que ninguno espera núcleo
+    def finalizaciones_previstas(self):
+        if self.planificador_cpu:
+            ahora, ahora_cpu = self.tiempo_actual(), self._ahora_cpu()
+            restante_de = self.planificador_cpu.restante_de
+            return [(ahora + restante_de(p, ahora_cpu), p.memoria_mb) for p in self.procesos_en_ejecucion.values()]
+        if self.modo == "eventos" and not self.paginacion:
+            #En modo eventos tiempo_restante se fija al admitir el proceso
+            return [(p.tiempo_inicio + p.tiempo_restante, p.memoria_mb) for p in self.procesos_en_ejecucion.values()]
+        ahora = self.tiempo_actual()
+        n = self.ejecucion.cantidad
+        return list(zip((self.ejecucion.restante[:n] + ahora).tolist(), self.ejecucion.memoria[:n].tolist()))
+
+    #Los fines de los procesos en ejecución no cambian con el tiempo (se mantienen en fines_previstos)
+    def _fines_fijos(self):
+        return self.modo == "eventos" and not self.paginacion and not self.planificador_cpu
+
+    #Rehace fines_previstos con los procesos en ejecución (al restaurar un punto de control)
+    def indexar_fines(self):
+        self.fines_previstos = []
+        if self._fines_fijos():
+            self.fines_previstos = [(p.tiempo_inicio + p.tiempo_restante, p.memoria_mb, p.pid)
+                                    for p in self.procesos_en_ejecucion.values()]
+            heapq.heapify(self.fines_previstos)
+
+    #Descarta las entradas de procesos que ya salieron de ejecución: las de la cima, y todas
+    #cuando ya son más que las vigentes (las cancelaciones no hacen crecer el heap sin límite)
+    def _limpiar_fines(self):
+        fines = self.fines_previstos
+        en_ejecucion = self.procesos_en_ejecucion
+        while fines and fines[0][2] not in en_ejecucion:
+            heapq.heappop(fines)
+        if len(fines) > 2 * len(en_ejecucion) + 64:
+            self.fines_previstos = [entrada for entrada in fines if entrada[2] in en_ejecucion]
+            heapq.heapify(self.fines_previstos)
+
+    #Las mismas finalizaciones que finalizaciones_previstas pero ordenadas por tiempo y de a una, así
+    #quien corta el recorrido temprano (backfilling) no ordena todo. Con fines fijos se baja por el árbol
+    #del heap tomando siempre el menor nodo alcanzado: los primeros k cuestan O(k log k)
+    def finalizaciones_en_orden(self):
+        if not self._fines_fijos():
+            yield from sorted(self.finalizaciones_previstas())
+            return
+        self._limpiar_fines()
+        fines = self.fines_previstos
+        en_ejecucion = self.procesos_en_ejecucion
+        n = len(fines)
+        frontera = [(fines[0], 0)] if fines else [] #(entrada, posición en el heap)
+        while frontera:
+            entrada, i = heapq.heappop(frontera)
+            if entrada[2] in en_ejecucion:
+                yield entrada[0], entrada[1]
+            hijo = 2 * i + 1
+            if hijo < n:
+                heapq.heappush(frontera, (fines[hijo], hijo))
+                hijo += 1
+                if hijo < n:
+                    heapq.heappush(frontera, (fines[hijo], hijo))
+
+    #Pasa un proceso de la cola a ejecución (se llama con el lock tomado)
+    def _iniciar_proceso(self, proceso):
+        proceso.estado = "En ejecución"
+        proceso.tiempo_inicio = self.tiempo_actual()
+        if proceso.tiempo_llegada is not None:
+            proceso.tiempo_espera = proceso.tiempo_inicio - proceso.tiempo_llegada
+        self.procesos_en_ejecucion[proceso.pid] = proceso
+        self.indice_pid[proceso.pid] = proceso
+        if self.bitacora:
+            self.bitacora.lote.append((proceso.tiempo_inicio, ADMISION, proceso.pid, proceso.memoria_mb))
+        if self.planificador_cpu:
+            #Con núcleos limitados el proceso espera en la cola de listos hasta que le toque CPU
+            self.planificador_cpu.agregar(proceso, self._ahora_cpu())
+            self._programar_cpu()
+            return
+        #En modo eventos se agenda directamente el instante en que terminará
+        if self.modo == "eventos" and self.paginacion:
+            #El primer tick le toca completo aunque entre a mitad, así que se compensa la parte que no corrió
+            self._programar_tick()
+            self.ejecucion.agregar(proceso, self.paso_paginas - (self._proximo_tick - self.reloj))
+            return
+        self.ejecucion.agregar(proceso)
+        if self.modo == "eventos":
+            self._programar_evento(self.reloj + proceso.tiempo_restante, EVENTO_FIN, proceso)
+            heapq.heappush(self.fines_previstos, (self.reloj + proceso.tiempo_restante, proceso.memoria_mb, proceso.pid))
+
+    #Saca un proceso de ejecución (del diccionario y de los arreglos) y lo devuelve
+    def _sacar_de_ejecucion(self, pid):
+        if self.planificador_cpu:
+            #Si ocupaba un núcleo, el núcleo pasa al siguiente de la cola de listos
+            self.planificador_cpu.quitar(pid, self._ahora_cpu())
+            self._programar_cpu()
+        self.ejecucion.quitar(pid)
+        return self.procesos_en_ejecucion.pop(pid)
+
+    #Marca un proceso como terminado y lo pasa al historial (se llama con el lock tomado).
+    #liberar=False cuando la memoria ya se liberó en lote; tiempo_fin se da cuando terminó antes del instante actual
+    def _terminar_proceso(self, proceso, liberar=True, tiempo_fin=None):
+        proceso.estado = "Terminado"
+        proceso.tiempo_fin = self.tiempo_actual() if tiempo_fin is None else tiempo_fin
+        if proceso.tiempo_inicio is not None:
+            proceso.tiempo_duracion_real = proceso.tiempo_fin - proceso.tiempo_inicio
+        if liberar:
+            self.gestor_memoria.liberar_memoria(proceso)
+        self.procesos_en_ejecucion.pop(proceso.pid)
+        if self.fines_previstos:
+            self._limpiar_fines()
+        self.indice_pid.pop(proceso.pid, None)
+        self.procesos_terminados.append(proceso)
+        self.actualizar_estadisticas(proceso)
+        if self.bitacora:
+            self.bitacora.lote.append((proceso.tiempo_fin, FIN, proceso.pid, proceso.memoria_mb))
+
+    #Avanza un tick para todos los procesos en ejecución de forma vectorizada
+    #y libera la memoria de los que terminaron en una sola operación.
+    #Con memoria paginada cada proceso avanza menos según los fallos de página que tuvo.
+    #Con planificación de CPU solo avanzan los que ocupan un núcleo durante el tick
+    def _tick(self, dt=1):
+        if self.planificador_cpu:
+            terminados = self.planificador_cpu.avanzar(self.planificador_cpu.reloj + dt)
+            for proceso, _ in terminados:
+                self._terminar_proceso(proceso)
+            return [proceso for proceso, _ in terminados]
+        progreso = None
+        if self.paginacion and self.ejecucion.cantidad:
+            procesos = self.ejecucion.procesos[:self.ejecucion.cantidad]
+            progreso = self.gestor_memoria.simular_accesos(procesos, dt)
+        terminados, memoria_liberada = self.ejecucion.avanzar(dt, progreso)
+        if terminados:
+            self.gestor_memoria.liberar_memoria_lote(terminados, memoria_liberada)
+            if progreso is not None and self.modo == "eventos":
+                #Cada proceso terminó a mitad del tick: lo que le sobró (restante negativo)
+                #se pasa a tiempo de reloj con su ritmo de avance en este tick
+                ritmo = {p.pid: avance / dt for p, avance in zip(procesos, progreso)}
+                for proceso in terminados:
+                    fin = self.reloj + proceso.tiempo_restante / ritmo[proceso.pid]
+                    proceso.tiempo_restante = 0
+                    self._terminar_proceso(proceso, liberar=False, tiempo_fin=fin)
+            else:
+                for proceso in terminados:
+                    self._terminar_proceso(proceso, liberar=False)
+        return terminados
+
+    #Copia a los objetos Proceso el tiempo restante que lleva el tick vectorizado
+    #(se llama con el lock tomado, por ejemplo antes de mostrar la tabla de ejecución)
+    def sincronizar_restantes(self):
+        self.ejecucion.sincronizar()
+
+    #Tiempo que le falta a un proceso en ejecución (se llama con el lock tomado)
+    def _restante_actual(self, proceso):
+        if self.planificador_cpu:
+            return self.planificador_cpu.restante_de(proceso, self._ahora_cpu())
+        if self.modo == "eventos" and not self.paginacion:
+            return max(0, proceso.tiempo_inicio + proceso.tiempo_restante - self.reloj)
+        return self.ejecucion.restante_de(proceso.pid)
+
+    #Arma y publica una nueva instantánea (se llama con el lock tomado).
+    #Los lectores siempre ven una instantánea completa: la anterior o la nueva
+    def _publicar_instantanea(self):
+        limite = self.limite_filas
+        filas_ejecucion = []
+        for proceso in self.procesos_en_ejecucion.values():
+            if len(filas_ejecucion) == limite:
+                break
+            filas_ejecucion.append((proceso.pid, proceso.nombre, proceso.memoria_mb, self._restante_actual(proceso)))
+        filas_cola = []
         for proceso in self.cola_espera:
-            if self.gestor_memoria.asignar_memoria(proceso):
-                proceso.estado = "En ejecución"
-                proceso.tiempo_inicio = time.time()
-                self.procesos_en_ejecucion[proceso.pid] = proceso
-                procesos_a_ejecutar.append(proceso)
-        
-        #Se sacan de la cola los procesos que ya se movieron a ejecución
-        for proceso in procesos_a_ejecutar:
-            self.cola_espera.remove(proceso)
+            if len(filas_cola) == limite:
+                break
+            filas_cola.append((proceso.pid, proceso.nombre, proceso.memoria_mb, proceso.duracion_s))
+        #Los terminados más recientes primero
+        filas_terminados = tuple(
+            (p.pid, p.nombre, p.memoria_mb, p.duracion_s, orden)
+            for orden, p in self.procesos_terminados.ultimos(self.recientes)
+        )
+        total = self.gestor_memoria.ram_total
+        version = self.instantanea.version + 1 if self.instantanea else 1
+        self.instantanea = Instantanea(
+            version=version,
+            reloj=self.reloj,
+            memoria_usada=total - self.gestor_memoria.memoria_disponible,
+            memoria_total=total,
+            en_ejecucion=len(self.procesos_en_ejecucion),
+            en_cola=len(self.cola_espera),
+            terminados=len(self.procesos_terminados),
+            filas_ejecucion=tuple(filas_ejecucion),
+            filas_cola=tuple(filas_cola),
+            filas_terminados=filas_terminados,
+            estadisticas=MappingProxyType(self.obtener_estadisticas()),
+        )
+        self._sucio = False
+        self._ultima_publicacion = time.monotonic()
+        self._muestrear()
+        if self.compartido:
+            self.compartido.publicar(self.instantanea, self.series)
+        if self.bitacora:
+            self.bitacora.pulso()
+        if self.metricas:
+            self._m_cola.fijar(self.instantanea.en_cola)
+            self._m_ejecucion.fijar(self.instantanea.en_ejecucion)
+            self._m_memoria.fijar(self.instantanea.memoria_usada / total if total else 0)
+            self._m_terminados.fijar(self.instantanea.terminados)
+
+    #Agrega a las series una muestra de la instantánea recién publicada (se llama con el lock tomado).
+    #El rendimiento es la cantidad de procesos terminados por segundo desde la muestra anterior
+    def _muestrear(self):
+        actual = self.instantanea
+        tiempo = self.tiempo_actual() - self._origen_series
+        rendimiento = 0.0
+        if self._ultima_muestra is not None:
+            tiempo_anterior, terminados_anterior = self._ultima_muestra
+            if tiempo <= tiempo_anterior:
+                return #Varias publicaciones en el mismo instante: basta con una muestra
+            rendimiento = (actual.terminados - terminados_anterior) / (tiempo - tiempo_anterior)
+        self._ultima_muestra = (tiempo, actual.terminados)
+        self.series.agregar(tiempo, (actual.memoria_usada, actual.en_cola, actual.en_ejecucion, rendimiento))
+
+    #Devuelve la última instantánea sin bloquear al motor.
+    #Solo toma el lock si hubo cambios desde fuera (crear o cancelar procesos) sin publicar
+    def obtener_instantanea(self):
+        if self._sucio:
+            with self.lock:
+                if self._sucio:
+                    self._publicar_instantanea()
+        return self.instantanea
 
     # Este es el bucle principal que corre en el hilo secundario
     def ejecutar_simulacion(self):
         self.ejecutando = True
+        self._marcar_hilo_motor()
         while self.ejecutando:
             if not self.pausado:
                 with self.lock:
-                    procesos_terminados_pids = []
-                    #Se itera sobre una copia de los items para poder modificar el diccionario
-                    for pid, proceso in list(self.procesos_en_ejecucion.items()):
-                        proceso.tiempo_restante -= 1
-                        if proceso.tiempo_restante <= 0:
-                            # El proceso ha terminado su ejecución
-                            proceso.estado = "Terminado"
-                            proceso.tiempo_fin = time.time()
-                            if proceso.tiempo_inicio:
-                                proceso.tiempo_duracion_real = proceso.tiempo_fin - proceso.tiempo_inicio
-                            self.gestor_memoria.liberar_memoria(proceso)
-                            procesos_terminados_pids.append(pid)
-                    
-                    #Se mueven los procesos terminados a su lista correspondiente
-                    for pid in procesos_terminados_pids:
-                        proceso_terminado = self.procesos_en_ejecucion.pop(pid)
-                        self.procesos_terminados.append(proceso_terminado)
-                        self.actualizar_estadisticas()
+                    inicio = time.perf_counter() if self.metricas else 0
+                    #Se resta 1 segundo a todos los procesos y se mueven los terminados al historial
+                    self._tick()
 
                     #Después de liberar memoria, se intenta ejecutar nuevos procesos
                     self.intentar_ejecutar_procesos()
+                    self._publicar_instantanea()
+                    if self.metricas:
+                        self._m_tick.observar(time.perf_counter() - inicio)
             
             #Pausa de 1 segundo para simular el paso del tiempo
             time.sleep(1)
 
+    #Motor de eventos discretos: en lugar de dormir 1 segundo y recorrer todos los procesos,
+    #el reloj salta al siguiente evento (llegada o fin de un proceso) de la cola de prioridad.
+    #velocidad=0 corre lo más rápido posible; velocidad=N avanza N segundos simulados por segundo real.
+    #hasta limita el tiempo simulado y esperar_nuevos mantiene el bucle vivo cuando no quedan eventos
+    def ejecutar_eventos(self, velocidad=0, hasta=None, esperar_nuevos=False):
+        with self.lock:
+            if self.modo != "eventos":
+                #Los procesos admitidos en modo tiempo real necesitan su evento de fin
+                self.modo = "eventos"
+                self.ejecucion.sincronizar()
+                if self.planificador_cpu:
+                    #Con planificación de CPU las rebanadas en curso pasan del reloj de ticks al reloj simulado
+                    self.planificador_cpu.desplazar(self.reloj - self.planificador_cpu.reloj)
+                    self._programar_cpu()
+                else:
+                    for proceso in self.procesos_en_ejecucion.values():
+                        if self.paginacion:
+                            self._programar_tick()
+                        else:
+                            self._programar_evento(self.reloj + proceso.tiempo_restante, EVENTO_FIN, proceso)
+        self.ejecutando = True
+        self._marcar_hilo_motor()
+        while self.ejecutando:
+            if self.pausado:
+                time.sleep(0.05)
+                continue
+
+            with self.lock:
+                siguiente = self.eventos[0][0] if self.eventos else None
+
+            if siguiente is None or (hasta is not None and siguiente > hasta):
+                if not esperar_nuevos:
+                    break
+                #Sin eventos pendientes: se espera a que lleguen procesos nuevos
+                time.sleep(0.05)
+                if velocidad:
+                    with self.lock:
+                        self.reloj += 0.05 * velocidad
+                continue
+
+            #En tiempo real escalado se duerme en pasos cortos para atender pausas y llegadas nuevas
+            if velocidad:
+                espera = (siguiente - self.reloj) / velocidad
+                if espera > 0:
+                    paso = min(espera, 0.05)
+                    time.sleep(paso)
+                    with self.lock:
+                        self.reloj = min(siguiente, self.reloj + paso * velocidad)
+                    continue
+
+            with self.lock:
+                inicio = time.perf_counter() if self.metricas else 0
+                self._procesar_eventos()
+                #Corriendo lo más rápido posible se publica como mucho 10 veces por segundo
+                if velocidad or time.monotonic() - self._ultima_publicacion >= 0.1:
+                    self._publicar_instantanea()
+                else:
+                    #Si después no hay más eventos, la publica quien la lea (ver obtener_instantanea)
+                    self._sucio = True
+                if self.metricas:
+                    self._m_tick.observar(time.perf_counter() - inicio)
+
+        with self.lock:
+            if hasta is not None and self.reloj < hasta and not self.eventos:
+                self.reloj = hasta
+            self._publicar_instantanea()
+        self.ejecutando = False
+
+    #Procesa todos los eventos que ocurren en el siguiente instante (se llama con el lock tomado)
+    def _procesar_eventos(self):
+        tiempo = self.eventos[0][0]
+        self.reloj = max(self.reloj, tiempo)
+        while self.eventos and self.eventos[0][0] == tiempo:
+            _, _, tipo, proceso = heapq.heappop(self.eventos)
+            if tipo == EVENTO_LLEGADA or tipo == EVENTO_LLEGADA_FUENTE:
+                #La llegada de un proceso cancelado antes de llegar se descarta
+                if proceso.estado != "Cancelado":
+                    self._encolar(proceso)
+                if tipo == EVENTO_LLEGADA_FUENTE:
+                    self._llegada_fuente_pendiente = False
+                    if self._fuente is not None:
+                        self._siguiente_de_fuente()
+            elif tipo == EVENTO_TICK:
+                self._tick_programado = False
+                self._tick(self.paso_paginas)
+                if self.ejecucion.cantidad:
+                    self._programar_tick()
+            elif tipo == EVENTO_CPU:
+                if self._proximo_cpu is not None and self._proximo_cpu <= tiempo:
+                    self._proximo_cpu = None
+                for terminado, fin in self.planificador_cpu.avanzar(tiempo):
+                    self._terminar_proceso(terminado, tiempo_fin=fin)
+                self._programar_cpu()
+            elif proceso.estado == "En ejecución" and self.procesos_en_ejecucion.get(proceso.pid) == proceso:
+                #Si el proceso fue cancelado su evento de fin simplemente se descarta
+                self.ejecucion.quitar(proceso.pid)
+                proceso.tiempo_restante = 0
+                self._terminar_proceso(proceso)
+        #Después de las llegadas y liberaciones se intenta ejecutar nuevos procesos
+        self.intentar_ejecutar_procesos()
+
     #Inicia el hilo de simulación si no está ya corriendo
     def iniciar_simulacion(self):
         if not self.hilo_ejecucion.is_alive():
@@ -134,65 +814,163 @@ class Simulador:
         
     #Restablece el simulador a su estado inicial
     def reiniciar_simulacion(self):
-        self.gestor_memoria = GestorMemoria()
-        self.cola_espera.clear()
-        self.procesos_en_ejecucion.clear()
-        self.procesos_terminados.clear()
-        self.proceso_id_counter = 0
-        self.estadisticas = {
-            "procesos_ejecutados": 0,
-            "memoria_usada_promedio": 0,
-            "tiempo_vida_promedio": 0,
-        }
+        with self.lock:
+            self.gestor_memoria = self._crear_gestor()
+            self.cola_espera.clear()
+            self.procesos_en_ejecucion.clear()
+            self.ejecucion.clear()
+            self.fines_previstos.clear()
+            self.procesos_terminados.clear()
+            self.procesos_cancelados.clear()
+            self.indice_pid.clear()
+            self.proceso_id_counter = 0
+            self.tabla = self._crear_tabla()
+            self.reloj = 0
+            self.eventos.clear()
+            self._fuente = None
+            self._llegada_fuente_pendiente = False
+            self.posicion_fuente = 0
+            self._tick_programado = False
+            self.planificador_cpu = PlanificadorCPU(**self.cpu) if self.cpu else None
+            self._proximo_cpu = None
+            self.estadisticas = {
+                "procesos_ejecutados": 0,
+                "memoria_usada_promedio": 0,
+                "tiempo_vida_promedio": 0,
+            }
+            self.acumuladores = EstadisticasIncrementales()
+            self.series.clear()
+            self._origen_series = self.tiempo_actual()
+            self._ultima_muestra = None
+            #Los lectores ven el estado reiniciado apenas se suelta el lock
+            self._publicar_instantanea()
     
-    # Lógica para cancelar un proceso, ya sea en cola o en ejecución.
-    # Los procesos cancelados no cuentan para las estadísticas
-    def cancelar_proceso(self, pid):
-        with self.lock:
-            # Primero busca en la cola de espera
-            for i, p in enumerate(self.cola_espera):
-                if p.pid == pid:
-                    self.cola_espera.pop(i)
-                    return
-
-            #Si no está en la cola, busca en los procesos en ejecución
-            if pid in self.procesos_en_ejecucion:
-                #Guardamos en la variable el proceso a elimnar
-                proceso_cancelado = self.procesos_en_ejecucion.pop(pid)
+    #Dónde está un proceso: ("programado", proceso) si su llegada aún no ocurrió, ("cola", proceso),
+    #("ejecucion", proceso), ("terminado", proceso o registro), ("cancelado", registro) o (None, None).
+    #Los vivos y los cancelados se buscan en O(1); los terminados en el historial (índice por PID en disco)
+    def ubicar(self, pid):
+        with self.lock:
+            proceso = self.indice_pid.get(pid)
+            if proceso is not None:
+                return self._ubicacion(proceso), proceso
+            registro = self.procesos_cancelados.buscar_pid(pid)
+            if registro is not None:
+                return "cancelado", registro
+            terminado = self.procesos_terminados.buscar_pid(pid)
+            if terminado is not None:
+                return "terminado", terminado
+            return None, None
+
+    #Ubicación de un proceso vivo según su estado (se llama con el lock tomado)
+    def _ubicacion(self, proceso):
+        if proceso.estado == "En ejecución":
+            return "ejecucion"
+        return "programado" if proceso.tiempo_llegada is None else "cola"
+
+    #Cancela un proceso (se llama con el lock tomado). La memoria de los que estaban en ejecución
+    #la libera quien llama, así un lote la libera de una vez
+    def _cancelar(self, proceso, ubicacion, motivo, ahora):
+        del self.indice_pid[proceso.pid]
+        if ubicacion == "ejecucion":
+            self._sacar_de_ejecucion(proceso.pid)
+        proceso.estado = "Cancelado"
+        self.procesos_cancelados.append(proceso, ubicacion, motivo, ahora)
+        if self.bitacora:
+            self.bitacora.lote.append((ahora, CANCELACION, proceso.pid, proceso.memoria_mb))
+
+    # Lógica para cancelar un proceso, ya sea programado, en cola o en ejecución.
+    # Los procesos cancelados no cuentan para las estadísticas; van a procesos_cancelados con su motivo.
+    # Devuelve True si el proceso estaba vivo y se canceló
+    def cancelar_proceso(self, pid, motivo="usuario"):
+        with self.lock:
+            proceso = self.indice_pid.get(pid)
+            if proceso is None:
+                return False
+            ubicacion = self._ubicacion(proceso)
+            if ubicacion == "cola":
+                self.cola_espera.quitar(pid)
+            #Si estaba programado su evento de llegada se descarta al ocurrir
+            self._cancelar(proceso, ubicacion, motivo, self.tiempo_actual())
+            if ubicacion == "ejecucion":
                 #Liberamos el espacio en memoria
-                self.gestor_memoria.liberar_memoria(proceso_cancelado)
-                return
+                self.gestor_memoria.liberar_memoria(proceso)
+                if self.bitacora:
+                    self._anotar_memoria()
+            self._sucio = True
+            return True
 
-    # Método para que la GUI pueda obtener las estadísticas
+    #Cancela de una vez todos los procesos vivos que cumplan los criterios:
+    # pids: solo estos PIDs (los que ya no están vivos se ignoran)
+    # patron: patrón de nombre estilo shell ("backup-*", "Proceso-1?")
+    # memoria_minima: solo los que piden al menos esa memoria en MB
+    # ubicaciones: de dónde sacarlos (por defecto de "programado", "cola" y "ejecucion")
+    #Devuelve la cantidad de procesos cancelados
+    def cancelar_procesos(self, patron=None, memoria_minima=None, ubicaciones=None, motivo="lote", pids=None):
+        if pids is None and patron is None and memoria_minima is None and ubicaciones is None:
+            raise ValueError("Hay que indicar al menos un criterio (pids, patron, memoria_minima o ubicaciones)")
+        coincide = re.compile(fnmatch.translate(patron)).match if patron is not None else None
+        with self.lock:
+            if pids is None:
+                candidatos = self.indice_pid.values()
+            else:
+                #set: un PID repetido no se cancela dos veces
+                candidatos = [self.indice_pid[pid] for pid in set(pids) if pid in self.indice_pid]
+            elegidos = [
+                proceso for proceso in candidatos
+                if (coincide is None or coincide(proceso.nombre))
+                and (memoria_minima is None or proceso.memoria_mb >= memoria_minima)
+            ]
+            ahora = self.tiempo_actual()
+            en_cola = []
+            liberados = []
+            cancelados = 0
+            for proceso in elegidos:
+                ubicacion = self._ubicacion(proceso)
+                if ubicaciones is not None and ubicacion not in ubicaciones:
+                    continue
+                cancelados += 1
+                if ubicacion == "cola":
+                    en_cola.append(proceso.pid)
+                elif ubicacion == "ejecucion":
+                    liberados.append(proceso)
+                self._cancelar(proceso, ubicacion, motivo, ahora)
+            self.cola_espera.quitar_lote(en_cola)
+            if liberados:
+                self.gestor_memoria.liberar_memoria_lote(liberados, sum(p.memoria_mb for p in liberados))
+                if self.bitacora:
+                    self._anotar_memoria()
+            self._sucio = True
+            return cancelados
+
+    # Método para que la GUI pueda obtener las estadísticas.
+    # Además de los promedios incluye desviación, mínimo, máximo y percentiles (p50/p95/p99)
+    # de espera y retorno; su costo no depende de cuántos procesos hayan terminado
+    # Con memoria paginada se agregan los fallos de página y el uso del swap
+    # Con cluster se agrega un resumen del uso de los nodos (el detalle está en gestor_memoria.metricas_nodos)
+    # Con planificación de CPU se agregan la utilización de los núcleos y los cambios de contexto
     def obtener_estadisticas(self):
-        return self.estadisticas
+        estadisticas = {**self.estadisticas, **self.acumuladores.resumen()}
+        estadisticas["procesos_cancelados"] = self.procesos_cancelados.total
+        if self.paginacion:
+            estadisticas["paginacion"] = self.gestor_memoria.metricas_paginacion()
+        if self.cluster:
+            estadisticas["cluster"] = self.gestor_memoria.metricas()
+        if self.planificador_cpu:
+            estadisticas["cpu"] = self.planificador_cpu.metricas(self._ahora_cpu())
+        return estadisticas
 
     #Método para que la GUI pueda obtener el uso de memoria actual
     def obtener_uso_memoria(self):
-        total = self.gestor_memoria.ram_total
-        usada = total - self.gestor_memoria.memoria_disponible
+        gestor = self.gestor_memoria
+        with gestor.lock:
+            total = gestor.ram_total
+            usada = total - gestor.memoria_disponible
         return usada, total
 
-    #Recalcula las estadísticas basadas en los procesos que han terminado
-    def actualizar_estadisticas(self):
-        #Cuenta cuantos procesos terminaron 
-        num_terminados = len(self.procesos_terminados)
-        #Actualizamos la estadística del total de procesos ejecutados
-        self.estadisticas["procesos_ejecutados"] = num_terminados
-        
-        #Si hay procesos terminados
-        if num_terminados > 0:
-            #Sumamos la memoria de todos los procesos terminados
-            memoria_total = sum(p.memoria_mb for p in self.procesos_terminados)
-            #Lo dividimos entre el numero total de procesos terminados y obtenemos el promedio
-            self.estadisticas["memoria_usada_promedio"] = memoria_total / num_terminados
-            
-            #Creamos una lista con todos los tiempos de duración de todos los procesos terminados
-            tiempos_vida = [p.tiempo_duracion_real for p in self.procesos_terminados if p.tiempo_duracion_real is not None]
-            #Si la lista no es vacia
-            if tiempos_vida:
-                #Suma todos los tiempos y los divide entre por la cantidad de procesos terminados
-                self.estadisticas["tiempo_vida_promedio"] = sum(tiempos_vida) / len(tiempos_vida)
-        else:
-            self.estadisticas["memoria_usada_promedio"] = 0
-            self.estadisticas["tiempo_vida_promedio"] = 0
\ No newline at end of file
+    #Actualiza las estadísticas con un proceso recién terminado en tiempo constante,
+    #sin volver a recorrer todos los procesos terminados
+    def actualizar_estadisticas(self, proceso):
+        self.acumuladores.agregar(proceso)
+        self.estadisticas["procesos_ejecutados"] = self.acumuladores.memoria.cuenta
+        self.estadisticas["memoria_usada_promedio"] = self.acumuladores.memoria.media
+        self.estadisticas["tiempo_vida_promedio"] = self.acumuladores.vida.media
@@ -0,0 +1,359 @@
+#Planificación de CPU entre los procesos que ya tienen su memoria asignada.
+#Sin esto todos los procesos en ejecución avanzan a la vez; con un PlanificadorCPU solo avanzan
+#los que ocupan uno de los 'nucleos', por rebanadas de tiempo, y el resto espera en una cola de listos.
+#Las colas de listos son heaps con borrado perezoso (como politicas.ColaHeap): elegir el siguiente
+#proceso, devolver uno desalojado o quitar uno cancelado cuesta O(log n) con cualquier concurrencia.
+#Todos los instantes son del reloj de la CPU: el reloj simulado en modo eventos o los segundos de tick
+#acumulados en modo tiempo real (ver Simulador._ahora_cpu)
+import heapq
+
+#Tiempo restante por debajo del cual un proceso se considera terminado (errores de redondeo)
+_EPSILON = 1e-9
+
+#Cola de listos sobre un heap de (clave, orden, pid); menor clave = se ejecuta antes.
+#quantum es la rebanada de tiempo (en segundos simulados) que recibe cada proceso al ser despachado
+class ColaListos:
+    planificador = None
+
+    def __init__(self, quantum=1.0):
+        if quantum <= 0:
+            raise ValueError("El quantum debe ser mayor que 0")
+        self.quantum = quantum
+        self._heap = []
+        self._procesos = {} #pid -> proceso que espera núcleo
+        self._orden = 0 #Desempata por orden de llegada a la cola
+
+    #Clave de ordenamiento del proceso (menor = se despacha antes)
+    def clave(self, proceso):
+        raise NotImplementedError
+
+    #Mete un proceso que espera núcleo: recién admitido (nuevo=True) o desalojado al vencer su rebanada
+    def agregar(self, proceso, ahora, nuevo=False):
+        self._orden += 1
+        self._procesos[proceso.pid] = proceso
+        heapq.heappush(self._heap, (self.clave(proceso), self._orden, proceso.pid))
+
+    #Saca de la cola el proceso que sigue (None si no hay ninguno)
+    def siguiente(self, ahora):
+        while self._heap:
+            pid = heapq.heappop(self._heap)[2]
+            proceso = self._procesos.pop(pid, None)
+            if proceso is not None:
+                return proceso
+        return None
+
+    #Quita un proceso que espera (cancelado); su entrada del heap se descarta al llegar a la cima
+    def quitar(self, pid):
+        return self._procesos.pop(pid, None)
+
+    #Duración de la rebanada que recibe el proceso al despacharlo
+    def rebanada(self, proceso):
+        return self.quantum
+
+    #El proceso usó 'tiempo' segundos de CPU (al terminar su rebanada o al ser cancelado)
+    def consumido(self, proceso, tiempo):
+        pass
+
+    #El proceso terminó o se canceló: se descarta lo que la cola guardaba de él
+    def olvidar(self, pid):
+        pass
+
+    #Datos propios del planificador para las estadísticas
+    def metricas(self):
+        return {}
+
+    def __len__(self):
+        return len(self._procesos)
+
+#Round robin: cola FIFO, cada proceso corre como mucho un quantum y vuelve al final
+class RoundRobin(ColaListos):
+    planificador = "rr"
+
+    def clave(self, proceso):
+        return 0 #Solo cuenta el orden de llegada a la cola
+
+#Cola multinivel con realimentación (MLFQ): los procesos nuevos entran al nivel 0 y bajan un nivel
+#cada vez que agotan el tiempo que les toca en el suyo (quantum * 2**nivel), así los cortos terminan
+#antes que los largos. Cada 'periodo_reinicio' segundos todos vuelven al nivel 0 para que los de
+#niveles bajos no sufran inanición. Todos los niveles comparten un heap ordenado por (nivel, orden).
+#Una llegada no interrumpe la rebanada en curso: espera a que se libere un núcleo
+class MLFQ(ColaListos):
+    planificador = "mlfq"
+
+    def __init__(self, quantum=1.0, niveles=3, periodo_reinicio=50.0):
+        super().__init__(quantum)
+        if niveles < 1:
+            raise ValueError("MLFQ necesita al menos un nivel")
+        self.niveles = niveles
+        self.periodo_reinicio = periodo_reinicio
+        self._nivel = {} #pid -> nivel actual
+        self._usado = {} #pid -> CPU usada en su nivel actual
+        self._listos = [0] * niveles #Procesos en la cola por nivel (el nivel no cambia mientras esperan)
+        self._proximo_reinicio = periodo_reinicio
+        self.reinicios = 0
+
+    def clave(self, proceso):
+        return self._nivel.get(proceso.pid, 0)
+
+    def agregar(self, proceso, ahora, nuevo=False):
+        if nuevo:
+            self._nivel[proceso.pid] = 0
+            self._usado[proceso.pid] = 0
+        super().agregar(proceso, ahora)
+        self._listos[self._nivel[proceso.pid]] += 1
+
+    def siguiente(self, ahora):
+        if self.periodo_reinicio and ahora >= self._proximo_reinicio:
+            self._reiniciar_niveles(ahora)
+        proceso = super().siguiente(ahora)
+        if proceso is not None:
+            self._listos[self._nivel[proceso.pid]] -= 1
+        return proceso
+
+    def quitar(self, pid):
+        proceso = super().quitar(pid)
+        if proceso is not None:
+            self._listos[self._nivel[pid]] -= 1
+        return proceso
+
+    #Todos vuelven al nivel 0; el heap se rearma en O(n) respetando el orden en que esperaban
+    def _reiniciar_niveles(self, ahora):
+        for pid in self._nivel:
+            self._nivel[pid] = 0
+            self._usado[pid] = 0
+        self._heap = [(0, orden, pid) for _, orden, pid in self._heap if pid in self._procesos]
+        heapq.heapify(self._heap)
+        self._listos = [len(self._procesos)] + [0] * (self.niveles - 1)
+        #Si el reloj saltó varios periodos se reinicia una sola vez
+        periodos = int((ahora - self._proximo_reinicio) // self.periodo_reinicio) + 1
+        self._proximo_reinicio += periodos * self.periodo_reinicio
+        self.reinicios += 1
+
+    #Le queda lo que falta de lo que le toca en su nivel
+    def rebanada(self, proceso):
+        nivel = self._nivel[proceso.pid]
+        return self.quantum * 2 ** nivel - self._usado[proceso.pid]
+
+    def consumido(self, proceso, tiempo):
+        pid = proceso.pid
+        nivel = self._nivel[pid]
+        usado = self._usado[pid] + tiempo
+        if usado >= self.quantum * 2 ** nivel - _EPSILON:
+            #Agotó su nivel: baja uno (en el último se queda y se hace round robin)
+            self._nivel[pid] = min(nivel + 1, self.niveles - 1)
+            usado = 0
+        self._usado[pid] = usado
+
+    def olvidar(self, pid):
+        self._nivel.pop(pid, None)
+        self._usado.pop(pid, None)
+
+    def metricas(self):
+        return {"listos_por_nivel": list(self._listos), "reinicios_prioridad": self.reinicios}
+
+#Planificación justa al estilo CFS: cada proceso acumula tiempo virtual (vruntime) al usar la CPU,
+#más rápido cuanto menos importante es (peso 1.25**prioridad, menor prioridad = más importante),
+#y siempre se despacha el de menor vruntime. La rebanada reparte 'latencia' segundos entre los
+#procesos que compiten por cada núcleo según su peso, sin bajar de 'quantum' (granularidad mínima)
+class CFS(ColaListos):
+    planificador = "cfs"
+
+    def __init__(self, quantum=0.5, latencia=6.0, nucleos=1):
+        super().__init__(quantum)
+        self.latencia = latencia
+        self.nucleos = nucleos
+        self._vruntime = {} #pid -> tiempo virtual acumulado
+        self._factor = {} #pid -> cuánto avanza su vruntime por segundo de CPU
+        self._factor_total = 0.0 #Suma de los pesos (1 / factor) de los procesos vivos
+        self.vruntime_minimo = 0.0 #Nunca baja; los nuevos empiezan acá para no acaparar la CPU
+
+    def clave(self, proceso):
+        return self._vruntime[proceso.pid]
+
+    def agregar(self, proceso, ahora, nuevo=False):
+        if nuevo:
+            factor = 1.25 ** proceso.prioridad
+            self._factor[proceso.pid] = factor
+            self._factor_total += 1 / factor
+            self._vruntime[proceso.pid] = self.vruntime_minimo
+        super().agregar(proceso, ahora)
+
+    def siguiente(self, ahora):
+        proceso = super().siguiente(ahora)
+        if proceso is not None:
+            self.vruntime_minimo = max(self.vruntime_minimo, self._vruntime[proceso.pid])
+        return proceso
+
+    def rebanada(self, proceso):
+        peso = 1 / self._factor[proceso.pid]
+        parte = self.latencia * peso * self.nucleos / self._factor_total
+        return min(self.latencia, max(self.quantum, parte))
+
+    def consumido(self, proceso, tiempo):
+        self._vruntime[proceso.pid] += tiempo * self._factor[proceso.pid]
+
+    def olvidar(self, pid):
+        factor = self._factor.pop(pid, None)
+        if factor is not None:
+            self._factor_total -= 1 / factor
+            self._vruntime.pop(pid)
+        if not self._factor:
+            self._factor_total = 0.0 #Evita que se acumule error de redondeo
+
+    def metricas(self):
+        return {"vruntime_minimo": self.vruntime_minimo}
+
+#Nombres de planificador que acepta PlanificadorCPU
+PLANIFICADORES = {
+    "rr": RoundRobin,
+    "mlfq": MLFQ,
+    "cfs": CFS,
+}
+
+#Reparte 'nucleos' núcleos entre los procesos en memoria según la cola de listos del 'planificador'.
+#Cada núcleo ocupado tiene una rebanada que termina en un instante; esos fines están en un heap
+#(tiempo, generación, núcleo) y la generación invalida el fin de una rebanada interrumpida (cancelación).
+#opciones: parámetros de la cola (niveles y periodo_reinicio en MLFQ, latencia en CFS)
+class PlanificadorCPU:
+    def __init__(self, nucleos=1, planificador="rr", quantum=None, **opciones):
+        if nucleos < 1:
+            raise ValueError("Hace falta al menos un núcleo")
+        if planificador not in PLANIFICADORES:
+            raise ValueError(f"Planificador desconocido: {planificador} (opciones: {', '.join(PLANIFICADORES)})")
+        if quantum is not None:
+            opciones["quantum"] = quantum
+        if planificador == "cfs":
+            opciones["nucleos"] = nucleos
+        self.nucleos = nucleos
+        self.planificador = planificador
+        self.cola = PLANIFICADORES[planificador](**opciones)
+        self.en_nucleo = [None] * nucleos #Proceso que ocupa cada núcleo
+        self._libres = list(range(nucleos - 1, -1, -1)) #Pila de núcleos libres (se toma el 0 primero)
+        self._inicio = [0.0] * nucleos #Inicio de la rebanada en curso de cada núcleo
+        self._generacion = [0] * nucleos
+        self._ultimo = [None] * nucleos #PID del último proceso que corrió en cada núcleo
+        self._nucleo_de = {} #pid -> núcleo que ocupa
+        self._fines = [] #(fin de la rebanada, generación, núcleo)
+        self.reloj = 0.0 #Hasta dónde se contabilizó el tiempo
+        self._origen = 0.0 #Desde cuándo se mide la utilización
+        self.tiempo_ocupado = 0.0 #Segundos-núcleo de rebanadas ya contabilizadas
+        self.cambios_contexto = 0
+        self.despachos = 0
+
+    #Un proceso recién admitido pide CPU
+    def agregar(self, proceso, ahora):
+        self.cola.agregar(proceso, ahora, nuevo=True)
+        self._despachar(ahora)
+
+    #Ocupa los núcleos libres con los procesos que siguen en la cola de listos
+    def _despachar(self, ahora):
+        while self._libres and len(self.cola):
+            proceso = self.cola.siguiente(ahora)
+            if proceso is None:
+                break
+            nucleo = self._libres.pop()
+            if self._ultimo[nucleo] is not None and self._ultimo[nucleo] != proceso.pid:
+                self.cambios_contexto += 1
+            self._ultimo[nucleo] = proceso.pid
+            self.despachos += 1
+            self.en_nucleo[nucleo] = proceso
+            self._nucleo_de[proceso.pid] = nucleo
+            self._inicio[nucleo] = ahora
+            self._generacion[nucleo] += 1
+            rebanada = min(self.cola.rebanada(proceso), proceso.tiempo_restante)
+            heapq.heappush(self._fines, (ahora + rebanada, self._generacion[nucleo], nucleo))
+
+    #Libera el núcleo contabilizando lo que corrió el proceso hasta 'ahora' y devuelve el proceso
+    def _desalojar(self, nucleo, ahora):
+        proceso = self.en_nucleo[nucleo]
+        usado = ahora - self._inicio[nucleo]
+        proceso.tiempo_restante -= usado
+        self.tiempo_ocupado += usado
+        self.cola.consumido(proceso, usado)
+        self.en_nucleo[nucleo] = None
+        del self._nucleo_de[proceso.pid]
+        self._generacion[nucleo] += 1 #El fin de rebanada que quedó en el heap ya no vale
+        self._libres.append(nucleo)
+        return proceso
+
+    #Saca un proceso cancelado, esté en un núcleo o esperando; el núcleo que deja se ocupa enseguida
+    def quitar(self, pid, ahora):
+        nucleo = self._nucleo_de.get(pid)
+        if nucleo is not None:
+            self._desalojar(nucleo, ahora)
+            self._despachar(ahora)
+        else:
+            self.cola.quitar(pid)
+        self.cola.olvidar(pid)
+
+    #Descarta de la cima los fines de rebanadas interrumpidas
+    def _limpiar_cima(self):
+        fines = self._fines
+        while fines and fines[0][1] != self._generacion[fines[0][2]]:
+            heapq.heappop(fines)
+
+    #Instante en que termina la próxima rebanada (None si no hay núcleos ocupados)
+    def proximo(self):
+        self._limpiar_cima()
+        return self._fines[0][0] if self._fines else None
+
+    #Contabiliza todas las rebanadas que terminan hasta 'hasta': los procesos que completaron su
+    #duración salen y el resto vuelve a la cola de listos. Devuelve [(proceso, instante de fin)]
+    def avanzar(self, hasta):
+        terminados = []
+        fines = self._fines
+        while True:
+            self._limpiar_cima()
+            if not fines or fines[0][0] > hasta:
+                break
+            fin, _, nucleo = heapq.heappop(fines)
+            #Los núcleos que terminan en el mismo instante se liberan antes de volver a despachar
+            liberados = [nucleo]
+            while True:
+                self._limpiar_cima()
+                if not fines or fines[0][0] != fin:
+                    break
+                liberados.append(heapq.heappop(fines)[2])
+            for nucleo in liberados:
+                proceso = self._desalojar(nucleo, fin)
+                if proceso.tiempo_restante <= _EPSILON:
+                    proceso.tiempo_restante = 0
+                    self.cola.olvidar(proceso.pid)
+                    terminados.append((proceso, fin))
+                else:
+                    self.cola.agregar(proceso, fin)
+            self._despachar(fin)
+        self.reloj = max(self.reloj, hasta)
+        return terminados
+
+    #Tiempo que le falta a un proceso, descontando lo que lleva de su rebanada en curso
+    def restante_de(self, proceso, ahora):
+        nucleo = self._nucleo_de.get(proceso.pid)
+        if nucleo is None:
+            return proceso.tiempo_restante
+        return max(0, proceso.tiempo_restante - (ahora - self._inicio[nucleo]))
+
+    #Corre todos los instantes 'desplazamiento' segundos (al pasar de tiempo real a modo eventos)
+    def desplazar(self, desplazamiento):
+        self._fines = [(fin + desplazamiento, generacion, nucleo) for fin, generacion, nucleo in self._fines]
+        heapq.heapify(self._fines)
+        self._inicio = [inicio + desplazamiento for inicio in self._inicio]
+        self.reloj += desplazamiento
+        self._origen += desplazamiento
+
+    #Utilización de los núcleos desde el inicio, cambios de contexto y ocupación actual
+    def metricas(self, ahora):
+        ocupado = self.tiempo_ocupado + sum(
+            ahora - self._inicio[nucleo] for nucleo in self._nucleo_de.values()
+        )
+        transcurrido = (ahora - self._origen) * self.nucleos
+        return {
+            "nucleos": self.nucleos,
+            "planificador": self.planificador,
+            "utilizacion": ocupado / transcurrido if transcurrido > 0 else 0.0,
+            "cambios_contexto": self.cambios_contexto,
+            "despachos": self.despachos,
+            "nucleos_ocupados": len(self._nucleo_de),
+            "listos": len(self.cola),
+            **self.cola.metricas(),
+        }
@@ -0,0 +1,119 @@
+import math
+
+#Acumulador de una métrica en tiempo constante: cuenta, suma, mínimo, máximo,
+#media y varianza con el algoritmo de Welford (numéricamente estable)
+class Acumulador:
+    def __init__(self):
+        self.cuenta = 0
+        self.suma = 0.0
+        self.media = 0.0
+        self._m2 = 0.0 #Suma de los cuadrados de las diferencias con la media
+        self.minimo = None
+        self.maximo = None
+
+    def agregar(self, valor):
+        self.cuenta += 1
+        self.suma += valor
+        delta = valor - self.media
+        self.media += delta / self.cuenta
+        self._m2 += delta * (valor - self.media)
+        if self.minimo is None or valor < self.minimo:
+            self.minimo = valor
+        if self.maximo is None or valor > self.maximo:
+            self.maximo = valor
+
+    #Varianza muestral (0 si hay menos de dos valores)
+    def varianza(self):
+        return self._m2 / (self.cuenta - 1) if self.cuenta > 1 else 0.0
+
+    def desviacion(self):
+        return math.sqrt(self.varianza())
+
+    def resumen(self):
+        return {
+            "cuenta": self.cuenta,
+            "media": self.media,
+            "desviacion": self.desviacion(),
+            "minimo": self.minimo if self.minimo is not None else 0,
+            "maximo": self.maximo if self.maximo is not None else 0,
+        }
+
+#Sketch de cuantiles con error relativo acotado (estilo DDSketch).
+#Cada valor cae en una cubeta logarítmica, así la memoria depende del rango de valores
+#y no de cuántos se agregan. Si hay demasiadas cubetas se juntan las más bajas
+class SketchCuantiles:
+    def __init__(self, error_relativo=0.01, max_cubetas=2048):
+        self.gamma = (1 + error_relativo) / (1 - error_relativo)
+        self._log_gamma = math.log(self.gamma)
+        self.max_cubetas = max_cubetas
+        self.cubetas = {} #índice -> cantidad de valores
+        self.ceros = 0 #Valores <= 0 (por ejemplo procesos que no esperaron)
+        self.cuenta = 0
+
+    def agregar(self, valor):
+        self.cuenta += 1
+        if valor <= 0:
+            self.ceros += 1
+            return
+        indice = math.ceil(math.log(valor) / self._log_gamma)
+        self.cubetas[indice] = self.cubetas.get(indice, 0) + 1
+        if len(self.cubetas) > self.max_cubetas:
+            self._colapsar()
+
+    #Junta las dos cubetas más bajas: pierde precisión solo en los valores más pequeños
+    def _colapsar(self):
+        indices = sorted(self.cubetas)
+        menor, siguiente = indices[0], indices[1]
+        self.cubetas[siguiente] += self.cubetas.pop(menor)
+
+    #Devuelve el valor aproximado del cuantil q (entre 0 y 1)
+    def cuantil(self, q):
+        if self.cuenta == 0:
+            return 0.0
+        rango = q * (self.cuenta - 1)
+        acumulado = self.ceros
+        if rango < acumulado:
+            return 0.0
+        for indice in sorted(self.cubetas):
+            acumulado += self.cubetas[indice]
+            if rango < acumulado:
+                #Punto medio de la cubeta, con error relativo menor a error_relativo
+                return 2 * self.gamma ** indice / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.cubetas) / (self.gamma + 1)
+
+    def percentiles(self):
+        return {"p50": self.cuantil(0.50), "p95": self.cuantil(0.95), "p99": self.cuantil(0.99)}
+
+#Agrupa las métricas de los procesos terminados y se actualiza en O(1) por proceso
+class EstadisticasIncrementales:
+    def __init__(self):
+        self.memoria = Acumulador()
+        self.vida = Acumulador() #Tiempo en ejecución
+        self.espera = Acumulador() #Tiempo en cola antes de ser admitido
+        self.retorno = Acumulador() #Desde la llegada hasta que terminó (turnaround)
+        self.ralentizacion = Acumulador() #Tiempo real en ejecución / duración pedida (> 1 con fallos de página)
+        self.sketch_espera = SketchCuantiles()
+        self.sketch_retorno = SketchCuantiles()
+
+    def agregar(self, proceso):
+        self.memoria.agregar(proceso.memoria_mb)
+        if proceso.tiempo_duracion_real is not None:
+            self.vida.agregar(proceso.tiempo_duracion_real)
+            if proceso.duracion_s:
+                self.ralentizacion.agregar(proceso.tiempo_duracion_real / proceso.duracion_s)
+        if proceso.tiempo_espera is not None:
+            self.espera.agregar(proceso.tiempo_espera)
+            self.sketch_espera.agregar(proceso.tiempo_espera)
+        if proceso.tiempo_llegada is not None and proceso.tiempo_fin is not None:
+            retorno = proceso.tiempo_fin - proceso.tiempo_llegada
+            self.retorno.agregar(retorno)
+            self.sketch_retorno.agregar(retorno)
+
+    def resumen(self):
+        return {
+            "memoria": self.memoria.resumen(),
+            "vida": self.vida.resumen(),
+            "espera": {**self.espera.resumen(), **self.sketch_espera.percentiles()},
+            "retorno": {**self.retorno.resumen(), **self.sketch_retorno.percentiles()},
+            "ralentizacion": self.ralentizacion.resumen(),
+        }
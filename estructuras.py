@@ -0,0 +1,258 @@
+#Estructuras de datos auxiliares del simulador
+import numpy as np
+
+INFINITO = float("inf")
+
+#Cola de espera indexada por memoria.
+#Los procesos ocupan posiciones consecutivas en orden de llegada y un árbol de segmentos
+#guarda la memoria mínima de cada rango, así se puede encontrar en O(log n) el primer
+#proceso (en orden de llegada) que cabe en la memoria disponible sin recorrer los que no caben.
+#politica "primer_ajuste": recorre la cola en orden y admite todo lo que quepa (por defecto)
+#politica "fifo": solo admite desde la cabeza y se bloquea en el primero que no cabe
+class ColaEspera:
+    def __init__(self, politica="primer_ajuste"):
+        self.politica = politica
+        self._reiniciar(1024)
+
+    #Crea el árbol vacío con la capacidad indicada
+    def _reiniciar(self, capacidad):
+        self._capacidad = capacidad
+        self._arbol = [INFINITO] * (2 * capacidad) #Memoria mínima de cada rango de posiciones
+        self._procesos = [None] * capacidad #Proceso que ocupa cada posición
+        self._posiciones = {} #pid -> posición, para quitar procesos en O(log n)
+        self._inicio = 0 #Primera posición que puede estar ocupada
+        self._fin = 0 #Siguiente posición libre al final de la cola
+
+    #Cambia el valor de una hoja y actualiza los mínimos hacia la raíz
+    def _actualizar(self, posicion, valor):
+        i = posicion + self._capacidad
+        arbol = self._arbol
+        arbol[i] = valor
+        i >>= 1
+        while i:
+            arbol[i] = min(arbol[2 * i], arbol[2 * i + 1])
+            i >>= 1
+
+    #Devuelve la primera posición >= desde cuya memoria es <= limite, o -1 si no hay ninguna
+    def _buscar(self, desde, limite, nodo=1, izq=0, der=None):
+        if der is None:
+            der = self._capacidad
+        if der <= desde or self._arbol[nodo] > limite:
+            return -1
+        if der - izq == 1:
+            return izq
+        medio = (izq + der) // 2
+        encontrado = self._buscar(desde, limite, 2 * nodo, izq, medio)
+        if encontrado != -1:
+            return encontrado
+        return self._buscar(desde, limite, 2 * nodo + 1, medio, der)
+
+    #Reconstruye el árbol solo con los procesos vivos (cuando se llena el espacio)
+    def _compactar(self):
+        vivos = list(self)
+        capacidad = 1024
+        #La capacidad debe ser potencia de 2 para que el árbol quede completo
+        while capacidad < 2 * len(vivos):
+            capacidad *= 2
+        self._reiniciar(capacidad)
+        for proceso in vivos:
+            self.append(proceso)
+
+    # Añade un proceso al final de la cola
+    def append(self, proceso):
+        if self._fin == self._capacidad:
+            self._compactar()
+        posicion = self._fin
+        self._fin += 1
+        self._procesos[posicion] = proceso
+        self._posiciones[proceso.pid] = posicion
+        self._actualizar(posicion, proceso.memoria_mb)
+
+    #Quita de la cola el proceso con ese pid y lo devuelve (None si no está)
+    def quitar(self, pid):
+        posicion = self._posiciones.pop(pid, None)
+        if posicion is None:
+            return None
+        proceso = self._procesos[posicion]
+        self._procesos[posicion] = None
+        self._actualizar(posicion, INFINITO)
+        #Se avanza el inicio para saltar los huecos de la cabeza
+        while self._inicio < self._fin and self._procesos[self._inicio] is None:
+            self._inicio += 1
+        return proceso
+
+    #Quita varios procesos de una vez y devuelve los que estaban en la cola.
+    #Las hojas se marcan primero y los mínimos se recalculan nivel por nivel, así cada
+    #nodo interno se actualiza una sola vez aunque se quiten miles de procesos
+    def quitar_lote(self, pids):
+        quitados = []
+        arbol = self._arbol
+        padres = set()
+        for pid in pids:
+            posicion = self._posiciones.pop(pid, None)
+            if posicion is None:
+                continue
+            quitados.append(self._procesos[posicion])
+            self._procesos[posicion] = None
+            i = posicion + self._capacidad
+            arbol[i] = INFINITO
+            padres.add(i >> 1)
+        while padres:
+            siguientes = set()
+            for i in padres:
+                arbol[i] = min(arbol[2 * i], arbol[2 * i + 1])
+                if i > 1:
+                    siguientes.add(i >> 1)
+            padres = siguientes
+        while self._inicio < self._fin and self._procesos[self._inicio] is None:
+            self._inicio += 1
+        return quitados
+
+    def remove(self, proceso):
+        if self.quitar(proceso.pid) is None:
+            raise ValueError(f"El proceso {proceso.pid} no está en la cola de espera")
+
+    #Devuelve el primer proceso de la cola sin sacarlo
+    def cabeza(self):
+        if self._inicio < self._fin:
+            return self._procesos[self._inicio]
+        return None
+
+    #FIFO estricto: admite desde la cabeza y se detiene en el primero que no cabe
+    def _admitir_desde_cabeza(self, gestor_memoria, iniciar):
+        admitidos = []
+        proceso = self.cabeza()
+        while proceso is not None and gestor_memoria.asignar_memoria(proceso):
+            self.quitar(proceso.pid)
+            iniciar(proceso)
+            admitidos.append(proceso)
+            proceso = self.cabeza()
+        return admitidos
+
+    #Admite los procesos que caben según la política y los pasa a la función iniciar.
+    #Devuelve la lista de procesos admitidos
+    def admitir(self, gestor_memoria, iniciar, simulador=None):
+        if self.politica == "fifo":
+            return self._admitir_desde_cabeza(gestor_memoria, iniciar)
+
+        admitidos = []
+        #Primer ajuste: los procesos ya descartados no vuelven a caber porque la memoria solo baja.
+        #El límite es el bloque más grande que se puede asignar (con fragmentación puede ser menor que la memoria libre)
+        desde = self._inicio
+        while True:
+            posicion = self._buscar(desde, gestor_memoria.maximo_asignable())
+            if posicion == -1:
+                break
+            proceso = self._procesos[posicion]
+            if gestor_memoria.asignar_memoria(proceso):
+                self.quitar(proceso.pid)
+                iniciar(proceso)
+                admitidos.append(proceso)
+            desde = posicion + 1
+        return admitidos
+
+    def clear(self):
+        self._reiniciar(1024)
+
+    def __len__(self):
+        return len(self._posiciones)
+
+    def __contains__(self, proceso):
+        return self._posiciones.get(proceso.pid) is not None
+
+    #Recorre los procesos en orden de llegada
+    def __iter__(self):
+        procesos = self._procesos
+        for posicion in range(self._inicio, self._fin):
+            proceso = procesos[posicion]
+            if proceso is not None:
+                yield proceso
+
+#Conjunto de procesos en ejecución guardado en arreglos de NumPy.
+#Permite avanzar un tick para todos los procesos con operaciones vectorizadas:
+#se resta el tiempo a todos a la vez, una máscara encuentra los terminados y la memoria
+#liberada se suma en una sola pasada. Los huecos se rellenan moviendo el último elemento
+class ConjuntoEjecucion:
+    def __init__(self, capacidad=1024):
+        self.cantidad = 0
+        self.restante = np.zeros(capacidad, dtype=np.float64)
+        self.memoria = np.zeros(capacidad, dtype=np.float64)
+        self.orden = np.zeros(capacidad, dtype=np.int64) #Orden de admisión, para devolver los terminados en orden
+        self.procesos = [None] * capacidad
+        self._indices = {} #pid -> posición en los arreglos
+        self._siguiente_orden = 0
+
+    def _crecer(self):
+        capacidad = 2 * len(self.procesos)
+        for nombre in ("restante", "memoria", "orden"):
+            viejo = getattr(self, nombre)
+            nuevo = np.zeros(capacidad, dtype=viejo.dtype)
+            nuevo[:self.cantidad] = viejo[:self.cantidad]
+            setattr(self, nombre, nuevo)
+        self.procesos.extend([None] * (capacidad - len(self.procesos)))
+
+    #extra se suma al tiempo restante, por ejemplo si el proceso entra a mitad de un tick
+    def agregar(self, proceso, extra=0):
+        if self.cantidad == len(self.procesos):
+            self._crecer()
+        i = self.cantidad
+        self.cantidad += 1
+        self.restante[i] = proceso.tiempo_restante + extra
+        self.memoria[i] = proceso.memoria_mb
+        self.orden[i] = self._siguiente_orden
+        self._siguiente_orden += 1
+        self.procesos[i] = proceso
+        self._indices[proceso.pid] = i
+
+    #Quita el proceso moviendo el último a su lugar (O(1)); escribe su tiempo restante en el objeto
+    def quitar(self, pid):
+        i = self._indices.pop(pid, None)
+        if i is None:
+            return None
+        proceso = self.procesos[i]
+        proceso.tiempo_restante = float(self.restante[i])
+        ultimo = self.cantidad - 1
+        if i != ultimo:
+            self.restante[i] = self.restante[ultimo]
+            self.memoria[i] = self.memoria[ultimo]
+            self.orden[i] = self.orden[ultimo]
+            movido = self.procesos[ultimo]
+            self.procesos[i] = movido
+            self._indices[movido.pid] = i
+        self.procesos[ultimo] = None
+        self.cantidad = ultimo
+        return proceso
+
+    #Resta dt al tiempo restante de todos los procesos y saca los que terminaron.
+    #progreso (opcional) es el avance de cada proceso en el orden de 'procesos', cuando no todos avanzan dt.
+    #Devuelve (procesos terminados en orden de admisión, memoria total liberada)
+    def avanzar(self, dt=1, progreso=None):
+        n = self.cantidad
+        if n == 0:
+            return [], 0
+        restante = self.restante[:n]
+        restante -= dt if progreso is None else np.asarray(progreso, dtype=np.float64)
+        indices = np.flatnonzero(restante <= 0)
+        if indices.size == 0:
+            return [], 0
+        liberada = self.memoria[indices].sum().item()
+        indices = indices[np.argsort(self.orden[indices])]
+        terminados = [self.procesos[i] for i in indices.tolist()]
+        for proceso in terminados:
+            self.quitar(proceso.pid)
+        return terminados, liberada
+
+    #Tiempo restante actual de un proceso
+    def restante_de(self, pid):
+        return self.restante[self._indices[pid]].item()
+
+    #Copia los tiempos restantes de los arreglos a los objetos (para mostrarlos)
+    def sincronizar(self):
+        for i, valor in enumerate(self.restante[:self.cantidad].tolist()):
+            self.procesos[i].tiempo_restante = valor
+
+    def clear(self):
+        self.__init__()
+
+    def __len__(self):
+        return self.cantidad
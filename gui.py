@@ -1,16 +1,91 @@
 import sys
 import math
 from collections import deque
+from contextlib import nullcontext
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QLineEdit, QPushButton, QTableWidget, QTableWidgetItem,
+    QLabel, QLineEdit, QPushButton, QTableView,
     QHeaderView, QProgressBar, QFrame, QDialog, QSizePolicy
 )
 from PySide6.QtCore import QTimer, Qt, QRect
 from PySide6.QtGui import QColor, QPainter, QPen, QPainterPath, QIntValidator
 
 #Se importa la lógica real del simulador desde tu archivo core.py
-from core import Simulador, Proceso
+from core import Simulador
+from modelos import ModeloProcesos, ModeloHistorial, DelegadoCancelar
+from puntos_control import PuntosControl, existe as existe_punto_control
+
+#Hoja de estilos de toda la interfaz (ventana principal y diálogo de error).
+#Qt la analiza cada vez que se asigna, así que se asigna una sola vez a la QApplication
+#en lugar de a cada ventana, diálogo o botón
+ESTILOS = """
+QMainWindow, QWidget#centralWidget { background-color: #0f172a; color: #e2e8f0; font-family: 'Segoe UI', sans-serif; font-size: 14px; }
+QFrame#card { background-color: #1e293b; border-radius: 12px; padding: 15px; }
+QLabel { color: #cbd5e1; padding-bottom: 5px; }
+QLabel#titleLabel { font-size: 18px; font-weight: bold; color: #e2e8f0; padding-bottom: 10px; }
+/* MODIFICACIÓN: Se ajusta el estilo para el layout horizontal */
+QLabel#titleNoCard { font-size: 16px; font-weight: bold; color: #e2e8f0; }
+QLabel#statLabel { font-size: 14px; color: #94a3b8; }
+QLabel#statValue { font-size: 24px; font-weight: bold; color: #e2e8f0; padding-bottom: 15px; }
+QPushButton { 
+    background-color: #22c55e; 
+    color: #ffffff; 
+    font-weight: bold; 
+    border-radius: 8px; 
+    padding: 12px; 
+    border: none; 
+    outline: none; /* Se agrega esta línea para quitar el cuadro de selección */
+}
+QPushButton:hover { background-color: #16a34a; }
+QPushButton#controlButton { background-color: #3b82f6; }
+QPushButton#controlButton:hover { background-color: #2563eb; }
+QPushButton#dangerButton { background-color: #ef4444; }
+QPushButton#dangerButton:hover { background-color: #dc2626; }
+QLineEdit { background-color: #0f172a; color: #e2e8f0; border: 1px solid #334155; padding: 10px; border-radius: 8px; }
+QProgressBar { background-color: #334155; border: none; border-radius: 8px; text-align: center; color: #e2e8f0; height: 16px; }
+QProgressBar::chunk { background-color: #22c55e; border-radius: 8px; }
+QTableView { 
+    background-color: transparent; 
+    color: #e2e8f0; 
+    border: none; 
+    /* Se eliminó gridline-color: #334155; */
+}
+QHeaderView::section { background-color: #1e293b; color: #94a3b8; font-weight: bold; padding: 10px; border: none; }
+QTableView::item { padding-left: 10px; }
+QDialog#dialogoError { 
+    background-color: #1e293b; 
+    color: #e2e8f0; 
+    font-family: 'Segoe UI', sans-serif; 
+    font-size: 14px; 
+    border-radius: 12px; 
+}
+QDialog#dialogoError QLabel { 
+    color: #e2e8f0; 
+    font-size: 16px; 
+    padding: 10px; 
+    text-align: center;
+    /* Se agrega para permitir que el texto se ajuste y envuelva */
+    qproperty-wordWrap: true; 
+}
+QDialog#dialogoError QPushButton { 
+    background-color: #ef4444; 
+    color: #ffffff; 
+    font-weight: bold; 
+    border-radius: 8px; 
+    padding: 10px 20px; 
+    border: none; 
+    outline: none;
+}
+QDialog#dialogoError QPushButton:hover { 
+    background-color: #dc2626; 
+}
+"""
+
+#Aplica ESTILOS a la aplicación si todavía no los tiene
+def aplicar_estilos():
+    app = QApplication.instance()
+    if app.styleSheet() != ESTILOS:
+        app.setStyleSheet(ESTILOS)
 
 #Widget para la barra de progreso circular
 class CircularProgressBar(QWidget):
@@ -62,36 +137,8 @@ class CustomErrorDialog(QDialog):
         self.setWindowTitle("Error de Validación")
         self.setModal(True) # Hace que el diálogo sea modal (bloquea la ventana principal)
 
-        #Aplicar estilos similares a la ventana principal
-        self.setStyleSheet("""
-            QDialog { 
-                background-color: #1e293b; 
-                color: #e2e8f0; 
-                font-family: 'Segoe UI', sans-serif; 
-                font-size: 14px; 
-                border-radius: 12px; 
-            }
-            QLabel { 
-                color: #e2e8f0; 
-                font-size: 16px; 
-                padding: 10px; 
-                text-align: center;
-                /* Se agrega para permitir que el texto se ajuste y envuelva */
-                qproperty-wordWrap: true; 
-            }
-            QPushButton { 
-                background-color: #ef4444; 
-                color: #ffffff; 
-                font-weight: bold; 
-                border-radius: 8px; 
-                padding: 10px 20px; 
-                border: none; 
-                outline: none;
-            }
-            QPushButton:hover { 
-                background-color: #dc2626; 
-            }
-        """)
+        #Los estilos del diálogo están en ESTILOS, con el selector QDialog#dialogoError
+        self.setObjectName("dialogoError")
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
@@ -113,50 +160,34 @@ class CustomErrorDialog(QDialog):
 #Configuramos la venta principal
 class MainWindow(QMainWindow):
 
-    def __init__(self):
+    #metricas: metricas.RegistroMetricas opcional para instrumentar el simulador
+    #tiempos: arranque.TiemposArranque opcional donde se miden las fases de construcción
+    #punto_control: directorio donde se guarda el estado cada intervalo_punto_control segundos y al cerrar;
+    #si ya tiene un punto de control la simulación sigue desde ahí
+    #bitacora: bitacora.Bitacora opcional donde se anotan los eventos de la simulación; se cierra con la ventana
+    #compartido: compartido.PublicadorCompartido opcional para ver el estado desde otros procesos; se cierra con la ventana
+    def __init__(self, metricas=None, tiempos=None, punto_control=None, intervalo_punto_control=60, bitacora=None,
+                 compartido=None):
         super().__init__()
+        self.tiempos = tiempos
         #Creamos la instancia del simulador que manejará la lógica interna
-        self.simulador = Simulador()
+        with self._medir("simulador"):
+            self.puntos_control = None
+            if punto_control and existe_punto_control(punto_control):
+                self.puntos_control = PuntosControl.restaurar(punto_control, metricas=metricas, bitacora=bitacora,
+                                                              compartido=compartido)
+                self.simulador = self.puntos_control.simulador
+            else:
+                self.simulador = Simulador(metricas=metricas, bitacora=bitacora, compartido=compartido)
+                if punto_control:
+                    self.puntos_control = PuntosControl(self.simulador, punto_control)
         #Para el titulo
         self.setWindowTitle("Simuladora de RAM")
         self.setGeometry(100, 100, 1400, 800)
 
-        #Aplicamos estilos css
-        self.setStyleSheet("""
-            QMainWindow, QWidget#centralWidget { background-color: #0f172a; color: #e2e8f0; font-family: 'Segoe UI', sans-serif; font-size: 14px; }
-            QFrame#card { background-color: #1e293b; border-radius: 12px; padding: 15px; }
-            QLabel { color: #cbd5e1; padding-bottom: 5px; }
-            QLabel#titleLabel { font-size: 18px; font-weight: bold; color: #e2e8f0; padding-bottom: 10px; }
-            /* MODIFICACIÓN: Se ajusta el estilo para el layout horizontal */
-            QLabel#titleNoCard { font-size: 16px; font-weight: bold; color: #e2e8f0; }
-            QLabel#statLabel { font-size: 14px; color: #94a3b8; }
-            QLabel#statValue { font-size: 24px; font-weight: bold; color: #e2e8f0; padding-bottom: 15px; }
-            QPushButton { 
-                background-color: #22c55e; 
-                color: #ffffff; 
-                font-weight: bold; 
-                border-radius: 8px; 
-                padding: 12px; 
-                border: none; 
-                outline: none; /* Se agrega esta línea para quitar el cuadro de selección */
-            }
-            QPushButton:hover { background-color: #16a34a; }
-            QPushButton#controlButton { background-color: #3b82f6; }
-            QPushButton#controlButton:hover { background-color: #2563eb; }
-            QPushButton#dangerButton { background-color: #ef4444; }
-            QPushButton#dangerButton:hover { background-color: #dc2626; }
-            QLineEdit { background-color: #0f172a; color: #e2e8f0; border: 1px solid #334155; padding: 10px; border-radius: 8px; }
-            QProgressBar { background-color: #334155; border: none; border-radius: 8px; text-align: center; color: #e2e8f0; height: 16px; }
-            QProgressBar::chunk { background-color: #22c55e; border-radius: 8px; }
-            QTableWidget { 
-                background-color: transparent; 
-                color: #e2e8f0; 
-                border: none; 
-                /* Se eliminó gridline-color: #334155; */
-            }
-            QHeaderView::section { background-color: #1e293b; color: #94a3b8; font-weight: bold; padding: 10px; border: none; }
-            QTableWidget::item { padding-left: 10px; }
-        """)
+        #Los estilos se aplican una sola vez a toda la aplicación (ver aplicar_estilos)
+        with self._medir("estilos"):
+            aplicar_estilos()
 
         self.central_widget = QWidget()
         self.central_widget.setObjectName("centralWidget")
@@ -166,40 +197,56 @@ class MainWindow(QMainWindow):
         self.main_layout.setSpacing(20)
         self.main_layout.setContentsMargins(20, 20, 20, 20)
 
+        #Un solo delegado dibuja los botones "Cancelar" de las tablas de cola y ejecución
+        self.delegado_cancelar = DelegadoCancelar(self)
+        self.delegado_cancelar.cancelar.connect(self.cancelar_proceso_ui)
+
         self.left_column, self.center_column, self.right_column = QVBoxLayout(), QVBoxLayout(), QVBoxLayout()
         for col in [self.left_column, self.center_column, self.right_column]: col.setSpacing(20)
 
-        #Estructura de la columna izquierda
-        panel_memoria = self.crear_panel_memoria()
-        panel_proceso_controles = self.crear_panel_proceso_y_controles()
-        layout_carga_sistema = self.crear_panel_carga_sistema()
+        with self._medir("paneles"):
+            #Estructura de la columna izquierda
+            panel_memoria = self.crear_panel_memoria()
+            panel_proceso_controles = self.crear_panel_proceso_y_controles()
+            layout_carga_sistema = self.crear_panel_carga_sistema()
 
-        self.left_column.addWidget(panel_memoria)
-        self.left_column.addWidget(panel_proceso_controles)
-        self.left_column.addLayout(layout_carga_sistema)
+            self.left_column.addWidget(panel_memoria)
+            self.left_column.addWidget(panel_proceso_controles)
+            self.left_column.addLayout(layout_carga_sistema)
+            #Los gráficos (y pyqtgraph, que tarda en importarse) se crean después del primer pintado
+            self.curvas = {}
+            self._diferidos_creados = False
 
-        self.left_column.addStretch(1)
-        
-        self.crear_tabla_cola()
-        self.crear_tabla_ejecucion()
-        #Se elimina el stretch aquí para permitir que la tabla de ejecución se estire
-        #self.center_column.addStretch(1)
+            self.left_column.addStretch(1)
+
+        with self._medir("tablas"):
+            self.crear_tabla_cola()
+            self.crear_tabla_ejecucion()
+            #Se elimina el stretch aquí para permitir que la tabla de ejecución se estire
+            #self.center_column.addStretch(1)
 
-        self.crear_panel_estadisticas()
-        self.crear_tabla_terminados()
-        #Se añade un stretch al final de la columna derecha para alinear la parte inferior
-        self.right_column.addStretch(1)
+            self.crear_panel_estadisticas()
+            self.crear_tabla_terminados()
+            #Se añade un stretch al final de la columna derecha para alinear la parte inferior
+            self.right_column.addStretch(1)
 
         #Se ajustan los factores de estiramiento para las columnas
         self.main_layout.addLayout(self.left_column, 1)
         self.main_layout.addLayout(self.center_column, 2)
         self.main_layout.addLayout(self.right_column, 1)
 
+        self.version_mostrada = None #Versión de la última instantánea dibujada
         self.simulador.iniciar_simulacion()
+        if self.puntos_control:
+            self.puntos_control.iniciar(intervalo_punto_control)
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.actualizar_ui)
         self.timer.start(500)
 
+    #Mide una fase del arranque si se pasó un TiemposArranque
+    def _medir(self, nombre):
+        return self.tiempos.medir(nombre) if self.tiempos else nullcontext()
+
     # Creamos los panel base (contenedores) con un diseño y un titulo opcional
     def _crear_panel_base(self, title):
         panel_frame = QFrame()
@@ -266,6 +313,64 @@ class MainWindow(QMainWindow):
         
         return container_layout
 
+    #Gráficos en vivo de memoria usada, cola, procesos en ejecución y rendimiento.
+    #Los datos salen de las series de tiempo del simulador ya reducidas a una cantidad fija
+    #de puntos, así el costo de dibujar no crece con las horas de historia
+    def crear_panel_graficos(self):
+        import pyqtgraph as pg #Solo se necesita para este panel
+
+        panel, layout = self._crear_panel_base("Historial en vivo")
+        pg.setConfigOptions(antialias=False, background="#1e293b", foreground="#94a3b8")
+        grafico = pg.GraphicsLayoutWidget()
+        grafico.setMinimumHeight(240)
+        self.curvas = {}
+        colores = {"memoria_usada": "#3b82f6", "en_cola": "#f59e0b", "en_ejecucion": "#22c55e", "rendimiento": "#a855f7"}
+        titulos = {"memoria_usada": "Memoria (MB)", "en_cola": "En cola", "en_ejecucion": "En ejecución", "rendimiento": "Terminados/s"}
+        anterior = None
+        for fila, canal in enumerate(colores):
+            plot = grafico.addPlot(row=fila, col=0)
+            plot.setLabel("left", titulos[canal])
+            plot.showGrid(x=True, y=True, alpha=0.15)
+            plot.setMenuEnabled(False)
+            plot.setMouseEnabled(x=False, y=False)
+            plot.hideButtons()
+            if anterior is not None:
+                plot.setXLink(anterior) #Todos comparten el eje de tiempo
+                anterior.hideAxis("bottom") #Solo el último muestra los segundos
+            anterior = plot
+            self.curvas[canal] = plot.plot(pen=pg.mkPen(colores[canal], width=1.5))
+        layout.addWidget(grafico)
+        #Va antes del stretch final de la columna
+        self.left_column.insertWidget(self.left_column.count() - 1, panel)
+
+    #La primera vez que se pinta la ventana se agenda la creación de los paneles secundarios,
+    #así aparece la ventana sin esperar a pyqtgraph
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._diferidos_creados:
+            self._diferidos_creados = True
+            if self.tiempos:
+                self.tiempos.marcar("primer pintado")
+            QTimer.singleShot(0, self.crear_paneles_diferidos)
+
+    #Crea los paneles que no hacen falta para mostrar la ventana
+    def crear_paneles_diferidos(self):
+        with self._medir("panel de graficos"):
+            self.crear_panel_graficos()
+        if self.tiempos:
+            self.tiempos.marcar("paneles diferidos")
+        self.version_mostrada = None #Se redibuja todo, incluidos los gráficos nuevos
+        self.actualizar_ui()
+
+    #Redibuja los gráficos con la versión reducida de las series (nada si aún no se crearon)
+    def actualizar_graficos(self):
+        if not self.curvas:
+            return
+        series = self.simulador.series
+        tiempos, valores = series.reducida(400)
+        for canal, curva in self.curvas.items():
+            curva.setData(tiempos, valores[:, series.canal(canal)])
+
     #Crea un panel vertical que muestre tres estadísticas 
     def crear_panel_estadisticas(self):
         panel, layout = self._crear_panel_base("Estadísticas")
@@ -289,17 +394,24 @@ class MainWindow(QMainWindow):
         layout.addStretch(1)
         self.right_column.addWidget(panel)
 
-    #Para crear el panel que contiene las tablas QTableWidget
-    def _crear_tabla(self, headers, parent_layout, title):
+    #Para crear el panel que contiene las tablas.
+    #Cada tabla es un QTableView sobre un ModeloProcesos; si es cancelable la última columna
+    #la dibuja el delegado compartido del botón "Cancelar"
+    def _crear_tabla(self, headers, parent_layout, title, formateador, cancelable=False, modelo=None):
         panel, layout = self._crear_panel_base(title)
-        table = QTableWidget()
+        if modelo is None:
+            modelo = ModeloProcesos(headers, formateador, cancelable, self)
+        table = QTableView()
+        table.setModel(modelo)
         #Se agrega esta línea para quitar las líneas de la cuadrícula
         table.setShowGrid(False) 
         #Se agrega esta línea para ocultar el encabezado vertical (numeración de filas)
         table.verticalHeader().setVisible(False) 
-        table.setColumnCount(len(headers))
-        table.setHorizontalHeaderLabels(headers)
         table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        if cancelable:
+            #El botón estará en la última columna
+            table.setItemDelegateForColumn(len(headers) - 1, self.delegado_cancelar)
+            table.setMouseTracking(True) #Para el efecto hover del botón
         layout.addWidget(table)
         #Agregamos la tabla al panel
         parent_layout.addWidget(panel)
@@ -309,16 +421,30 @@ class MainWindow(QMainWindow):
     #Creamos la tabla para mostrar el proceso de cola de espera
     def crear_tabla_cola(self):
         #Añadimos "Accion" a los encabezados
-        self.tabla_cola = self._crear_tabla(["PID", "Nombre", "Memoria", "Duración", "Acción"], self.center_column, "Cola de Espera")
+        self.tabla_cola = self._crear_tabla(
+            ["PID", "Nombre", "Memoria", "Duración", "Acción"], self.center_column, "Cola de Espera",
+            lambda f: [f[0], f[1], f"{f[2]} MB", f"{f[3]}s"],
+            cancelable=True
+        )
 
     #Creamos la tabla para los procesos de ejecución
     def crear_tabla_ejecucion(self):
         #Añadimos "Accion" a los encabezados
-        self.tabla_ejecucion = self._crear_tabla(["PID", "Nombre", "Memoria", "Restante", "Acción"], self.center_column, "En Ejecución")
+        self.tabla_ejecucion = self._crear_tabla(
+            ["PID", "Nombre", "Memoria", "Restante", "Acción"], self.center_column, "En Ejecución",
+            lambda f: [f[0], f[1], f"{f[2]} MB", f"{int(f[3])}s"],
+            cancelable=True
+        )
         
-    #Creamos la tabla que muestra los procesos terminados    
+    #Creamos la tabla que muestra los procesos terminados.
+    #Usa el modelo del historial: los más viejos se cargan desde disco al desplazarse
     def crear_tabla_terminados(self):
-        self.tabla_terminados = self._crear_tabla(["PID", "Nombre", "Memoria", "Duración"], self.right_column, "Procesos Terminados")
+        headers = ["PID", "Nombre", "Memoria", "Duración"]
+        formateador = lambda f: [f[0], f[1], f"{f[2]} MB", f"{f[3]}s"]
+        modelo = ModeloHistorial(headers, formateador, self.simulador.procesos_terminados, parent=self)
+        self.tabla_terminados = self._crear_tabla(
+            headers, self.right_column, "Procesos Terminados", formateador, modelo=modelo
+        )
         #Ajustamos las columnas al contenido para evitar cortes de texto
         self.tabla_terminados.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
 
@@ -366,13 +492,9 @@ class MainWindow(QMainWindow):
                 dialog.exec()
                 return
 
-            #Generamos un nuevo identificador único para el proceso
-            self.simulador.proceso_id_counter += 1
-            pid = f"P{self.simulador.proceso_id_counter}"
-            
-            #Creamos un objeto Proceso y lo registramos en el simulador 
-            nuevo_proceso = Proceso(pid, nombre, memoria, duracion)
-            self.simulador.agregar_proceso(nuevo_proceso)
+            #El simulador asigna el PID con su lock tomado, así no choca con los procesos
+            #que llegan a la vez por el servidor de control
+            self.simulador.agregar_procesos([{"nombre": nombre, "memoria_mb": memoria, "duracion_s": duracion}])
             
             #limpieza de los campos de entrada
             for input_field in [self.nombre_input, self.memoria_input, self.duracion_input]:
@@ -399,10 +521,17 @@ class MainWindow(QMainWindow):
         self.simulador.cancelar_proceso(pid)
         self.actualizar_ui() #Actualizamos la UI
 
-    #Actualizamos todos los elementos visuales con la información más reciente
+    #Actualizamos todos los elementos visuales con la información más reciente.
+    #Se lee la instantánea que publica el simulador, sin competir por su lock;
+    #si la versión no cambió desde el último refresco no hay nada que redibujar
     def actualizar_ui(self):
+        instantanea = self.simulador.obtener_instantanea()
+        if instantanea.version == self.version_mostrada:
+            return
+        self.version_mostrada = instantanea.version
+
         #Datos de uso de memoria
-        mem_usada, ram_total = self.simulador.obtener_uso_memoria()
+        mem_usada, ram_total = instantanea.memoria_usada, instantanea.memoria_total
         self.label_memoria.setText(f"{mem_usada:.0f} MB / {ram_total:.0f} MB")
         self.barra_memoria.setMaximum(int(ram_total))
         self.barra_memoria.setValue(int(mem_usada))
@@ -411,75 +540,34 @@ class MainWindow(QMainWindow):
         uso_memoria_porc = (mem_usada / ram_total) * 100 if ram_total > 0 else 0
         self.progress_memoria.setValue(uso_memoria_porc)
 
-        #Actualizamos la tabla de ejecución añadiendo el boton cancelar
-        self._actualizar_tabla(
-            self.tabla_ejecucion, 
-            self.simulador.procesos_en_ejecucion.values(), 
-            lambda p: [p.pid, p.nombre, f"{p.memoria_mb} MB", f"{int(p.tiempo_restante)}s"],
-            add_cancel_button=True #Habilitamos el boton cancelar
-        )
-
-        #Actualizamos la tabla de cola añadiendo el boton cancelar
-        self._actualizar_tabla(
-            self.tabla_cola, 
-            self.simulador.cola_espera, 
-            lambda p: [p.pid, p.nombre, f"{p.memoria_mb} MB", f"{p.duracion_s}s"],
-            add_cancel_button=True #Habilitamos el boton cancelar
-        )
-
-        #Actualizamos la tabla de procesos terminados
-        self._actualizar_tabla(self.tabla_terminados, reversed(self.simulador.procesos_terminados), lambda p: [p.pid, p.nombre, f"{p.memoria_mb} MB", f"{p.duracion_s}s"])
+        #Actualizamos las tablas; los modelos solo notifican las filas que cambiaron
+        self.tabla_ejecucion.model().actualizar(instantanea.filas_ejecucion)
+        self.tabla_cola.model().actualizar(instantanea.filas_cola)
+        self.tabla_terminados.model().actualizar(instantanea.filas_terminados)
 
         #Actualizamos las estadisticas
-        stats = self.simulador.obtener_estadisticas()
+        stats = instantanea.estadisticas
         self.label_ejecutados.setText(f"{stats['procesos_ejecutados']}")
         self.label_memoria_prom.setText(f"{stats['memoria_usada_promedio']:.0f} MB")
         self.label_tiempo_prom.setText(f"{stats['tiempo_vida_promedio']:.1f} s")
 
-    #Llenamos la tabla QTableWidget con nuevos datos
-    def _actualizar_tabla(self, table, data, row_formatter, add_cancel_button=False):
-        #Para evitar problemas de concurrencia
-        with self.simulador.lock:
-            items = list(data)
-        
-        #Limpiamos la tabla
-        table.setRowCount(0)
-        for item in items:
-            #Convertimos el objeto en listas de datos de fila
-            row_data = row_formatter(item)
-            row = table.rowCount()
-            table.insertRow(row)
-            for col, text in enumerate(row_data):
-                table_item = QTableWidgetItem(str(text))
-                table_item.setTextAlignment(Qt.AlignCenter)#Centramos el texto
-                table.setItem(row, col, table_item)
-            
-            if add_cancel_button:#Añade el boton cancelar
-                cancel_button = QPushButton("Cancelar")
-                cancel_button.setStyleSheet("""
-                    QPushButton { 
-                        background-color: #ef4444; 
-                        color: #ffffff; 
-                        font-weight: bold; 
-                        border-radius: 8px; 
-                        padding: 5px 10px; 
-                        border: none; 
-                        outline: none;
-                    }
-                    QPushButton:hover { 
-                        background-color: #dc2626; 
-                    }
-                """)
-                #El botón estará en la última columna
-                button_col = table.columnCount() - 1 
-                #Conectamos el boton a la funcion de cancelación, pasando el PID del proceso
-                cancel_button.clicked.connect(lambda _, p=item.pid: self.cancelar_proceso_ui(p))
-                table.setCellWidget(row, button_col, cancel_button)
+        self.actualizar_graficos()
 
     #Evento ejecutado al cerrar la ventana principal
     def closeEvent(self, event):
         #Detenemos la ejecución para evitar hilos activos
         self.simulador.ejecutando = False
+        #Se guarda el estado antes de cerrar el historial (el punto de control lo lee)
+        if self.puntos_control:
+            self.puntos_control.detener()
+        self.simulador.procesos_terminados.cerrar()
+        if self.simulador.bitacora:
+            self.simulador.bitacora.cerrar()
+        if self.simulador.compartido:
+            #El lock asegura que el motor no esté publicando mientras se cierra el segmento
+            with self.simulador.lock:
+                self.simulador.compartido.cerrar()
+                self.simulador.compartido = None
         super().closeEvent(event)
 
 if __name__ == '__main__':
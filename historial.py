@@ -0,0 +1,372 @@
+#Historial acotado de procesos terminados.
+#Los más recientes se guardan en memoria en un anillo de tamaño fijo; los más viejos
+#se vuelcan por lotes a una base SQLite en disco (solo se agregan filas, nunca se modifican)
+#con índices por PID y por tiempo de fin, así la memoria no crece en sesiones largas.
+#Los lotes los escribe un hilo aparte, así el simulador no espera al disco con su lock tomado
+import os
+import queue
+import sqlite3
+import sys
+import tempfile
+import threading
+import weakref
+from collections import deque, namedtuple
+from itertools import islice
+
+#Registro de un proceso ya volcado a disco; tiene los mismos atributos que Proceso
+RegistroTerminado = namedtuple("RegistroTerminado", [
+    "orden", "pid", "nombre", "memoria_mb", "duracion_s",
+    "tiempo_llegada", "tiempo_inicio", "tiempo_fin", "tiempo_espera", "tiempo_duracion_real",
+])
+#Columnas de la tabla en disco (mismo orden que RegistroTerminado)
+_COLUMNAS = ", ".join(RegistroTerminado._fields)
+
+_INSERTAR = f"INSERT INTO terminados ({_COLUMNAS}) VALUES ({', '.join('?' * len(RegistroTerminado._fields))})"
+
+#Termina el escritor (después de lo que ya tenía entregado), cierra la conexión y borra el archivo
+#temporal (también se llama si el historial se descarta sin cerrar)
+def _liberar(conexion, ruta, cola, hilo):
+    cola.put(None)
+    if hilo is not threading.current_thread():
+        hilo.join()
+    conexion.close()
+    if ruta and os.path.exists(ruta):
+        os.remove(ruta)
+
+#Bucle del hilo escritor: escribe cada lote entregado en una transacción y avisa al historial.
+#Solo guarda una referencia débil al historial, así uno que se descarta sin cerrar se puede liberar
+def _escribir(cola, conexion, lock_disco, referencia):
+    while True:
+        lote = cola.get()
+        try:
+            if lote is None or referencia() is None:
+                return
+            try:
+                with lock_disco, conexion:
+                    conexion.executemany(_INSERTAR, lote)
+                escritos = len(lote)
+            except sqlite3.Error as error:
+                print(f"No se pudo escribir el historial: {error}", file=sys.stderr)
+                escritos = 0
+            historial = referencia()
+            if historial is not None:
+                historial._escrito(lote, escritos)
+            historial = None
+        finally:
+            cola.task_done()
+
+class HistorialTerminados:
+    # capacidad: procesos que se mantienen en memoria
+    # ruta: archivo SQLite (por defecto uno temporal que se borra al cerrar y que se crea recién
+    #   cuando el primer proceso sale del anillo, así un simulador corto no toca el disco)
+    # lote: cuántos procesos expulsados se juntan antes de pasarlos al hilo que los escribe en disco
+    def __init__(self, capacidad=1000, ruta=None, lote=500):
+        self.capacidad = capacidad
+        self.lote = lote
+        self.recientes = deque() #(orden, proceso) del más viejo al más nuevo
+        self._pendientes = [] #Registros expulsados que todavía no se entregaron al escritor
+        self._en_vuelo = deque() #Lotes entregados al escritor que todavía no están en disco
+        #pid -> (orden, proceso o registro) de todo lo que está en memoria (recientes, pendientes y en vuelo)
+        self._por_pid = {}
+        self._siguiente_orden = 1
+        self._temporal = ruta is None
+        self._cerrado = False
+        self.ruta = ruta
+        #El simulador agrega con su lock tomado, así que _lock solo protege lo que está en memoria y nunca
+        #se tiene durante una escritura; la conexión (compartida con el escritor y la GUI) usa _lock_disco
+        self._lock = threading.Lock()
+        self._lock_disco = threading.Lock()
+        self._conexion = None #None = todavía no hay nada en disco (ver _abrir)
+        self._en_disco = 0
+        #Lotes para el escritor; no tiene límite para que el simulador nunca se bloquee
+        self._cola = queue.Queue()
+        self._hilo = None
+        if not self._temporal:
+            self._abrir()
+
+    #Abre la base (creando el archivo temporal si hace falta), retoma la numeración si ya tenía datos
+    #y arranca el hilo escritor
+    def _abrir(self):
+        if self._temporal:
+            descriptor, self.ruta = tempfile.mkstemp(prefix="historial_", suffix=".sqlite")
+            os.close(descriptor)
+        self._conexion = sqlite3.connect(self.ruta, check_same_thread=False)
+        self._conexion.executescript("""
+            CREATE TABLE IF NOT EXISTS terminados (
+                orden INTEGER PRIMARY KEY, pid TEXT, nombre TEXT, memoria_mb INTEGER, duracion_s NUMERIC,
+                tiempo_llegada REAL, tiempo_inicio REAL, tiempo_fin REAL, tiempo_espera REAL,
+                tiempo_duracion_real REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_terminados_pid ON terminados (pid);
+            CREATE INDEX IF NOT EXISTS idx_terminados_fin ON terminados (tiempo_fin);
+        """)
+        #Si el archivo ya tenía datos se continúa la numeración
+        ultimo = self._conexion.execute("SELECT MAX(orden) FROM terminados").fetchone()[0]
+        if ultimo:
+            self._siguiente_orden = ultimo + 1
+        self._en_disco = self._conexion.execute("SELECT COUNT(*) FROM terminados").fetchone()[0]
+        self._hilo = threading.Thread(
+            target=_escribir, args=(self._cola, self._conexion, self._lock_disco, weakref.ref(self)), daemon=True,
+        )
+        self._hilo.start()
+        self._finalizador = weakref.finalize(
+            self, _liberar, self._conexion, self.ruta if self._temporal else None, self._cola, self._hilo,
+        )
+
+    #Filas de una consulta sobre la base (ninguna si todavía no se abrió)
+    def _consultar(self, consulta, parametros=()):
+        with self._lock_disco:
+            if self._conexion is None:
+                return []
+            return self._conexion.execute(consulta, parametros).fetchall()
+
+    @staticmethod
+    def _registro(orden, p):
+        return RegistroTerminado(
+            orden, p.pid, p.nombre, p.memoria_mb, p.duracion_s,
+            p.tiempo_llegada, p.tiempo_inicio, p.tiempo_fin, p.tiempo_espera, p.tiempo_duracion_real,
+        )
+
+    #Agrega un proceso terminado; si el anillo está lleno el más viejo queda pendiente de pasar a disco
+    def append(self, proceso):
+        with self._lock:
+            orden = self._siguiente_orden
+            self.recientes.append((orden, proceso))
+            self._por_pid[proceso.pid] = (orden, proceso)
+            self._siguiente_orden += 1
+            if len(self.recientes) > self.capacidad:
+                self._expulsar()
+                if len(self._pendientes) >= self.lote:
+                    self._entregar()
+
+    #Pasa el más viejo del anillo a pendientes como registro (con el lock tomado)
+    def _expulsar(self):
+        orden, viejo = self.recientes.popleft()
+        registro = self._registro(orden, viejo)
+        self._pendientes.append(registro)
+        if self._por_pid.get(viejo.pid, (None,))[0] == orden:
+            self._por_pid[viejo.pid] = (orden, registro)
+
+    #Entrega los registros pendientes al hilo escritor (con el lock tomado); siguen en memoria,
+    #en _en_vuelo, hasta que el escritor avisa que están en disco
+    def _entregar(self):
+        if not self._pendientes or self._cerrado:
+            return
+        if self._conexion is None:
+            self._abrir()
+        self._en_vuelo.append(self._pendientes)
+        self._cola.put(self._pendientes)
+        self._pendientes = []
+
+    #El escritor terminó un lote (escritos = 0 si falló): sale de memoria
+    def _escrito(self, lote, escritos):
+        with self._lock:
+            self._en_vuelo.popleft()
+            self._en_disco += escritos
+            por_pid = self._por_pid
+            for registro in lote:
+                if por_pid.get(registro.pid, (None,))[0] == registro.orden:
+                    del por_pid[registro.pid]
+
+    #Entrega los pendientes y espera a que estén en disco
+    def volcar(self):
+        with self._lock:
+            self._entregar()
+        self._cola.join()
+
+    #Todo lo que está en memoria como (orden, proceso o registro), del más viejo al más nuevo, y el
+    #orden desde el que está ahí (se llama con el lock tomado). Los órdenes menores están en disco:
+    #un lote que se escribe después de leer esto sigue en la lista, así que se consulta el disco solo
+    #por debajo de ese orden y nada sale repetido ni falta
+    def _en_memoria(self):
+        memoria = [(registro.orden, registro) for lote in self._en_vuelo for registro in lote]
+        memoria += [(registro.orden, registro) for registro in self._pendientes]
+        memoria += self.recientes
+        return memoria, memoria[0][0] if memoria else self._siguiente_orden
+
+    #Los n más recientes como (orden, proceso), del más nuevo al más viejo
+    def ultimos(self, n):
+        with self._lock:
+            return list(islice(reversed(self.recientes), n))
+
+    #Página de registros más viejos que 'antes_de' (número de orden), del más nuevo al más viejo.
+    #Sirve para que la tabla de la GUI cargue el historial a medida que se desplaza
+    def pagina_anterior(self, antes_de, cantidad=100):
+        with self._lock:
+            memoria = [(o, p) for o, p in reversed(self._en_memoria()[0]) if o < antes_de]
+            resultado = [self._registro(o, p) for o, p in memoria[:cantidad]]
+        faltan = cantidad - len(resultado)
+        if faltan > 0:
+            desde = resultado[-1].orden if resultado else antes_de
+            filas = self._consultar(
+                f"SELECT {_COLUMNAS} FROM terminados WHERE orden < ? ORDER BY orden DESC LIMIT ?",
+                (desde, faltan),
+            )
+            resultado += [RegistroTerminado(*fila) for fila in filas]
+        return resultado
+
+    #Busca un proceso terminado por su PID (en memoria por el índice o en disco)
+    def buscar_pid(self, pid):
+        with self._lock:
+            entrada = self._por_pid.get(pid)
+            if entrada is not None:
+                return self._registro(*entrada)
+        filas = self._consultar(f"SELECT {_COLUMNAS} FROM terminados WHERE pid = ? LIMIT 1", (pid,))
+        return RegistroTerminado(*filas[0]) if filas else None
+
+    #Procesos que terminaron entre desde y hasta (tiempo_fin), ordenados por fin
+    def rango_tiempo(self, desde, hasta):
+        with self._lock:
+            memoria, limite = self._en_memoria()
+        filas = self._consultar(
+            f"SELECT {_COLUMNAS} FROM terminados WHERE tiempo_fin BETWEEN ? AND ? AND orden < ? ORDER BY tiempo_fin",
+            (desde, hasta, limite),
+        )
+        registros = [RegistroTerminado(*fila) for fila in filas]
+        registros += [self._registro(o, p) for o, p in memoria if desde <= p.tiempo_fin <= hasta]
+        return sorted(registros, key=lambda r: r.tiempo_fin)
+
+    #Orden del registro más viejo que existe (0 si no hay ninguno)
+    def primer_orden(self):
+        with self._lock:
+            en_disco = self._en_disco
+            if self._en_vuelo:
+                primero = self._en_vuelo[0][0].orden
+            elif self._pendientes:
+                primero = self._pendientes[0].orden
+            else:
+                primero = self.recientes[0][0] if self.recientes else 0
+        if en_disco:
+            return self._consultar("SELECT MIN(orden) FROM terminados")[0][0]
+        return primero
+
+    #Número de orden que recibirá el próximo proceso terminado
+    def siguiente_orden(self):
+        with self._lock:
+            return self._siguiente_orden
+
+    #Registros con orden en [desde, hasta) como tuplas en el orden de RegistroTerminado,
+    #por lotes de a lo sumo 'lote' para no cargar todo en memoria (lo usan los puntos de control)
+    def registros_entre(self, desde, hasta, lote=10000):
+        while desde < hasta:
+            with self._lock:
+                memoria, limite = self._en_memoria()
+            filas = self._consultar(
+                f"SELECT {_COLUMNAS} FROM terminados WHERE orden >= ? AND orden < ? ORDER BY orden LIMIT ?",
+                (desde, min(hasta, limite), lote),
+            )
+            if len(filas) < lote:
+                #Lo que no está en disco está en memoria
+                inicio = filas[-1][0] + 1 if filas else desde
+                filas += [
+                    tuple(self._registro(orden, proceso)) for orden, proceso in memoria
+                    if inicio <= orden < hasta
+                ][:lote - len(filas)]
+            if not filas:
+                return
+            yield filas
+            desde = filas[-1][0] + 1
+
+    #Agrega registros ya ordenados (tuplas de RegistroTerminado) con su número de orden original,
+    #por ejemplo al restaurar un punto de control. Se puede llamar varias veces con lotes consecutivos;
+    #los últimos 'capacidad' quedan en memoria y el resto se entrega al escritor
+    def cargar(self, registros):
+        with self._lock:
+            for registro in registros:
+                registro = RegistroTerminado(*registro)
+                self.recientes.append((registro.orden, registro))
+                self._por_pid[registro.pid] = (registro.orden, registro)
+                self._siguiente_orden = registro.orden + 1
+            while len(self.recientes) > self.capacidad:
+                self._expulsar()
+            self._entregar()
+
+    #Se espera a que el escritor termine lo entregado antes de borrar, si no volvería a escribirlo
+    def clear(self):
+        with self._lock:
+            self._pendientes = []
+        self._cola.join()
+        with self._lock:
+            self.recientes.clear()
+            self._por_pid.clear()
+            if self._conexion is not None:
+                with self._lock_disco, self._conexion:
+                    self._conexion.execute("DELETE FROM terminados")
+            self._en_disco = 0
+            self._siguiente_orden = 1
+
+    def cerrar(self):
+        with self._lock:
+            if self._cerrado:
+                return
+            self._entregar()
+            self._cerrado = True
+        if self._conexion is not None:
+            self._finalizador()
+
+    def __len__(self):
+        return self._en_disco + sum(len(lote) for lote in self._en_vuelo) + len(self._pendientes) + len(self.recientes)
+
+    #Recorre todo el historial del más viejo al más nuevo: primero lo que está en disco,
+    #leído por páginas para no cargarlo entero en memoria
+    def __iter__(self):
+        with self._lock:
+            memoria, limite = self._en_memoria()
+        ultimo = 0
+        while True:
+            filas = self._consultar(
+                f"SELECT {_COLUMNAS} FROM terminados WHERE orden > ? AND orden < ? ORDER BY orden LIMIT 1000",
+                (ultimo, limite),
+            )
+            if not filas:
+                break
+            for fila in filas:
+                yield RegistroTerminado(*fila)
+            ultimo = filas[-1][0]
+        for orden, proceso in memoria:
+            yield proceso
+
+#Registro de un proceso cancelado: de dónde se sacó, por qué y cuándo
+RegistroCancelado = namedtuple("RegistroCancelado", [
+    "pid", "nombre", "memoria_mb", "duracion_s", "estado_previo", "motivo", "tiempo",
+])
+
+#Historial acotado de procesos cancelados (solo en memoria).
+#Guarda los últimos 'capacidad' con un índice por PID; total cuenta todos los cancelados
+class HistorialCancelados:
+    def __init__(self, capacidad=1000):
+        self.capacidad = capacidad
+        self.registros = deque() #Del más viejo al más nuevo
+        self._por_pid = {}
+        self.total = 0
+
+    def append(self, proceso, estado_previo, motivo, tiempo):
+        registro = RegistroCancelado(
+            proceso.pid, proceso.nombre, proceso.memoria_mb, proceso.duracion_s, estado_previo, motivo, tiempo,
+        )
+        self.registros.append(registro)
+        self._por_pid[proceso.pid] = registro
+        self.total += 1
+        if len(self.registros) > self.capacidad:
+            viejo = self.registros.popleft()
+            if self._por_pid.get(viejo.pid) is viejo:
+                del self._por_pid[viejo.pid]
+        return registro
+
+    def buscar_pid(self, pid):
+        return self._por_pid.get(pid)
+
+    #Los n más recientes, del más nuevo al más viejo
+    def ultimos(self, n):
+        return list(islice(reversed(self.registros), n))
+
+    def clear(self):
+        self.registros.clear()
+        self._por_pid.clear()
+        self.total = 0
+
+    def __len__(self):
+        return len(self.registros)
+
+    def __iter__(self):
+        return iter(self.registros)
@@ -1,15 +1,85 @@
 import sys
-#Importamos la Clase QApplicationpara gestionarla  la aplicacion
-from PySide6.QtWidgets import QApplication
-from gui import MainWindow
+import argparse
+from arranque import TiemposArranque
 
 if __name__ == "__main__":
+    #El arranque se mide desde aquí; el reporte solo se muestra si se pide con --tiempos-arranque
+    tiempos = TiemposArranque()
+
+    #Opciones propias; el resto de los argumentos se le pasan a Qt
+    parser = argparse.ArgumentParser(description="Simulador de RAM")
+    parser.add_argument("--metricas-puerto", type=int, help="Sirve las métricas internas en http://127.0.0.1:PUERTO/metrics")
+    parser.add_argument("--metricas-archivo", help="Vuelca las métricas internas a este archivo cada 5 segundos")
+    parser.add_argument("--tiempos-arranque", nargs="?", const="", metavar="ARCHIVO",
+                        help="Muestra cuánto tardó cada fase del arranque y opcionalmente lo guarda en JSON")
+    parser.add_argument("--punto-control", metavar="DIRECTORIO",
+                        help="Guarda el estado de la simulación en este directorio y lo retoma al volver a abrir")
+    parser.add_argument("--intervalo-punto-control", type=float, default=60,
+                        help="Segundos entre puntos de control (por defecto 60)")
+    parser.add_argument("--control-puerto", type=int,
+                        help="Atiende pedidos de control (líneas JSON, ver servidor.py) en 127.0.0.1:PUERTO")
+    parser.add_argument("--control-socket", help="Igual que --control-puerto pero en un socket Unix")
+    parser.add_argument("--eventos", metavar="DIRECTORIO",
+                        help="Guarda cada evento de la simulación en bloques .npy en este directorio (ver bitacora.py)")
+    parser.add_argument("--compartir", metavar="NOMBRE",
+                        help="Publica el estado en vivo en la memoria compartida NOMBRE para otros procesos (ver compartido.py)")
+    args, resto = parser.parse_known_args()
+
+    metricas = None
+    if args.metricas_puerto or args.metricas_archivo:
+        from metricas import RegistroMetricas
+        metricas = RegistroMetricas()
+        if args.metricas_puerto:
+            metricas.servir(args.metricas_puerto)
+        if args.metricas_archivo:
+            metricas.iniciar_volcado(args.metricas_archivo)
+
+    bitacora = None
+    if args.eventos:
+        from bitacora import Bitacora
+        bitacora = Bitacora(args.eventos)
+
+    compartido = None
+    if args.compartir:
+        from compartido import PublicadorCompartido
+        try:
+            compartido = PublicadorCompartido(args.compartir)
+        except FileExistsError:
+            parser.error(f"Ya existe una memoria compartida llamada {args.compartir}")
+
+    #Qt y la interfaz se importan recién ahora, después de leer los argumentos
+    with tiempos.medir("importar Qt"):
+        #Importamos la Clase QApplicationpara gestionarla  la aplicacion
+        from PySide6.QtWidgets import QApplication
+        from PySide6.QtCore import QTimer
+    with tiempos.medir("importar gui"):
+        from gui import MainWindow
+
     # La aplicación se crea como antes
-    app = QApplication(sys.argv)
-    
+    with tiempos.medir("QApplication"):
+        app = QApplication(sys.argv[:1] + resto)
+
     # Creamos la ventana principal (que ahora contiene los estilos)
-    window = MainWindow()
-    window.show()
-    
+    with tiempos.medir("MainWindow"):
+        window = MainWindow(metricas, tiempos, args.punto_control, args.intervalo_punto_control, bitacora,
+                            compartido)
+    with tiempos.medir("show"):
+        window.show()
+
+    #El servidor de control corre en su propio hilo con el simulador de la ventana
+    if args.control_puerto is not None or args.control_socket:
+        from servidor import ServidorControl
+        servidor = ServidorControl(window.simulador, puerto=args.control_puerto, ruta_socket=args.control_socket)
+        servidor.iniciar_en_hilo()
+
+    #El reporte se imprime cuando ya se crearon los paneles diferidos
+    if args.tiempos_arranque is not None:
+        def reportar():
+            if "paneles diferidos" not in tiempos.marcas:
+                QTimer.singleShot(50, reportar)
+                return
+            tiempos.guardar(args.tiempos_arranque or None)
+        QTimer.singleShot(0, reportar)
+
     # Ejecutamos la aplicación
     sys.exit(app.exec())
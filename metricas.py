@@ -0,0 +1,220 @@
+#Registro de métricas del simulador (contadores, indicadores e histogramas).
+#Se exportan en formato de texto de Prometheus o en JSON, a un archivo o por HTTP en un puerto local.
+#El simulador solo instrumenta sus caminos críticos si recibe un registro: desactivado,
+#el costo es revisar un atributo por tick
+import bisect
+import json
+import os
+import threading
+import time
+
+#Límites por defecto de los histogramas de tiempo (segundos), de 10 µs a 1 s
+LIMITES_TIEMPO = (1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0)
+
+#Texto de las etiquetas en formato Prometheus: {clave="valor",...}
+def _etiquetas(etiquetas):
+    if not etiquetas:
+        return ""
+    return "{" + ",".join(f'{clave}="{valor}"' for clave, valor in etiquetas) + "}"
+
+#Valor que solo sube (por ejemplo intentos de admisión)
+class Contador:
+    tipo = "counter"
+
+    def __init__(self):
+        self.valor = 0
+
+    def inc(self, cantidad=1):
+        self.valor += cantidad
+
+    def muestras(self, nombre, etiquetas):
+        return [(nombre, etiquetas, self.valor)]
+
+    def a_dict(self):
+        return self.valor
+
+#Valor que sube y baja (por ejemplo la profundidad de la cola)
+class Indicador(Contador):
+    tipo = "gauge"
+
+    def fijar(self, valor):
+        self.valor = valor
+
+#Histograma de cubetas fijas: observar es una búsqueda binaria y una suma
+class Histograma:
+    tipo = "histogram"
+
+    def __init__(self, limites=LIMITES_TIEMPO):
+        self.limites = tuple(limites)
+        self.cubetas = [0] * (len(self.limites) + 1) #La última es +Inf
+        self.suma = 0.0
+        self.cuenta = 0
+
+    def observar(self, valor):
+        self.cubetas[bisect.bisect_left(self.limites, valor)] += 1
+        self.suma += valor
+        self.cuenta += 1
+
+    #En Prometheus las cubetas son acumuladas (cuántos valores son <= cada límite)
+    def muestras(self, nombre, etiquetas):
+        filas = []
+        acumulado = 0
+        for limite, cantidad in zip(self.limites + ("+Inf",), self.cubetas):
+            acumulado += cantidad
+            filas.append((f"{nombre}_bucket", etiquetas + (("le", limite),), acumulado))
+        filas.append((f"{nombre}_sum", etiquetas, self.suma))
+        filas.append((f"{nombre}_count", etiquetas, self.cuenta))
+        return filas
+
+    def a_dict(self):
+        return {
+            "limites": list(self.limites),
+            "cubetas": list(self.cubetas),
+            "suma": self.suma,
+            "cuenta": self.cuenta,
+        }
+
+#Registro en proceso de todas las métricas. Cada métrica se identifica por su nombre
+#y sus etiquetas; pedir dos veces la misma devuelve el mismo objeto
+class RegistroMetricas:
+    def __init__(self):
+        self._metricas = {} #(nombre, etiquetas) -> métrica
+        self._ayudas = {} #nombre -> (tipo, ayuda)
+        self._lock = threading.Lock()
+        self._servidor = None
+
+    def _obtener(self, clase, nombre, ayuda, etiquetas, *args):
+        clave = (nombre, tuple(sorted(etiquetas.items())) if etiquetas else ())
+        with self._lock:
+            metrica = self._metricas.get(clave)
+            if metrica is None:
+                metrica = self._metricas[clave] = clase(*args)
+                self._ayudas.setdefault(nombre, (clase.tipo, ayuda))
+            return metrica
+
+    def contador(self, nombre, ayuda="", etiquetas=None):
+        return self._obtener(Contador, nombre, ayuda, etiquetas)
+
+    def indicador(self, nombre, ayuda="", etiquetas=None):
+        return self._obtener(Indicador, nombre, ayuda, etiquetas)
+
+    def histograma(self, nombre, ayuda="", etiquetas=None, limites=LIMITES_TIEMPO):
+        return self._obtener(Histograma, nombre, ayuda, etiquetas, limites)
+
+    #Formato de texto de Prometheus (versión 0.0.4)
+    def a_prometheus(self):
+        with self._lock:
+            metricas = sorted(self._metricas.items(), key=lambda item: item[0])
+        lineas = []
+        anterior = None
+        for (nombre, etiquetas), metrica in metricas:
+            if nombre != anterior:
+                tipo, ayuda = self._ayudas[nombre]
+                if ayuda:
+                    lineas.append(f"# HELP {nombre} {ayuda}")
+                lineas.append(f"# TYPE {nombre} {tipo}")
+                anterior = nombre
+            for nombre_muestra, etiquetas_muestra, valor in metrica.muestras(nombre, etiquetas):
+                lineas.append(f"{nombre_muestra}{_etiquetas(etiquetas_muestra)} {valor}")
+        return "\n".join(lineas) + "\n"
+
+    def a_json(self):
+        with self._lock:
+            metricas = sorted(self._metricas.items(), key=lambda item: item[0])
+        datos = {}
+        for (nombre, etiquetas), metrica in metricas:
+            clave = nombre + _etiquetas(etiquetas)
+            datos[clave] = {"tipo": metrica.tipo, "valor": metrica.a_dict()}
+        return json.dumps({"tiempo": time.time(), "metricas": datos}, indent=2, ensure_ascii=False)
+
+    #Escribe las métricas en un archivo (.json = JSON, otro = Prometheus).
+    #Se escribe a un temporal y se reemplaza, así quien lo lea nunca ve un archivo a medias
+    def volcar(self, ruta):
+        texto = self.a_json() if ruta.lower().endswith(".json") else self.a_prometheus()
+        temporal = f"{ruta}.tmp"
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            archivo.write(texto)
+        os.replace(temporal, ruta)
+
+    #Vuelca las métricas al archivo cada 'intervalo' segundos desde un hilo aparte
+    def iniciar_volcado(self, ruta, intervalo=5):
+        def volcar_periodicamente():
+            while True:
+                time.sleep(intervalo)
+                self.volcar(ruta)
+
+        threading.Thread(target=volcar_periodicamente, daemon=True).start()
+
+    #Sirve las métricas por HTTP: /metrics en formato Prometheus y /metrics.json en JSON.
+    #Por defecto solo escucha en la máquina local
+    def servir(self, puerto=9100, host="127.0.0.1"):
+        #Se importa aquí: el simulador importa este módulo aunque no sirva métricas
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registro = self
+
+        class Manejador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/metrics.json"):
+                    cuerpo, tipo = registro.a_json(), "application/json"
+                elif self.path.startswith("/metrics"):
+                    cuerpo, tipo = registro.a_prometheus(), "text/plain; version=0.0.4"
+                else:
+                    self.send_error(404)
+                    return
+                datos = cuerpo.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", f"{tipo}; charset=utf-8")
+                self.send_header("Content-Length", str(len(datos)))
+                self.end_headers()
+                self.wfile.write(datos)
+
+            def log_message(self, formato, *args):
+                pass #Sin registro por cada petición
+
+        self._servidor = ThreadingHTTPServer((host, puerto), Manejador)
+        threading.Thread(target=self._servidor.serve_forever, daemon=True).start()
+        return self._servidor.server_address[1]
+
+    def detener(self):
+        if self._servidor:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._servidor = None
+
+#Lock que mide cuánto se espera para tomarlo y cuánto se retiene.
+#Se usa en lugar del threading.Lock del simulador solo cuando las métricas están activas.
+#Las esperas se separan entre el hilo del motor y el resto (por ejemplo la GUI)
+class LockMedido:
+    def __init__(self, registro, nombre="simulador_lock"):
+        self._lock = threading.Lock()
+        self.hilo_motor = None #ident del hilo del motor; se fija al arrancar la simulación
+        self._espera_motor = registro.histograma(
+            f"{nombre}_espera_segundos", "Tiempo esperando para tomar el lock", {"hilo": "motor"})
+        self._espera_otros = registro.histograma(
+            f"{nombre}_espera_segundos", "Tiempo esperando para tomar el lock", {"hilo": "otros"})
+        self._retencion = registro.histograma(f"{nombre}_retencion_segundos", "Tiempo que se retuvo el lock")
+        self._tomado = 0.0
+
+    def acquire(self, blocking=True, timeout=-1):
+        inicio = time.perf_counter()
+        tomado = self._lock.acquire(blocking, timeout)
+        if tomado:
+            self._tomado = time.perf_counter()
+            espera = self._espera_motor if threading.get_ident() == self.hilo_motor else self._espera_otros
+            espera.observar(self._tomado - inicio)
+        return tomado
+
+    def release(self):
+        self._retencion.observar(time.perf_counter() - self._tomado)
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *excepcion):
+        self.release()
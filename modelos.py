@@ -0,0 +1,213 @@
+from PySide6.QtWidgets import QStyledItemDelegate, QStyle
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, Signal, QRectF, QEvent
+from PySide6.QtGui import QColor, QPainter, QPainterPath
+
+#Modelo de tabla para una lista de procesos.
+#Recibe las filas de la instantánea del simulador (tuplas que empiezan con el PID).
+#En lugar de borrar y volver a crear todas las filas en cada refresco, compara la lista nueva
+#con la anterior y solo avisa a la vista de las filas que se quitaron, insertaron o cambiaron
+class ModeloProcesos(QAbstractTableModel):
+    def __init__(self, encabezados, formateador, cancelable=False, parent=None):
+        super().__init__(parent)
+        self.encabezados = encabezados
+        self.formateador = formateador #Convierte una fila de la instantánea en la lista de textos a mostrar
+        self.cancelable = cancelable #Si es True la última columna es el botón "Cancelar"
+        self._pids = [] #PID de cada fila, en orden
+        self._filas = [] #Textos de cada fila
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._pids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.encabezados)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        fila = index.row()
+        if role == Qt.UserRole:
+            return self._pids[fila]
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == Qt.DisplayRole:
+            textos = self._filas[fila]
+            if index.column() < len(textos):
+                return textos[index.column()]
+            return "Cancelar" if self.cancelable else None
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.encabezados[section]
+        return None
+
+    #Devuelve el PID de la fila indicada
+    def pid(self, fila):
+        return self._pids[fila]
+
+    #Sincroniza el modelo con las filas nuevas emitiendo solo las señales necesarias
+    def actualizar(self, filas):
+        nuevos_pids = []
+        nuevas_filas = []
+        for fila in filas:
+            nuevos_pids.append(fila[0])
+            nuevas_filas.append([str(texto) for texto in self.formateador(fila)])
+
+        #1. Se quitan (de abajo hacia arriba) las filas cuyos procesos ya no están
+        vigentes = set(nuevos_pids)
+        fila = len(self._pids) - 1
+        while fila >= 0:
+            if self._pids[fila] in vigentes:
+                fila -= 1
+                continue
+            fin = fila
+            while fila >= 0 and self._pids[fila] not in vigentes:
+                fila -= 1
+            self.beginRemoveRows(QModelIndex(), fila + 1, fin)
+            del self._pids[fila + 1:fin + 1]
+            del self._filas[fila + 1:fin + 1]
+            self.endRemoveRows()
+
+        #2. Se insertan los procesos nuevos en su posición
+        anteriores = set(self._pids)
+        fila = 0
+        while fila < len(nuevos_pids):
+            if nuevos_pids[fila] in anteriores:
+                fila += 1
+                continue
+            inicio = fila
+            while fila < len(nuevos_pids) and nuevos_pids[fila] not in anteriores:
+                fila += 1
+            self.beginInsertRows(QModelIndex(), inicio, fila - 1)
+            self._pids[inicio:inicio] = nuevos_pids[inicio:fila]
+            self._filas[inicio:inicio] = nuevas_filas[inicio:fila]
+            self.endInsertRows()
+
+        #Si los procesos cambiaron de orden no vale la pena calcular movimientos: se reinicia el modelo
+        if self._pids != nuevos_pids:
+            self.beginResetModel()
+            self._pids = nuevos_pids
+            self._filas = nuevas_filas
+            self.endResetModel()
+            return
+
+        #3. Se avisa solo de los bloques de filas cuyo texto cambió
+        fila = 0
+        ultima_columna = len(self.encabezados) - 1
+        while fila < len(nuevas_filas):
+            if self._filas[fila] == nuevas_filas[fila]:
+                fila += 1
+                continue
+            inicio = fila
+            while fila < len(nuevas_filas) and self._filas[fila] != nuevas_filas[fila]:
+                self._filas[fila] = nuevas_filas[fila]
+                fila += 1
+            self.dataChanged.emit(self.index(inicio, 0), self.index(fila - 1, ultima_columna), [Qt.DisplayRole])
+
+#Modelo de la tabla de terminados.
+#Las filas nuevas llegan por la instantánea (las más recientes, con su número de orden en f[4])
+#y se insertan arriba; las más viejas se piden al historial por páginas solo cuando la vista
+#se desplaza hasta el final (canFetchMore/fetchMore), así la tabla no carga todo el historial
+class ModeloHistorial(ModeloProcesos):
+    def __init__(self, encabezados, formateador, historial, pagina=100, maximo=1000, parent=None):
+        super().__init__(encabezados, formateador, False, parent)
+        self.historial = historial
+        self.pagina = pagina
+        self.maximo = maximo #Filas cargadas como máximo; las que sobran abajo se vuelven a pedir al desplazarse
+        self._ordenes = [] #Número de orden de cada fila (de mayor a menor)
+
+    @staticmethod
+    def _fila(registro):
+        return (registro.pid, registro.nombre, registro.memoria_mb, registro.duracion_s, registro.orden)
+
+    def _textos(self, fila):
+        return [str(texto) for texto in self.formateador(fila)]
+
+    def actualizar(self, filas):
+        filas = list(filas)
+        if not filas:
+            if self._pids:
+                self._reiniciar([])
+            return
+        if not self._ordenes:
+            self._reiniciar(filas)
+            return
+        tope = self._ordenes[0]
+        nuevas = [f for f in filas if f[4] > tope]
+        #Si el historial se reinició o terminaron más procesos de los que trae la instantánea
+        #(quedaría un hueco) se vuelve a empezar desde las filas recibidas
+        if filas[0][4] < tope or (len(nuevas) == len(filas) and filas[-1][4] != tope + 1):
+            self._reiniciar(filas)
+            return
+        if nuevas:
+            self.beginInsertRows(QModelIndex(), 0, len(nuevas) - 1)
+            self._pids[0:0] = [f[0] for f in nuevas]
+            self._filas[0:0] = [self._textos(f) for f in nuevas]
+            self._ordenes[0:0] = [f[4] for f in nuevas]
+            self.endInsertRows()
+        if len(self._pids) > self.maximo:
+            self.beginRemoveRows(QModelIndex(), self.maximo, len(self._pids) - 1)
+            del self._pids[self.maximo:]
+            del self._filas[self.maximo:]
+            del self._ordenes[self.maximo:]
+            self.endRemoveRows()
+
+    def _reiniciar(self, filas):
+        self.beginResetModel()
+        self._pids = [f[0] for f in filas]
+        self._filas = [self._textos(f) for f in filas]
+        self._ordenes = [f[4] for f in filas]
+        self.endResetModel()
+
+    #Hay más filas si el último orden cargado no es el primero del historial
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._ordenes:
+            return False
+        return self._ordenes[-1] > self.historial.primer_orden()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._ordenes:
+            return
+        registros = self.historial.pagina_anterior(self._ordenes[-1], self.pagina)
+        if not registros:
+            return
+        filas = [self._fila(r) for r in registros]
+        inicio = len(self._pids)
+        self.beginInsertRows(QModelIndex(), inicio, inicio + len(filas) - 1)
+        self._pids += [f[0] for f in filas]
+        self._filas += [self._textos(f) for f in filas]
+        self._ordenes += [f[4] for f in filas]
+        self.endInsertRows()
+        #Lo que el usuario pidió al desplazarse no se recorta en el siguiente refresco
+        self.maximo = max(self.maximo, len(self._pids))
+
+#Delegado que dibuja el botón "Cancelar" en cada fila y detecta el clic.
+#Un solo delegado sirve a toda la columna, así no se crea un QPushButton por fila
+class DelegadoCancelar(QStyledItemDelegate):
+    cancelar = Signal(str) #Emite el PID del proceso a cancelar
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.color = QColor("#ef4444")
+        self.color_hover = QColor("#dc2626")
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = QRectF(option.rect).adjusted(6, 4, -6, -4)
+        path = QPainterPath()
+        path.addRoundedRect(rect, 8, 8)
+        hover = bool(option.state & QStyle.State_MouseOver)
+        painter.fillPath(path, self.color_hover if hover else self.color)
+        font = option.font
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(QColor("#ffffff"))
+        painter.drawText(rect, Qt.AlignCenter, "Cancelar")
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and option.rect.contains(event.position().toPoint()):
+            self.cancelar.emit(index.data(Qt.UserRole))
+            return True
+        return False
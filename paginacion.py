@@ -0,0 +1,313 @@
+#Memoria virtual paginada para GestorMemoria.
+#La RAM se divide en marcos de tamaño fijo y cada proceso tiene su tabla de páginas.
+#Un proceso se admite si sus páginas caben entre la RAM y el área de intercambio (swap),
+#y en cada tick genera accesos según su patrón; cada acceso a una página que está en swap
+#es un fallo de página que cuesta 'latencia_fallo' segundos y frena el avance del proceso
+import math
+import random
+from collections import OrderedDict
+
+#Políticas de reemplazo. Las claves son (pid, página) y todas las operaciones son O(1):
+#insertar (página recién cargada), acceso (acierto), victima (saca y devuelve la página a expulsar)
+#y quitar (el proceso liberó su memoria)
+
+#FIFO: se expulsa la página que lleva más tiempo cargada
+class ReemplazoFIFO:
+    nombre = "fifo"
+
+    def __init__(self):
+        self._paginas = OrderedDict()
+
+    def insertar(self, clave):
+        self._paginas[clave] = None
+
+    def acceso(self, clave):
+        pass
+
+    def victima(self):
+        return self._paginas.popitem(last=False)[0]
+
+    def quitar(self, clave):
+        self._paginas.pop(clave, None)
+
+    def __len__(self):
+        return len(self._paginas)
+
+#LRU: cada acierto mueve la página al final; se expulsa la usada hace más tiempo
+class ReemplazoLRU(ReemplazoFIFO):
+    nombre = "lru"
+
+    def acceso(self, clave):
+        self._paginas.move_to_end(clave)
+
+#Reloj (segunda oportunidad): las páginas forman un anillo con un bit de referencia.
+#La aguja avanza apagando bits hasta encontrar una página sin referencia (O(1) amortizado)
+class ReemplazoReloj:
+    nombre = "clock"
+
+    def __init__(self):
+        self._claves = [] #Anillo de posiciones; None = posición libre
+        self._referencia = []
+        self._posiciones = {} #clave -> posición en el anillo
+        self._libres = [] #Posiciones que quedaron vacías al quitar páginas
+        self._aguja = 0
+
+    def insertar(self, clave):
+        if self._libres:
+            i = self._libres.pop()
+            self._claves[i] = clave
+            self._referencia[i] = True
+        else:
+            i = len(self._claves)
+            self._claves.append(clave)
+            self._referencia.append(True)
+        self._posiciones[clave] = i
+
+    def acceso(self, clave):
+        self._referencia[self._posiciones[clave]] = True
+
+    def victima(self):
+        while True:
+            if self._aguja >= len(self._claves):
+                self._aguja = 0
+            i = self._aguja
+            self._aguja += 1
+            clave = self._claves[i]
+            if clave is None:
+                continue
+            if self._referencia[i]:
+                self._referencia[i] = False
+                continue
+            self._claves[i] = None
+            self._libres.append(i)
+            del self._posiciones[clave]
+            return clave
+
+    def quitar(self, clave):
+        i = self._posiciones.pop(clave, None)
+        if i is not None:
+            self._claves[i] = None
+            self._libres.append(i)
+
+    def __len__(self):
+        return len(self._posiciones)
+
+#LFU: se expulsa la página con menos accesos (y entre ellas la más vieja).
+#Las páginas se agrupan por frecuencia y se lleva la frecuencia mínima, así no hay que buscarla
+class ReemplazoLFU:
+    nombre = "lfu"
+
+    def __init__(self):
+        self._frecuencias = {} #clave -> cantidad de accesos
+        self._grupos = {} #frecuencia -> OrderedDict de claves
+        self._minima = 0
+
+    def insertar(self, clave):
+        self._frecuencias[clave] = 1
+        self._grupos.setdefault(1, OrderedDict())[clave] = None
+        self._minima = 1
+
+    def acceso(self, clave):
+        frecuencia = self._frecuencias[clave]
+        grupo = self._grupos[frecuencia]
+        del grupo[clave]
+        if not grupo:
+            del self._grupos[frecuencia]
+            if self._minima == frecuencia:
+                self._minima = frecuencia + 1
+        self._frecuencias[clave] = frecuencia + 1
+        self._grupos.setdefault(frecuencia + 1, OrderedDict())[clave] = None
+
+    def victima(self):
+        #Si el grupo mínimo se vació por un 'quitar' se recalcula (solo en ese caso)
+        if self._minima not in self._grupos:
+            self._minima = min(self._grupos)
+        grupo = self._grupos[self._minima]
+        clave, _ = grupo.popitem(last=False)
+        if not grupo:
+            del self._grupos[self._minima]
+        del self._frecuencias[clave]
+        return clave
+
+    def quitar(self, clave):
+        frecuencia = self._frecuencias.pop(clave, None)
+        if frecuencia is None:
+            return
+        grupo = self._grupos[frecuencia]
+        del grupo[clave]
+        if not grupo:
+            del self._grupos[frecuencia]
+
+    def __len__(self):
+        return len(self._frecuencias)
+
+#Nombre -> clase de la política de reemplazo
+REEMPLAZOS = {clase.nombre: clase for clase in (ReemplazoFIFO, ReemplazoLRU, ReemplazoReloj, ReemplazoLFU)}
+
+def crear_reemplazo(nombre):
+    if nombre not in REEMPLAZOS:
+        raise ValueError(f"Política de reemplazo desconocida '{nombre}'. Opciones: {', '.join(REEMPLAZOS)}")
+    return REEMPLAZOS[nombre]()
+
+#Patrones de acceso a memoria
+PATRONES = ("localidad", "uniforme", "secuencial")
+
+#Tabla de páginas de un proceso: qué páginas están en un marco y cuáles en swap
+class TablaPaginas:
+    __slots__ = ("paginas", "marcos", "en_swap", "base", "siguiente", "accesos", "fallos")
+
+    def __init__(self, paginas):
+        self.paginas = paginas
+        self.marcos = {} #página -> número de marco
+        self.en_swap = set() #Páginas que se expulsaron y hay que traer del swap
+        self.base = 0 #Inicio del conjunto de trabajo actual (patrón "localidad")
+        self.siguiente = 0 #Próxima página del patrón "secuencial"
+        self.accesos = 0
+        self.fallos = 0
+
+#Memoria física en marcos más un área de swap.
+# ram_total_mb: tamaño de la RAM; tamano_pagina_mb: tamaño de página y de marco
+# swap_mb: capacidad del swap; latencia_fallo: segundos que cuesta traer una página del swap
+# reemplazo: "fifo", "lru", "clock" o "lfu"
+# patron: "localidad" (la mayoría de los accesos caen en un conjunto de trabajo que cambia de vez en cuando),
+#   "uniforme" (cualquier página) o "secuencial" (recorre todas las páginas en orden)
+# conjunto_trabajo: fracción de las páginas del proceso que forma su conjunto de trabajo
+# localidad: probabilidad de que un acceso caiga dentro del conjunto de trabajo
+# cambio_fase: probabilidad por segundo de que el conjunto de trabajo se mueva
+# accesos_por_segundo: referencias a memoria que se simulan por proceso y por segundo
+# semilla: semilla del generador de accesos (misma semilla = misma corrida)
+class MemoriaPaginada:
+    def __init__(self, ram_total_mb, tamano_pagina_mb=4, swap_mb=1024, latencia_fallo=0.01,
+                 reemplazo="lru", patron="localidad", conjunto_trabajo=0.2, localidad=0.9,
+                 cambio_fase=0.05, accesos_por_segundo=50, semilla=None):
+        if patron not in PATRONES:
+            raise ValueError(f"Patrón de acceso desconocido '{patron}'. Opciones: {', '.join(PATRONES)}")
+        self.tamano_pagina = tamano_pagina_mb
+        self.total_marcos = int(ram_total_mb // tamano_pagina_mb)
+        self.paginas_swap = int(swap_mb // tamano_pagina_mb)
+        self.latencia_fallo = latencia_fallo
+        self.reemplazo = crear_reemplazo(reemplazo)
+        self.patron = patron
+        self.conjunto_trabajo = conjunto_trabajo
+        self.localidad = localidad
+        self.cambio_fase = cambio_fase
+        self.accesos_por_segundo = accesos_por_segundo
+        self.random = random.Random(semilla)
+        self.marcos_libres = list(range(self.total_marcos - 1, -1, -1))
+        self.tablas = {} #pid -> TablaPaginas
+        self.comprometidas = 0 #Páginas reservadas por los procesos admitidos
+        self.swap_usado = 0 #Páginas que están ahora en el swap
+        #Contadores globales
+        self.accesos = 0
+        self.fallos = 0 #Fallos que traen la página del swap (cuestan latencia)
+        self.fallos_menores = 0 #Primer acceso a una página: se le da un marco sin leer del swap
+        self.expulsiones = 0
+        self.tiempo_estancado = 0.0 #Segundos perdidos esperando al swap
+
+    def paginas_de(self, memoria_mb):
+        return math.ceil(memoria_mb / self.tamano_pagina)
+
+    #Memoria que se puede reservar todavía contando la RAM y el swap
+    def memoria_virtual_libre(self):
+        return (self.total_marcos + self.paginas_swap - self.comprometidas) * self.tamano_pagina
+
+    #Memoria física libre (marcos sin usar)
+    def memoria_libre(self):
+        return len(self.marcos_libres) * self.tamano_pagina
+
+    #Admite un proceso si sus páginas caben entre la RAM y el swap; las páginas se cargan a demanda
+    def reservar(self, pid, memoria_mb):
+        paginas = self.paginas_de(memoria_mb)
+        if self.comprometidas + paginas > self.total_marcos + self.paginas_swap:
+            return False
+        self.comprometidas += paginas
+        self.tablas[pid] = TablaPaginas(paginas)
+        return True
+
+    #Devuelve los marcos y el swap de un proceso
+    def liberar(self, pid):
+        tabla = self.tablas.pop(pid, None)
+        if tabla is None:
+            return
+        for pagina, marco in tabla.marcos.items():
+            self.reemplazo.quitar((pid, pagina))
+            self.marcos_libres.append(marco)
+        self.swap_usado -= len(tabla.en_swap)
+        self.comprometidas -= tabla.paginas
+
+    #Accede a una página; devuelve True si fue un fallo que hubo que leer del swap
+    def acceder(self, pid, tabla, pagina):
+        self.accesos += 1
+        tabla.accesos += 1
+        if pagina in tabla.marcos:
+            self.reemplazo.acceso((pid, pagina))
+            return False
+        if self.marcos_libres:
+            marco = self.marcos_libres.pop()
+        else:
+            #Se expulsa una página (de este u otro proceso) al swap y se usa su marco
+            victima_pid, victima_pagina = self.reemplazo.victima()
+            victima = self.tablas[victima_pid]
+            marco = victima.marcos.pop(victima_pagina)
+            victima.en_swap.add(victima_pagina)
+            self.swap_usado += 1
+            self.expulsiones += 1
+        tabla.marcos[pagina] = marco
+        self.reemplazo.insertar((pid, pagina))
+        if pagina in tabla.en_swap:
+            tabla.en_swap.remove(pagina)
+            self.swap_usado -= 1
+            self.fallos += 1
+            tabla.fallos += 1
+            return True
+        self.fallos_menores += 1
+        return False
+
+    #Elige la próxima página que referencia el proceso según el patrón
+    def _siguiente_pagina(self, tabla):
+        if self.patron == "uniforme":
+            return self.random.randrange(tabla.paginas)
+        if self.patron == "secuencial":
+            pagina = tabla.siguiente
+            tabla.siguiente = (pagina + 1) % tabla.paginas
+            return pagina
+        if self.random.random() < self.localidad:
+            tamano = max(1, int(tabla.paginas * self.conjunto_trabajo))
+            return (tabla.base + self.random.randrange(tamano)) % tabla.paginas
+        return self.random.randrange(tabla.paginas)
+
+    #Simula dt segundos de accesos de cada proceso y devuelve cuánto avanzó cada uno.
+    #Si en dt segundos de trabajo hubo f fallos, el proceso necesitó dt + f * latencia segundos,
+    #así que en dt segundos de reloj solo avanza dt * dt / (dt + f * latencia)
+    def simular(self, pids, dt=1):
+        progreso = []
+        accesos = max(1, round(self.accesos_por_segundo * dt))
+        for pid in pids:
+            tabla = self.tablas[pid]
+            if self.patron == "localidad" and self.random.random() < self.cambio_fase * dt:
+                tabla.base = self.random.randrange(tabla.paginas)
+            fallos = 0
+            for _ in range(accesos):
+                if self.acceder(pid, tabla, self._siguiente_pagina(tabla)):
+                    fallos += 1
+            estancado = fallos * self.latencia_fallo
+            self.tiempo_estancado += estancado
+            progreso.append(dt * dt / (dt + estancado))
+        return progreso
+
+    def metricas(self):
+        return {
+            "tamano_pagina_mb": self.tamano_pagina,
+            "marcos": self.total_marcos,
+            "marcos_libres": len(self.marcos_libres),
+            "swap_paginas": self.paginas_swap,
+            "swap_usado": self.swap_usado,
+            "reemplazo": self.reemplazo.nombre,
+            "patron": self.patron,
+            "accesos": self.accesos,
+            "fallos": self.fallos,
+            "fallos_menores": self.fallos_menores,
+            "tasa_fallos": self.fallos / self.accesos if self.accesos else 0.0,
+            "expulsiones": self.expulsiones,
+            "tiempo_estancado_s": self.tiempo_estancado,
+        }
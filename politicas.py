@@ -0,0 +1,194 @@
+#Políticas de admisión de la cola de espera.
+#Todas tienen la misma interfaz que ColaEspera (append, quitar, remove, cabeza, admitir, clear,
+#len e iteración), así el Simulador puede usar cualquiera como cola_espera.
+#admitir(gestor_memoria, iniciar, simulador) pasa a ejecución los procesos elegidos y los devuelve
+import heapq
+
+from estructuras import ColaEspera
+
+#Cola de prioridad sobre un heap: siempre se intenta admitir el proceso con la menor clave.
+#Si no cabe, la cola se bloquea (no se salta a otros), así los procesos grandes no sufren inanición.
+#Quitar un proceso es O(1): se borra del diccionario y su entrada del heap se descarta al llegar a la cima
+class ColaHeap:
+    politica = "heap"
+
+    def __init__(self):
+        self._heap = [] #(clave, orden, pid)
+        self._procesos = {} #pid -> proceso vigente
+        self._orden = 0 #Desempata por orden de llegada
+
+    #Clave de ordenamiento del proceso (menor = se admite antes)
+    def clave(self, proceso):
+        raise NotImplementedError
+
+    def append(self, proceso):
+        self._orden += 1
+        self._procesos[proceso.pid] = proceso
+        heapq.heappush(self._heap, (self.clave(proceso), self._orden, proceso.pid))
+
+    def quitar(self, pid):
+        proceso = self._procesos.pop(pid, None)
+        self._compactar()
+        return proceso
+
+    #Quita varios procesos y devuelve los que estaban; sus entradas del heap se descartan al llegar a la cima
+    def quitar_lote(self, pids):
+        quitados = [self._procesos.pop(pid, None) for pid in pids]
+        self._compactar()
+        return [proceso for proceso in quitados if proceso is not None]
+
+    #Reconstruye el heap sin las entradas de procesos quitados cuando ya son más que los vigentes,
+    #así las cancelaciones no lo hacen crecer sin límite (O(n) cada O(n) quitados)
+    def _compactar(self):
+        if len(self._heap) > 2 * len(self._procesos) + 64:
+            procesos = self._procesos
+            self._heap = [entrada for entrada in self._heap if entrada[2] in procesos]
+            heapq.heapify(self._heap)
+
+    def remove(self, proceso):
+        if self.quitar(proceso.pid) is None:
+            raise ValueError(f"El proceso {proceso.pid} no está en la cola de espera")
+
+    #Descarta de la cima las entradas de procesos que ya no están en la cola
+    def _limpiar_cima(self):
+        while self._heap and self._heap[0][2] not in self._procesos:
+            heapq.heappop(self._heap)
+
+    def cabeza(self):
+        self._limpiar_cima()
+        return self._procesos[self._heap[0][2]] if self._heap else None
+
+    def admitir(self, gestor_memoria, iniciar, simulador=None):
+        admitidos = []
+        proceso = self.cabeza()
+        while proceso is not None and gestor_memoria.asignar_memoria(proceso):
+            heapq.heappop(self._heap)
+            del self._procesos[proceso.pid]
+            iniciar(proceso)
+            admitidos.append(proceso)
+            proceso = self.cabeza()
+        return admitidos
+
+    def clear(self):
+        self._heap.clear()
+        self._procesos.clear()
+
+    def __len__(self):
+        return len(self._procesos)
+
+    def __contains__(self, proceso):
+        return proceso.pid in self._procesos
+
+    #Recorre los procesos en el orden en que se admitirían sin ordenar todo el heap: se baja por el
+    #árbol del heap desde la raíz tomando siempre el menor nodo alcanzado, así los primeros k procesos
+    #cuestan O(k log k) (la instantánea solo lee limite_filas)
+    def __iter__(self):
+        heap = self._heap
+        procesos = self._procesos
+        n = len(heap)
+        frontera = [(heap[0][0], heap[0][1], 0)] if heap else [] #(clave, orden, posición en el heap)
+        while frontera:
+            i = heapq.heappop(frontera)[2]
+            proceso = procesos.get(heap[i][2])
+            if proceso is not None:
+                yield proceso
+            hijo = 2 * i + 1
+            if hijo < n:
+                clave, orden, _ = heap[hijo]
+                heapq.heappush(frontera, (clave, orden, hijo))
+                hijo += 1
+                if hijo < n:
+                    clave, orden, _ = heap[hijo]
+                    heapq.heappush(frontera, (clave, orden, hijo))
+
+#Trabajo más corto primero (SJF): se admite antes el de menor duración
+class TrabajoMasCorto(ColaHeap):
+    politica = "sjf"
+
+    def clave(self, proceso):
+        return proceso.duracion_s
+
+#Mayor memoria primero: los procesos grandes no quedan detrás de una corriente de pequeños
+class MayorMemoriaPrimero(ColaHeap):
+    politica = "mayor_memoria"
+
+    def clave(self, proceso):
+        return -proceso.memoria_mb
+
+#Prioridad con envejecimiento: menor valor de prioridad = más importante, y cada segundo
+#en cola resta 'envejecimiento' a la prioridad efectiva.
+#prioridad - envejecimiento * (ahora - llegada) ordena igual que prioridad + envejecimiento * llegada,
+#que no cambia con el tiempo, por eso basta con un heap normal
+class PrioridadConEnvejecimiento(ColaHeap):
+    politica = "prioridad"
+
+    def __init__(self, envejecimiento=0.1):
+        super().__init__()
+        self.envejecimiento = envejecimiento
+
+    def clave(self, proceso):
+        llegada = proceso.tiempo_llegada or 0
+        return proceso.prioridad + self.envejecimiento * llegada
+
+#Backfilling (EASY): la cola es FIFO y el primer proceso que no cabe recibe una reserva
+#(el instante en que habrá memoria para él según lo que termina). Los procesos de atrás
+#pueden adelantarse solo si caben ahora y no retrasan esa reserva: terminan antes de ella
+#o usan memoria que sobrará aun cuando el primero arranque
+class Backfilling(ColaEspera):
+    def __init__(self):
+        super().__init__("fifo")
+        self.politica = "backfilling"
+
+    def admitir(self, gestor_memoria, iniciar, simulador=None):
+        admitidos = self._admitir_desde_cabeza(gestor_memoria, iniciar)
+        bloqueado = self.cabeza()
+        if bloqueado is None or simulador is None:
+            return admitidos
+
+        #Se calcula cuándo habrá memoria para el proceso bloqueado (la "sombra")
+        ahora = simulador.tiempo_actual()
+        disponible = gestor_memoria.memoria_disponible
+        sombra = None
+        for fin, memoria in simulador.finalizaciones_en_orden():
+            disponible += memoria
+            if disponible >= bloqueado.memoria_mb:
+                sombra = fin
+                break
+        if sombra is None:
+            return admitidos
+        sobrante = disponible - bloqueado.memoria_mb #Memoria que no necesita el bloqueado
+
+        #Se recorren en orden de llegada solo los procesos que caben ahora
+        desde = self._inicio + 1
+        while True:
+            posicion = self._buscar(desde, gestor_memoria.maximo_asignable())
+            if posicion == -1:
+                break
+            desde = posicion + 1
+            proceso = self._procesos[posicion]
+            termina_antes = ahora + proceso.tiempo_restante <= sombra
+            if not termina_antes and proceso.memoria_mb > sobrante:
+                continue
+            if gestor_memoria.asignar_memoria(proceso):
+                if not termina_antes:
+                    sobrante -= proceso.memoria_mb
+                self.quitar(proceso.pid)
+                iniciar(proceso)
+                admitidos.append(proceso)
+        return admitidos
+
+#Nombre -> fábrica de la política
+POLITICAS = {
+    "fifo": lambda: ColaEspera("fifo"),
+    "primer_ajuste": lambda: ColaEspera("primer_ajuste"),
+    "sjf": TrabajoMasCorto,
+    "mayor_memoria": MayorMemoriaPrimero,
+    "prioridad": PrioridadConEnvejecimiento,
+    "backfilling": Backfilling,
+}
+
+#Crea la cola de espera para la política indicada
+def crear_politica(nombre):
+    if nombre not in POLITICAS:
+        raise ValueError(f"Política desconocida '{nombre}'. Opciones: {', '.join(POLITICAS)}")
+    return POLITICAS[nombre]()
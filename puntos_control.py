@@ -0,0 +1,320 @@
+#Puntos de control del simulador: guardan en un directorio todo su estado (memoria, colas,
+#procesos en ejecución con su tiempo restante, estadísticas, contador de PIDs, estado del generador
+#aleatorio, eventos pendientes y series) para retomar un experimento largo después de reiniciar.
+#El directorio tiene dos archivos:
+# estado.bin: todo lo que cambia (cola, ejecución, memoria...) comprimido; se reemplaza completo en cada guardado
+# terminados.bin: historial de terminados en bloques comprimidos; solo se agregan los nuevos (incremental)
+#Con el lock del simulador tomado solo se copian los campos de los procesos a tuplas y las
+#estructuras que los contienen un nivel (operaciones de C); serializar, comprimir y escribir
+#se hace sin el lock, así el motor casi no se detiene mientras se guarda
+import io
+import os
+import pickle
+import struct
+import sys
+import threading
+import time
+import zlib
+from collections import deque
+from operator import attrgetter
+
+import numpy as np
+
+import core
+from core import Simulador, Proceso
+from tabla_procesos import VistaProceso
+
+VERSION = 1
+_MAGIA = b"GRAMPC01"
+_CABECERA = struct.Struct("<QQ") #Terminados guardados (orden hasta) y bytes válidos de terminados.bin
+_TAMANO = struct.Struct("<Q") #Largo de cada bloque de terminados.bin
+ARCHIVO_ESTADO = "estado.bin"
+ARCHIVO_TERMINADOS = "terminados.bin"
+
+#Campos de Proceso; attrgetter los lee todos de una vez como tupla
+_CAMPOS = Proceso.__slots__
+_leer_campos = attrgetter(*_CAMPOS)
+
+#Hay un punto de control guardado en ese directorio
+def existe(ruta):
+    return os.path.exists(os.path.join(ruta, ARCHIVO_ESTADO))
+
+#Copia de una estructura con sus listas, diccionarios y arreglos copiados (un nivel).
+#Alcanza para las colas y el conjunto en ejecución: lo que guardan adentro son procesos,
+#tuplas o números, y los procesos se guardan aparte por sus campos
+def _copia(estructura):
+    copia = object.__new__(type(estructura))
+    for atributo, valor in vars(estructura).items():
+        if isinstance(valor, (list, dict, set, deque, np.ndarray)):
+            valor = valor.copy()
+        setattr(copia, atributo, valor)
+    return copia
+
+#El planificador de CPU tiene adentro su cola de listos, que también se copia (None si no hay)
+def _copia_cpu(planificador):
+    if planificador is None:
+        return None
+    copia = _copia(planificador)
+    copia.cola = _copia(planificador.cola)
+    return copia
+
+#Serializador que guarda cada proceso de la tabla como una referencia a su PID
+#(sus campos van aparte); cualquier otro proceso se serializa completo
+class _Serializador(pickle.Pickler):
+    def __init__(self, archivo, procesos):
+        super().__init__(archivo, pickle.HIGHEST_PROTOCOL)
+        self.procesos = procesos
+
+    def persistent_id(self, objeto):
+        if type(objeto) in (Proceso, VistaProceso) and self.procesos.get(objeto.pid) is objeto:
+            return objeto.pid
+        return None
+
+#Deserializador que resuelve las referencias a procesos con la tabla ya reconstruida
+class _Deserializador(pickle.Unpickler):
+    def __init__(self, archivo, procesos):
+        super().__init__(archivo)
+        self.procesos = procesos
+
+    def persistent_load(self, pid):
+        return self.procesos[pid]
+
+#Crea un proceso con los campos guardados (sin pasar por __init__)
+def _proceso(campos):
+    proceso = Proceso.__new__(Proceso)
+    for campo, valor in zip(_CAMPOS, campos):
+        setattr(proceso, campo, valor)
+    return proceso
+
+#Toma una copia consistente del estado con el lock del simulador tomado.
+#Devuelve (estado, procesos, sus campos, lo que no contiene procesos ya serializado, próximo orden de terminados)
+def _capturar(simulador):
+    with simulador.lock:
+        gestor = simulador.gestor_memoria
+        series = simulador.series
+        #Todos los procesos a los que apunta alguna estructura: los vivos y los de eventos
+        #que se descartarán (fines o llegadas de procesos cancelados)
+        procesos = dict(simulador.indice_pid)
+        for evento in simulador.eventos:
+            if evento[3] is not None:
+                procesos.setdefault(evento[3].pid, evento[3])
+        tabla = list(map(_leer_campos, procesos.values()))
+        #Lo que no contiene procesos se serializa entero ya mismo
+        sin_procesos = pickle.dumps({
+            "gestor": gestor,
+            "procesos_cancelados": simulador.procesos_cancelados,
+            "estadisticas": simulador.estadisticas,
+            "acumuladores": simulador.acumuladores,
+            "aleatorio": core._aleatorio.getstate(),
+            "series": (series.tiempos, series.valores, series.escritas),
+        }, pickle.HIGHEST_PROTOCOL)
+        estado = {
+            "version": VERSION,
+            "configuracion": {
+                "modo": simulador.modo,
+                "velocidad": simulador.velocidad,
+                "ram_total_gb": simulador.ram_total_gb,
+                "estrategia_memoria": simulador.estrategia_memoria,
+                "limite_filas": simulador.limite_filas,
+                "recientes": simulador.recientes,
+                "historial_max": simulador.procesos_terminados.capacidad,
+                "paginacion": simulador.paginacion,
+                "paso_paginas": simulador.paso_paginas,
+                "capacidad_series": series.capacidad,
+                "cluster": simulador.cluster,
+                "cpu": simulador.cpu,
+                "tabla_procesos": simulador.tabla_procesos,
+            },
+            "guardado_en": time.time(),
+            "cola_espera": _copia(simulador.cola_espera),
+            "procesos_en_ejecucion": list(simulador.procesos_en_ejecucion),
+            "ejecucion": _copia(simulador.ejecucion),
+            "indice_pid": list(simulador.indice_pid),
+            "proceso_id_counter": simulador.proceso_id_counter,
+            "reloj": simulador.reloj,
+            "eventos": simulador.eventos.copy(),
+            "contador_eventos": simulador.contador_eventos,
+            "planificador_cpu": _copia_cpu(simulador.planificador_cpu),
+            "proximo_cpu": simulador._proximo_cpu,
+            "tick_programado": simulador._tick_programado,
+            "proximo_tick": simulador._proximo_tick,
+            "llegada_fuente_pendiente": simulador._llegada_fuente_pendiente,
+            "posicion_fuente": simulador.posicion_fuente,
+            "origen_series": simulador._origen_series,
+            "ultima_muestra": simulador._ultima_muestra,
+        }
+        hasta = simulador.procesos_terminados.siguiente_orden()
+    return estado, procesos, tabla, sin_procesos, hasta
+
+#Serializa lo capturado (sin el lock): tabla de procesos, lo que no los contiene y el resto
+#con los procesos como referencias
+def _serializar(estado, procesos, tabla, sin_procesos):
+    salida = io.BytesIO()
+    pickle.dump(tabla, salida, pickle.HIGHEST_PROTOCOL)
+    pickle.dump(sin_procesos, salida, pickle.HIGHEST_PROTOCOL)
+    _Serializador(salida, procesos).dump(estado)
+    return salida.getvalue()
+
+#Inverso de _serializar: reconstruye los procesos y devuelve el estado completo
+def _deserializar(datos):
+    entrada = io.BytesIO(datos)
+    procesos = {}
+    for campos in pickle.load(entrada):
+        proceso = _proceso(campos)
+        procesos[proceso.pid] = proceso
+    estado = pickle.loads(pickle.load(entrada))
+    estado.update(_Deserializador(entrada, procesos).load())
+    estado["procesos"] = procesos
+    return estado
+
+#Lee la cabecera y el estado de estado.bin: (terminados hasta, bytes de terminados, estado)
+def _leer_estado(ruta):
+    with open(os.path.join(ruta, ARCHIVO_ESTADO), "rb") as archivo:
+        if archivo.read(len(_MAGIA)) != _MAGIA:
+            raise ValueError(f"{ruta} no contiene un punto de control del simulador")
+        hasta, largo = _CABECERA.unpack(archivo.read(_CABECERA.size))
+        estado = _deserializar(zlib.decompress(archivo.read()))
+    if estado["version"] != VERSION:
+        raise ValueError(f"Versión de punto de control no soportada: {estado['version']}")
+    return hasta, largo, estado
+
+#Bloques de terminados guardados hasta 'largo' bytes (lo que haya después quedó de un guardado interrumpido)
+def _leer_terminados(ruta, largo):
+    ruta_terminados = os.path.join(ruta, ARCHIVO_TERMINADOS)
+    if not largo:
+        return
+    with open(ruta_terminados, "rb") as archivo:
+        while archivo.tell() < largo:
+            tamano, = _TAMANO.unpack(archivo.read(_TAMANO.size))
+            yield pickle.loads(zlib.decompress(archivo.read(tamano)))
+
+#Guarda puntos de control de un simulador en el directorio 'ruta', a pedido o cada cierto tiempo
+class PuntosControl:
+    def __init__(self, simulador, ruta):
+        self.simulador = simulador
+        self.ruta = ruta
+        os.makedirs(ruta, exist_ok=True)
+        self._terminados_guardados = 1 #Orden del primer terminado que falta escribir
+        self._bytes_terminados = 0 #Largo válido de terminados.bin
+        self._lock = threading.Lock() #Un solo guardado a la vez
+        self._detener = threading.Event()
+        self._hilo = None
+        self.guardados = 0
+        self.ultimo = None #{"segundos_lock", "segundos_total", "bytes"} del último guardado
+
+    #Restaura el simulador guardado en 'ruta' y devuelve un PuntosControl que sigue guardando ahí.
+    #Las opciones de construcción salen del punto de control; metricas, ruta_historial, bitacora y compartido
+    #se pueden dar de nuevo.
+    #En modo tiempo real los instantes de los procesos vivos se corren lo que duró la interrupción
+    @classmethod
+    def restaurar(cls, ruta, metricas=None, ruta_historial=None, bitacora=None, compartido=None):
+        hasta, largo, estado = _leer_estado(ruta)
+        simulador = Simulador(politica=estado["cola_espera"], metricas=metricas, ruta_historial=ruta_historial, bitacora=bitacora,
+                              compartido=compartido,
+                              **estado["configuracion"])
+        with simulador.lock:
+            simulador.gestor_memoria = estado["gestor"]
+            procesos = estado["procesos"]
+            simulador.procesos_en_ejecucion = {pid: procesos[pid] for pid in estado["procesos_en_ejecucion"]}
+            simulador.ejecucion = estado["ejecucion"]
+            simulador.indice_pid = {pid: procesos[pid] for pid in estado["indice_pid"]}
+            simulador.procesos_cancelados = estado["procesos_cancelados"]
+            simulador.estadisticas = estado["estadisticas"]
+            simulador.acumuladores = estado["acumuladores"]
+            simulador.proceso_id_counter = estado["proceso_id_counter"]
+            simulador.reloj = estado["reloj"]
+            simulador.eventos = estado["eventos"]
+            simulador.contador_eventos = estado["contador_eventos"]
+            simulador.planificador_cpu = estado["planificador_cpu"]
+            simulador.indexar_fines()
+            simulador._proximo_cpu = estado["proximo_cpu"]
+            simulador._tick_programado = estado["tick_programado"]
+            simulador._proximo_tick = estado["proximo_tick"]
+            simulador._llegada_fuente_pendiente = estado["llegada_fuente_pendiente"]
+            simulador.posicion_fuente = estado["posicion_fuente"]
+            core._aleatorio.setstate(estado["aleatorio"])
+            tiempos, valores, escritas = estado["series"]
+            simulador.series.tiempos[:] = tiempos
+            simulador.series.valores[:] = valores
+            simulador.series.escritas = escritas
+            simulador._origen_series = estado["origen_series"]
+            simulador._ultima_muestra = estado["ultima_muestra"]
+            if simulador.modo == "tiempo_real":
+                desplazamiento = time.time() - estado["guardado_en"]
+                for proceso in simulador.indice_pid.values():
+                    if proceso.tiempo_llegada is not None:
+                        proceso.tiempo_llegada += desplazamiento
+                    if proceso.tiempo_inicio is not None:
+                        proceso.tiempo_inicio += desplazamiento
+                simulador._origen_series += desplazamiento
+            for lote in _leer_terminados(ruta, largo):
+                simulador.procesos_terminados.cargar(lote)
+            simulador._publicar_instantanea()
+        control = cls(simulador, ruta)
+        control._terminados_guardados = hasta
+        control._bytes_terminados = largo
+        return control
+
+    #Guarda un punto de control; se puede llamar desde cualquier hilo
+    def guardar(self):
+        with self._lock:
+            inicio = time.perf_counter()
+            estado, procesos, tabla, sin_procesos, hasta = _capturar(self.simulador)
+            en_lock = time.perf_counter() - inicio
+            datos = _serializar(estado, procesos, tabla, sin_procesos)
+            if hasta < self._terminados_guardados:
+                #El simulador se reinició: el historial guardado ya no corresponde
+                self._terminados_guardados, self._bytes_terminados = 1, 0
+            ruta_terminados = os.path.join(self.ruta, ARCHIVO_TERMINADOS)
+            with open(ruta_terminados, "r+b" if os.path.exists(ruta_terminados) else "wb") as archivo:
+                #Se descarta lo que haya quedado de un guardado interrumpido
+                archivo.truncate(self._bytes_terminados)
+                archivo.seek(self._bytes_terminados)
+                for lote in self.simulador.procesos_terminados.registros_entre(self._terminados_guardados, hasta):
+                    bloque = zlib.compress(pickle.dumps(lote, pickle.HIGHEST_PROTOCOL), 1)
+                    archivo.write(_TAMANO.pack(len(bloque)))
+                    archivo.write(bloque)
+                archivo.flush()
+                os.fsync(archivo.fileno())
+                largo = archivo.tell()
+            #estado.bin se escribe a un temporal y se reemplaza: si se corta a mitad queda el anterior
+            ruta_estado = os.path.join(self.ruta, ARCHIVO_ESTADO)
+            temporal = f"{ruta_estado}.tmp"
+            comprimido = zlib.compress(datos, 1)
+            with open(temporal, "wb") as archivo:
+                archivo.write(_MAGIA)
+                archivo.write(_CABECERA.pack(hasta, largo))
+                archivo.write(comprimido)
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            os.replace(temporal, ruta_estado)
+            self._terminados_guardados, self._bytes_terminados = hasta, largo
+            self.guardados += 1
+            self.ultimo = {
+                "segundos_lock": en_lock,
+                "segundos_total": time.perf_counter() - inicio,
+                "bytes": len(_MAGIA) + _CABECERA.size + len(comprimido) + largo,
+            }
+
+    #Guarda cada 'intervalo' segundos desde un hilo aparte
+    def iniciar(self, intervalo=60):
+        def guardar_periodicamente():
+            while not self._detener.wait(intervalo):
+                try:
+                    self.guardar()
+                except OSError as error:
+                    print(f"No se pudo guardar el punto de control en {self.ruta}: {error}", file=sys.stderr)
+
+        self._detener.clear()
+        self._hilo = threading.Thread(target=guardar_periodicamente, daemon=True)
+        self._hilo.start()
+        return self
+
+    #Detiene los guardados periódicos y, si guardar=True, guarda una última vez
+    def detener(self, guardar=True):
+        self._detener.set()
+        if self._hilo:
+            self._hilo.join()
+            self._hilo = None
+        if guardar:
+            self.guardar()
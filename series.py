@@ -0,0 +1,70 @@
+#Series de tiempo en búferes circulares de NumPy de tamaño fijo.
+#El motor agrega una muestra por tick (O(1), sin crear objetos) y la GUI lee una versión
+#reducida con una cantidad fija de puntos, así horas de historia cuestan siempre la misma
+#memoria y el mismo tiempo de dibujo
+import threading
+
+import numpy as np
+
+#Canales que registra el simulador
+CANALES = ("memoria_usada", "en_cola", "en_ejecucion", "rendimiento")
+
+class SeriesTiempo:
+    # capacidad: cantidad de muestras que se guardan; al llenarse se pisan las más viejas
+    def __init__(self, capacidad=14400, canales=CANALES):
+        self.capacidad = capacidad
+        self.canales = canales
+        self._indices = {canal: i for i, canal in enumerate(canales)}
+        self.tiempos = np.zeros(capacidad, dtype=np.float64)
+        self.valores = np.zeros((capacidad, len(canales)), dtype=np.float64)
+        self.escritas = 0 #Total de muestras agregadas (la siguiente va en escritas % capacidad)
+        #El motor escribe y la GUI lee desde otro hilo; el lock solo cubre una fila o una copia
+        self._lock = threading.Lock()
+
+    def agregar(self, tiempo, valores):
+        with self._lock:
+            i = self.escritas % self.capacidad
+            self.tiempos[i] = tiempo
+            self.valores[i] = valores
+            self.escritas += 1
+
+    def __len__(self):
+        return min(self.escritas, self.capacidad)
+
+    #Copia de las muestras guardadas en orden cronológico: (tiempos, valores[n, canales])
+    def datos(self):
+        with self._lock:
+            n = len(self)
+            if self.escritas <= self.capacidad:
+                return self.tiempos[:n].copy(), self.valores[:n].copy()
+            i = self.escritas % self.capacidad
+            tiempos = np.concatenate((self.tiempos[i:], self.tiempos[:i]))
+            valores = np.concatenate((self.valores[i:], self.valores[:i]))
+            return tiempos, valores
+
+    #Versión reducida para dibujar con a lo sumo 2 * puntos muestras.
+    #Cada bloque de muestras se reemplaza por su mínimo y su máximo, así los picos no se pierden
+    def reducida(self, puntos=500):
+        tiempos, valores = self.datos()
+        n = len(tiempos)
+        if n <= 2 * puntos:
+            return tiempos, valores
+        tamano = n // puntos
+        usadas = tamano * puntos
+        #Se descartan las muestras más viejas que no completan un bloque
+        bloques_t = tiempos[n - usadas:].reshape(puntos, tamano)
+        bloques_v = valores[n - usadas:].reshape(puntos, tamano, len(self.canales))
+        reducidos_t = np.empty(2 * puntos)
+        reducidos_t[0::2] = bloques_t[:, 0]
+        reducidos_t[1::2] = bloques_t[:, -1]
+        reducidos_v = np.empty((2 * puntos, len(self.canales)))
+        reducidos_v[0::2] = bloques_v.min(axis=1)
+        reducidos_v[1::2] = bloques_v.max(axis=1)
+        return reducidos_t, reducidos_v
+
+    def canal(self, nombre):
+        return self._indices[nombre]
+
+    def clear(self):
+        with self._lock:
+            self.escritas = 0
@@ -0,0 +1,442 @@
+#Servidor de control local: maneja un core.Simulador desde otros programas (generadores de carga,
+#scripts, pruebas) sin pasar por la interfaz. Usa asyncio sobre TCP (127.0.0.1 por defecto) o un
+#socket Unix con un protocolo de líneas JSON: cada línea es un pedido y cada pedido recibe una
+#línea de respuesta, en el mismo orden. "id" es opcional y se devuelve tal cual.
+# {"id": 1, "op": "enviar", "procesos": [{"nombre": "web-1", "memoria_mb": 128, "duracion_s": 10}, ...]}
+#   -> {"id": 1, "ok": true, "pids": ["P1", ...], "rechazados": [{"indice": 3, "error": "..."}]}
+# {"op": "cancelar", "pids": [...]} o con patron, memoria_minima y/o ubicaciones -> {"ok": true, "cancelados": N}
+# {"op": "pausar"}, {"op": "reanudar"}, {"op": "estadisticas"}, {"op": "ubicar", "pid": "P1"}
+# {"op": "suscribir", "intervalo": 0.5, "filas": false} -> además de la respuesta llega
+#   {"evento": "instantanea", ...} cada vez que la instantánea cambia; {"op": "desuscribir"} las corta
+# Un error devuelve {"id": ..., "ok": false, "error": "..."} y la conexión sigue abierta.
+#Contrapresión: los pedidos que tocan el simulador pasan por una cola acotada que un solo aplicador
+#vacía por lotes en otro hilo (así el lock del simulador nunca bloquea el bucle de asyncio). Si esa
+#cola se llena, si un cliente tiene demasiadas respuestas sin leer o si la cola de espera del
+#simulador pasa de limite_cola, se deja de leer su socket y TCP frena al que envía.
+#A un suscriptor lento se le saltean instantáneas en lugar de acumularlas (solo importa la última).
+#Uso: python servidor.py --puerto 8765 --modo eventos --velocidad 10
+#     python servidor.py --socket /tmp/gestor.sock
+import argparse
+import asyncio
+import json
+import os
+import signal
+import stat
+import sys
+import threading
+
+from core import Simulador, Proceso
+from politicas import POLITICAS
+from compartido import PublicadorCompartido
+
+#Opciones de cancelar_procesos que se aceptan en un pedido "cancelar"
+_CRITERIOS_CANCELAR = ("pids", "patron", "memoria_minima", "ubicaciones")
+
+def _linea(mensaje):
+    return (json.dumps(mensaje, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+#Campos de un proceso vivo o de un registro del historial como diccionario
+def _datos_proceso(objeto):
+    if hasattr(objeto, "_asdict"):
+        return objeto._asdict()
+    return {campo: getattr(objeto, campo) for campo in Proceso.__slots__}
+
+#Futuro ya resuelto para las respuestas que no necesitan al simulador
+def _resuelto(ok, valor):
+    futuro = asyncio.get_running_loop().create_future()
+    futuro.set_result((ok, valor))
+    return futuro
+
+class ServidorControl:
+    # puerto: puerto TCP (0 = uno libre, ver direccion) o ruta_socket: socket Unix
+    # max_pedidos: pedidos esperando al aplicador entre todas las conexiones
+    # max_pendientes: respuestas sin enviar por conexión
+    # limite_cola: procesos en la cola de espera a partir de los cuales se frena "enviar" (None = sin límite)
+    # max_buffer: bytes sin enviar a partir de los cuales se saltean instantáneas de un suscriptor
+    # max_linea: tamaño máximo de un pedido en bytes
+    def __init__(self, simulador, host="127.0.0.1", puerto=None, ruta_socket=None, max_pedidos=256,
+                 max_pendientes=64, limite_cola=None, max_buffer=1 << 20, max_linea=1 << 24):
+        if (puerto is None) == (ruta_socket is None):
+            raise ValueError("Hay que indicar un puerto o un socket Unix (solo uno)")
+        self.simulador = simulador
+        self.host = host
+        self.puerto = puerto
+        self.ruta_socket = ruta_socket
+        self.max_pedidos = max_pedidos
+        self.max_pendientes = max_pendientes
+        self.limite_cola = limite_cola
+        self.max_buffer = max_buffer
+        self.max_linea = max_linea
+        self.direccion = None #(host, puerto) o ruta en la que se escucha
+        self._servidor = None
+        self._pedidos = None
+        self._aplicador = None
+        self._conexiones = {} #escritor -> tarea que atiende la conexión
+        self._por_aplicar = 0 #Procesos enviados que el aplicador todavía no agregó
+        self._bucle = None
+        self._hilo = None
+
+    #Empieza a escuchar (dentro de un bucle de asyncio)
+    async def iniciar(self):
+        self._pedidos = asyncio.Queue(self.max_pedidos)
+        self._aplicador = asyncio.create_task(self._aplicar_pedidos())
+        if self.ruta_socket:
+            #Un socket que quedó de una corrida anterior impide escuchar
+            self._borrar_socket()
+            self._servidor = await asyncio.start_unix_server(self._atender, self.ruta_socket, limit=self.max_linea)
+            self.direccion = self.ruta_socket
+        else:
+            self._servidor = await asyncio.start_server(self._atender, self.host, self.puerto, limit=self.max_linea)
+            self.direccion = self._servidor.sockets[0].getsockname()[:2]
+
+    #Escucha hasta que se cancele (por ejemplo con Ctrl+C en asyncio.run); inicia si hace falta
+    async def servir(self):
+        if self._servidor is None:
+            await self.iniciar()
+        try:
+            await self._servidor.serve_forever()
+        finally:
+            await self.cerrar()
+
+    async def cerrar(self):
+        if self._servidor is None:
+            return
+        self._servidor.close()
+        #Se cortan las conexiones; cada una termina sola al ver el fin de su socket
+        tareas = list(self._conexiones.values())
+        for escritor in list(self._conexiones):
+            escritor.transport.abort()
+        if tareas:
+            _, colgadas = await asyncio.wait(tareas, timeout=5)
+            for tarea in colgadas:
+                tarea.cancel()
+        self._aplicador.cancel()
+        self._servidor = None
+        if self.ruta_socket:
+            self._borrar_socket()
+
+    #Solo se borra si es un socket, nunca otro archivo que tenga esa ruta por error
+    def _borrar_socket(self):
+        try:
+            if stat.S_ISSOCK(os.stat(self.ruta_socket).st_mode):
+                os.remove(self.ruta_socket)
+        except FileNotFoundError:
+            pass
+
+    #Corre el servidor en un hilo propio (para usarlo junto a la interfaz). Vuelve cuando ya escucha
+    def iniciar_en_hilo(self):
+        listo = threading.Event()
+        errores = []
+
+        def correr():
+            self._bucle = asyncio.new_event_loop()
+            try:
+                self._bucle.run_until_complete(self.iniciar())
+            except Exception as error:
+                errores.append(error)
+                return
+            finally:
+                listo.set()
+            self._bucle.run_forever()
+
+        self._hilo = threading.Thread(target=correr, daemon=True)
+        self._hilo.start()
+        listo.wait()
+        if errores:
+            raise errores[0]
+
+    def detener(self):
+        if self._hilo is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.cerrar(), self._bucle).result()
+        self._bucle.call_soon_threadsafe(self._bucle.stop)
+        self._hilo.join()
+        self._bucle.close()
+        self._hilo = None
+
+    #Manda una función al aplicador y devuelve el futuro con su resultado.
+    #Si la cola de pedidos está llena espera, y con eso deja de leer del cliente
+    async def _encargar(self, funcion, *args):
+        futuro = asyncio.get_running_loop().create_future()
+        await self._pedidos.put((funcion, args, futuro))
+        return futuro
+
+    #Aplica los pedidos de a lotes en un hilo aparte: un solo salto de hilo para todos los que se juntaron
+    async def _aplicar_pedidos(self):
+        while True:
+            lote = [await self._pedidos.get()]
+            while not self._pedidos.empty():
+                lote.append(self._pedidos.get_nowait())
+            resultados = await asyncio.to_thread(self._aplicar, lote)
+            for (_, _, futuro), resultado in zip(lote, resultados):
+                if not futuro.done():
+                    futuro.set_result(resultado)
+
+    #Corre cada pedido en orden; un error en uno no afecta a los demás
+    @staticmethod
+    def _aplicar(lote):
+        resultados = []
+        for funcion, args, _ in lote:
+            try:
+                resultados.append((True, funcion(*args)))
+            except Exception as error:
+                resultados.append((False, error))
+        return resultados
+
+    async def _atender(self, lector, escritor):
+        self._conexiones[escritor] = asyncio.current_task()
+        respuestas = asyncio.Queue(self.max_pendientes)
+        escritura = asyncio.create_task(self._escribir_respuestas(respuestas, escritor))
+        suscripcion = None
+        cancelada = False
+        try:
+            while True:
+                try:
+                    linea = await lector.readline()
+                except ValueError:
+                    #Línea más larga que max_linea: no se puede saber dónde empieza el próximo pedido
+                    await respuestas.put((None, _resuelto(False, ValueError("Pedido demasiado largo"))))
+                    break
+                if not linea:
+                    break
+                if not linea.strip():
+                    continue
+                try:
+                    pedido = json.loads(linea)
+                    if not isinstance(pedido, dict):
+                        raise ValueError("El pedido debe ser un objeto JSON")
+                except ValueError as error:
+                    await respuestas.put((None, _resuelto(False, error)))
+                    continue
+                op = pedido.get("op")
+                if op == "suscribir":
+                    try:
+                        intervalo = max(0.05, float(pedido.get("intervalo", 1)))
+                    except (TypeError, ValueError):
+                        await respuestas.put((pedido.get("id"), _resuelto(False, ValueError("'intervalo' debe ser un número"))))
+                        continue
+                    if suscripcion:
+                        suscripcion.cancel()
+                    suscripcion = asyncio.create_task(
+                        self._enviar_instantaneas(escritor, intervalo, bool(pedido.get("filas")))
+                    )
+                    futuro = _resuelto(True, {"intervalo": intervalo})
+                elif op == "desuscribir":
+                    if suscripcion:
+                        suscripcion.cancel()
+                        suscripcion = None
+                    futuro = _resuelto(True, {})
+                else:
+                    futuro = await self._pedido(op, pedido)
+                await respuestas.put((pedido.get("id"), futuro))
+        except ConnectionError:
+            pass
+        except asyncio.CancelledError:
+            cancelada = True
+            raise
+        finally:
+            if suscripcion:
+                suscripcion.cancel()
+            if cancelada:
+                #Al cerrar el servidor no se espera a las respuestas pendientes
+                escritura.cancel()
+            else:
+                await respuestas.put(None)
+                await escritura
+            self._conexiones.pop(escritor, None)
+            escritor.close()
+
+    #Pedidos que pasan por el aplicador
+    async def _pedido(self, op, pedido):
+        if op == "enviar":
+            procesos = pedido.get("procesos")
+            if not isinstance(procesos, list):
+                return _resuelto(False, ValueError("'procesos' debe ser una lista"))
+            #Contrapresión contra el simulador: no se agregan más mientras la cola de espera
+            #(contando lo que espera al aplicador) esté llena
+            if self.limite_cola is not None:
+                while await asyncio.to_thread(self._tamano_cola) + self._por_aplicar >= self.limite_cola:
+                    await asyncio.sleep(0.05)
+            cantidad = len(procesos)
+            self._por_aplicar += cantidad
+            futuro = await self._encargar(self._enviar, procesos)
+
+            def aplicado(_):
+                self._por_aplicar -= cantidad
+            futuro.add_done_callback(aplicado)
+            return futuro
+        if op == "cancelar":
+            criterios = {clave: pedido[clave] for clave in _CRITERIOS_CANCELAR if clave in pedido}
+            return await self._encargar(self._cancelar, criterios, pedido.get("motivo", "control"))
+        if op == "pausar":
+            return await self._encargar(self._pausar, True)
+        if op == "reanudar":
+            return await self._encargar(self._pausar, False)
+        if op == "estadisticas":
+            return await self._encargar(self._estadisticas)
+        if op == "ubicar":
+            return await self._encargar(self._ubicar, pedido.get("pid"))
+        return _resuelto(False, ValueError(f"Operación desconocida '{op}'"))
+
+    #Escribe las respuestas en el orden de los pedidos; drain frena si el cliente no lee.
+    #Si la conexión se cae sigue vaciando la cola (sin escribir) para no trabar al lector
+    async def _escribir_respuestas(self, respuestas, escritor):
+        while True:
+            elemento = await respuestas.get()
+            if elemento is None:
+                return
+            id_pedido, futuro = elemento
+            ok, valor = await futuro
+            if ok:
+                respuesta = {"id": id_pedido, "ok": True, **valor}
+            else:
+                respuesta = {"id": id_pedido, "ok": False, "error": str(valor)}
+            if escritor.is_closing():
+                continue
+            escritor.write(_linea(respuesta))
+            try:
+                await escritor.drain()
+            except ConnectionError:
+                pass
+
+    async def _enviar_instantaneas(self, escritor, intervalo, filas):
+        version = None
+        omitidas = 0
+        while not escritor.is_closing():
+            instantanea = await asyncio.to_thread(self.simulador.obtener_instantanea)
+            if instantanea.version != version:
+                if escritor.transport.get_write_buffer_size() > self.max_buffer:
+                    omitidas += 1
+                else:
+                    version = instantanea.version
+                    escritor.write(_linea(self._datos_instantanea(instantanea, filas, omitidas)))
+                    omitidas = 0
+            await asyncio.sleep(intervalo)
+
+    @staticmethod
+    def _datos_instantanea(instantanea, filas, omitidas):
+        datos = {
+            "evento": "instantanea",
+            "version": instantanea.version,
+            "reloj": instantanea.reloj,
+            "memoria_usada": instantanea.memoria_usada,
+            "memoria_total": instantanea.memoria_total,
+            "en_ejecucion": instantanea.en_ejecucion,
+            "en_cola": instantanea.en_cola,
+            "terminados": instantanea.terminados,
+            "estadisticas": dict(instantanea.estadisticas),
+            "omitidas": omitidas, #Instantáneas salteadas desde la anterior por no leerlas a tiempo
+        }
+        if filas:
+            datos["filas_ejecucion"] = instantanea.filas_ejecucion
+            datos["filas_cola"] = instantanea.filas_cola
+            datos["filas_terminados"] = instantanea.filas_terminados
+        return datos
+
+    #Las siguientes corren en el hilo del aplicador
+
+    #Valida cada proceso y agrega los válidos de una vez; los inválidos se informan por su índice
+    def _enviar(self, procesos):
+        capacidad = self.simulador.gestor_memoria.capacidad
+        validos = []
+        rechazados = []
+        for indice, datos in enumerate(procesos):
+            error = None
+            if not isinstance(datos, dict):
+                error = "Cada proceso debe ser un objeto"
+            else:
+                memoria = datos.get("memoria_mb")
+                duracion = datos.get("duracion_s")
+                if memoria is not None and (not isinstance(memoria, (int, float)) or not 0 < memoria <= capacidad):
+                    error = f"memoria_mb debe estar entre 0 y {capacidad:.0f}"
+                elif duracion is not None and (not isinstance(duracion, (int, float)) or duracion <= 0):
+                    error = "duracion_s debe ser positiva"
+            if error:
+                rechazados.append({"indice": indice, "error": error})
+            else:
+                validos.append(datos)
+        pids = self.simulador.agregar_procesos(validos) if validos else []
+        return {"pids": pids, "rechazados": rechazados}
+
+    #Con el lock: sin él la cola podría estar compactándose en otro hilo y su tamaño no ser el real
+    def _tamano_cola(self):
+        with self.simulador.lock:
+            return len(self.simulador.cola_espera)
+
+    def _cancelar(self, criterios, motivo):
+        return {"cancelados": self.simulador.cancelar_procesos(motivo=motivo, **criterios)}
+
+    def _pausar(self, pausar):
+        if pausar:
+            self.simulador.pausar_simulacion()
+        else:
+            self.simulador.reanudar_simulacion()
+        return {"pausado": self.simulador.pausado}
+
+    def _estadisticas(self):
+        return {"estadisticas": dict(self.simulador.obtener_instantanea().estadisticas)}
+
+    def _ubicar(self, pid):
+        ubicacion, objeto = self.simulador.ubicar(pid)
+        return {"ubicacion": ubicacion, "proceso": _datos_proceso(objeto) if objeto is not None else None}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor de control del simulador de RAM (líneas JSON)")
+    destino = parser.add_mutually_exclusive_group(required=True)
+    destino.add_argument("--puerto", type=int, help="Puerto TCP en el que escuchar")
+    destino.add_argument("--socket", help="Ruta del socket Unix en el que escuchar")
+    parser.add_argument("--host", default="127.0.0.1", help="Dirección TCP (por defecto solo local)")
+    parser.add_argument("--modo", default="eventos", choices=("eventos", "tiempo_real"), help="Motor del simulador")
+    parser.add_argument("--velocidad", type=float, default=1,
+                        help="Segundos simulados por segundo real en modo eventos (0 = lo más rápido posible)")
+    parser.add_argument("--ram-gb", type=float, default=1, help="RAM total en GB (por defecto 1)")
+    parser.add_argument("--politica", default="primer_ajuste", choices=sorted(POLITICAS), help="Política de admisión de la cola")
+    parser.add_argument("--asignador", help="Asignador contiguo: primer_ajuste, siguiente_ajuste, mejor_ajuste, peor_ajuste o buddy")
+    parser.add_argument("--limite-cola", type=int, help="Frena los envíos mientras la cola de espera tenga este tamaño")
+    parser.add_argument("--compartir", metavar="NOMBRE",
+                        help="Publica además el estado en vivo en la memoria compartida NOMBRE (ver compartido.py)")
+    args = parser.parse_args(argv)
+
+    compartido = None
+    try:
+        if args.compartir:
+            compartido = PublicadorCompartido(args.compartir)
+        simulador = Simulador(modo=args.modo, velocidad=args.velocidad, politica=args.politica,
+                              ram_total_gb=args.ram_gb, estrategia_memoria=args.asignador, compartido=compartido)
+        servidor = ServidorControl(simulador, args.host, args.puerto, args.socket, limite_cola=args.limite_cola)
+    except FileExistsError:
+        parser.error(f"Ya existe una memoria compartida llamada {args.compartir}")
+    except ValueError as error:
+        if compartido:
+            compartido.cerrar()
+        parser.error(str(error))
+    simulador.iniciar_simulacion()
+
+    async def servir():
+        await servidor.iniciar()
+        print(f"Escuchando en {servidor.direccion}", file=sys.stderr)
+        #SIGTERM cierra igual que Ctrl+C (y borra el socket Unix)
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        except NotImplementedError:
+            pass
+        try:
+            await servidor.servir()
+        except asyncio.CancelledError:
+            pass
+
+    try:
+        asyncio.run(servir())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulador.ejecutando = False
+        simulador.procesos_terminados.cerrar()
+        if compartido:
+            with simulador.lock:
+                compartido.cerrar()
+                simulador.compartido = None
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+import numpy as np
+
+from core import ESTADOS, CODIGOS_ESTADO
+
+#Columnas numéricas de la tabla y su tipo de dato
+COLUMNAS = {
+    "numero": np.int64, #Parte numérica del PID
+    "memoria_mb": np.int64,
+    "duracion_s": np.float64,
+    "tiempo_restante": np.float64,
+    "estado": np.int8, #Código del estado (índice en ESTADOS)
+    "tiempo_llegada": np.float64, #NaN significa None
+    "tiempo_inicio": np.float64,
+    "tiempo_fin": np.float64,
+    "tiempo_duracion_real": np.float64,
+    "tiempo_espera": np.float64,
+    "prioridad": np.float64,
+}
+#Columnas de tiempo que pueden no tener valor todavía
+OPCIONALES = ("tiempo_llegada", "tiempo_inicio", "tiempo_fin", "tiempo_espera")
+
+#Almacén columnar de procesos para cargas de millones de procesos.
+#Cada atributo vive en un arreglo de NumPy y cada proceso es solo un índice;
+#las vistas (VistaProceso) permiten que el código existente siga leyendo p.memoria_mb
+class TablaProcesos:
+    def __init__(self, capacidad=1024, prefijo="P"):
+        self.prefijo = prefijo #Los PID se forman como prefijo + número ("P1", "P2", ...)
+        self.cantidad = 0
+        self.columnas = {nombre: np.zeros(capacidad, dtype=tipo) for nombre, tipo in COLUMNAS.items()}
+        for nombre in OPCIONALES:
+            self.columnas[nombre][:] = np.nan
+        self.nombres = {} #Solo se guardan los nombres personalizados (índice -> nombre)
+
+    #Duplica la capacidad de todos los arreglos cuando se llenan
+    def _crecer(self):
+        capacidad = 2 * len(self.columnas["numero"])
+        for nombre, arreglo in self.columnas.items():
+            nuevo = np.zeros(capacidad, dtype=arreglo.dtype)
+            if nombre in OPCIONALES:
+                nuevo[:] = np.nan
+            nuevo[:self.cantidad] = arreglo[:self.cantidad]
+            self.columnas[nombre] = nuevo
+
+    #Agrega un proceso y devuelve su vista
+    def agregar(self, numero, memoria_mb, duracion_s, nombre=None, prioridad=0):
+        if self.cantidad == len(self.columnas["numero"]):
+            self._crecer()
+        i = self.cantidad
+        self.cantidad += 1
+        c = self.columnas
+        c["numero"][i] = numero
+        c["memoria_mb"][i] = memoria_mb
+        c["duracion_s"][i] = duracion_s
+        c["tiempo_restante"][i] = duracion_s
+        c["estado"][i] = CODIGOS_ESTADO["Listo"]
+        c["prioridad"][i] = prioridad
+        if nombre:
+            self.nombres[i] = nombre
+        return VistaProceso(self, i)
+
+    #Devuelve la columna indicada recortada a los procesos existentes (sin copiar)
+    def columna(self, nombre):
+        return self.columnas[nombre][:self.cantidad]
+
+    #Cuenta cuántos procesos hay en cada estado
+    def conteo_estados(self):
+        conteos = np.bincount(self.columna("estado"), minlength=len(ESTADOS))
+        return {estado: int(conteos[codigo]) for codigo, estado in enumerate(ESTADOS)}
+
+    #Memoria ocupada por los arreglos en bytes
+    def bytes_usados(self):
+        return sum(arreglo.nbytes for arreglo in self.columnas.values())
+
+    def vista(self, i):
+        return VistaProceso(self, i)
+
+    def __len__(self):
+        return self.cantidad
+
+    def __iter__(self):
+        for i in range(self.cantidad):
+            yield VistaProceso(self, i)
+
+#Crea una propiedad que lee y escribe una columna numérica de la tabla
+def _columna(nombre, tipo=float, opcional=False):
+    def leer(self):
+        valor = self._tabla.columnas[nombre][self._i]
+        if opcional and np.isnan(valor):
+            return None
+        return tipo(valor)
+
+    def escribir(self, valor):
+        self._tabla.columnas[nombre][self._i] = np.nan if valor is None else valor
+
+    return property(leer, escribir)
+
+#Vista de un proceso de la tabla con la misma interfaz que core.Proceso
+class VistaProceso:
+    __slots__ = ("_tabla", "_i")
+
+    def __init__(self, tabla, i):
+        self._tabla = tabla
+        self._i = i
+
+    memoria_mb = _columna("memoria_mb", int)
+    duracion_s = _columna("duracion_s")
+    tiempo_restante = _columna("tiempo_restante")
+    tiempo_llegada = _columna("tiempo_llegada", opcional=True)
+    tiempo_inicio = _columna("tiempo_inicio", opcional=True)
+    tiempo_fin = _columna("tiempo_fin", opcional=True)
+    tiempo_duracion_real = _columna("tiempo_duracion_real")
+    tiempo_espera = _columna("tiempo_espera", opcional=True)
+    prioridad = _columna("prioridad")
+
+    @property
+    def pid(self):
+        return f"{self._tabla.prefijo}{self._tabla.columnas['numero'][self._i]}"
+
+    @property
+    def nombre(self):
+        return self._tabla.nombres.get(self._i) or f"Proceso-{self.pid}"
+
+    @nombre.setter
+    def nombre(self, valor):
+        self._tabla.nombres[self._i] = valor
+
+    @property
+    def estado(self):
+        return ESTADOS[self._tabla.columnas["estado"][self._i]]
+
+    @estado.setter
+    def estado(self, valor):
+        self._tabla.columnas["estado"][self._i] = CODIGOS_ESTADO[valor]
+
+    #Dos vistas son el mismo proceso si apuntan a la misma fila de la misma tabla
+    def __eq__(self, otro):
+        return isinstance(otro, VistaProceso) and otro._tabla is self._tabla and otro._i == self._i
+
+    def __hash__(self):
+        return hash((id(self._tabla), self._i))
+
+    def __repr__(self):
+        return f"VistaProceso({self.pid}, {self.estado})"